@@ -0,0 +1,226 @@
+"""Incremental, parallel build of a directory tree of `.plats` files.
+
+`build_project(src_dir, out_dir)` compiles every `.plats` file below `src_dir` to the
+matching `.py` path below `out_dir` (default: next to the source). A manifest in
+`out_dir` (`.plats-build.json`) records each source's size, mtime, content hash
+and optimisation level:
+
+- size and mtime unchanged: skipped without reading the file;
+- otherwise the file is hashed (together with the compiler version) and compiled
+  only when the hash changed, so touching a file or switching branches back and
+  forth does not trigger recompiles.
+
+Changed files are compiled on a process pool (inline when only one changed, which
+is the common edit-rebuild case). Every output, and the manifest itself, is written
+to a temporary file and renamed into place. Outputs whose source was deleted are
+removed. Hidden directories and `__pycache__` are not searched.
+
+Example:
+    >>> import tempfile
+    >>> from pathlib import Path
+    >>> from vlaamscodex.build import build_project
+    >>> root = Path(tempfile.mkdtemp())
+    >>> _ = (root / "hallo.plats").write_text("plan doe\\n  klap tekst hallo amen\\ngedaan\\n")
+    >>> build_project(root).rebuilt, build_project(root).skipped
+    (('hallo.plats',), ('hallo.plats',))
+    >>> (root / "hallo.py").read_text()
+    "print('hallo')\\n"
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .cache import _compiler_tag
+from .compiler import OPT_LEVELS, compile_plats_iter
+
+MANIFEST_NAME = ".plats-build.json"
+_MANIFEST_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class BuildReport:
+    rebuilt: tuple[str, ...]
+    skipped: tuple[str, ...]
+    # (source, error message)
+    failed: tuple[tuple[str, str], ...]
+    removed: tuple[str, ...]
+    scan_seconds: float
+    compile_seconds: float
+
+    @property
+    def seconds(self) -> float:
+        return self.scan_seconds + self.compile_seconds
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+def _iter_sources(src_dir: Path) -> list[str]:
+    found: list[str] = []
+    for dirpath, dirnames, filenames in os.walk(src_dir):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and d != "__pycache__")
+        rel_dir = os.path.relpath(dirpath, src_dir)
+        for name in sorted(filenames):
+            if name.endswith(".plats"):
+                found.append(name if rel_dir == "." else os.path.join(rel_dir, name).replace(os.sep, "/"))
+    return found
+
+
+def _content_hash(path: Path, optimize: int) -> str:
+    h = hashlib.sha256(_compiler_tag())
+    h.update(bytes([optimize]))
+    h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _compile_file(src: str, out: str, optimize: int = 0) -> str | None:
+    """Compile one file (runs in a worker); return an error message or None."""
+    out_path = Path(out)
+    tmp = out_path.with_name(f".{out_path.name}.{os.getpid()}.tmp")
+    try:
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(src, encoding="utf-8") as fin, tmp.open("w", encoding="utf-8") as fout:
+            fout.writelines(compile_plats_iter(fin, optimize))
+        os.replace(tmp, out_path)
+    except (ValueError, OSError) as exc:  # PlatsSyntaxError, UnicodeDecodeError, I/O
+        tmp.unlink(missing_ok=True)
+        return str(exc)
+    return None
+
+
+def _load_manifest(path: Path) -> dict[str, dict[str, Any]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _MANIFEST_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def build_project(
+    src_dir: str | os.PathLike[str],
+    out_dir: str | os.PathLike[str] | None = None,
+    *,
+    workers: int | None = None,
+    force: bool = False,
+    optimize: int = 0,
+) -> BuildReport:
+    """
+    Compile the changed `.plats` files below `src_dir` into `out_dir`.
+
+    - `workers`: process pool size (default `os.cpu_count()`).
+    - `force`: ignore the manifest and rebuild everything.
+    - `optimize`: optimisation level (see `compiler.optimize_program`); changing it
+      rebuilds every file.
+
+    Paths in the report are relative to `src_dir`, with `/` separators.
+    """
+    src_root = Path(src_dir)
+    if not src_root.is_dir():
+        raise NotADirectoryError(str(src_root))
+    out_root = Path(out_dir) if out_dir is not None else src_root
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be >= 1")
+    if optimize not in OPT_LEVELS:
+        raise ValueError(f"optimisation level must be one of {OPT_LEVELS}, got {optimize!r}")
+
+    started = time.perf_counter()
+    manifest_path = out_root / MANIFEST_NAME
+    old = {} if force else _load_manifest(manifest_path)
+    new: dict[str, dict[str, Any]] = {}
+    todo: list[tuple[str, str]] = []  # (rel source, content hash)
+    skipped: list[str] = []
+    failed: list[tuple[str, str]] = []
+    for rel in _iter_sources(src_root):
+        src = src_root / rel
+        out_rel = rel[: -len(".plats")] + ".py"
+        try:
+            st = src.stat()
+            entry = old.get(rel)
+            outputs_present = entry is not None and (out_root / out_rel).is_file()
+            if (
+                outputs_present
+                and entry.get("size") == st.st_size
+                and entry.get("mtime_ns") == st.st_mtime_ns
+                and entry.get("optimize", 0) == optimize
+            ):
+                new[rel] = entry
+                skipped.append(rel)
+                continue
+            digest = _content_hash(src, optimize)
+        except OSError as exc:
+            failed.append((rel, str(exc)))
+            continue
+        if outputs_present and entry.get("hash") == digest:
+            new[rel] = {**entry, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "optimize": optimize}
+            skipped.append(rel)
+            continue
+        new[rel] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "optimize": optimize,
+            "hash": digest,
+            "out": out_rel,
+        }
+        todo.append((rel, digest))
+    scanned = time.perf_counter()
+
+    jobs = [(str(src_root / rel), str(out_root / new[rel]["out"]), optimize) for rel, _ in todo]
+    if len(jobs) > 1 and (workers or os.cpu_count() or 1) > 1:
+        n_workers = min(len(jobs), workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=n_workers) as ex:
+            errors = list(ex.map(_compile_file, *zip(*jobs), chunksize=max(1, len(jobs) // (4 * n_workers))))
+    else:
+        errors = [_compile_file(*job) for job in jobs]
+
+    rebuilt: list[str] = []
+    for (rel, _digest), error in zip(todo, errors):
+        if error is None:
+            rebuilt.append(rel)
+        else:
+            failed.append((rel, error))
+            # Not recorded, so the next build retries it.
+            del new[rel]
+
+    removed: list[str] = []
+    for rel, entry in old.items():
+        if rel not in new and not (src_root / rel).exists():
+            (out_root / entry.get("out", rel[: -len(".plats")] + ".py")).unlink(missing_ok=True)
+            removed.append(rel)
+
+    if new != old:
+        out_root.mkdir(parents=True, exist_ok=True)
+        _write_atomic(
+            manifest_path,
+            json.dumps({"version": _MANIFEST_VERSION, "files": new}, indent=1, sort_keys=True),
+        )
+    finished = time.perf_counter()
+    return BuildReport(
+        rebuilt=tuple(rebuilt),
+        skipped=tuple(skipped),
+        failed=tuple(failed),
+        removed=tuple(removed),
+        scan_seconds=scanned - started,
+        compile_seconds=finished - scanned,
+    )
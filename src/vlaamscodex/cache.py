@@ -0,0 +1,160 @@
+"""On-disk cache of compiled Platskript, shared by `plats run` and the codec.
+
+Like `__pycache__`, but keyed by content: an entry's name is the SHA-256 of the Plats
+source, the compiler version and the interpreter's bytecode magic number, so an
+unchanged script is never compiled twice, wherever it lives.
+
+- `cached_source(src)` stores the generated Python text (the `vlaamsplats` codec).
+- `cached_code(src, filename)` stores a marshalled code object (`plats run`); its key
+  also covers the filename, which is baked into the code object for tracebacks.
+- Both take the optimisation level (`optimize`), which is part of the key.
+
+Entries are written to a temporary file in their directory and renamed into place,
+so processes filling the same entry concurrently never read a partial file (the
+last rename wins, with identical content). If the cache directory cannot be
+written, compilation simply is not cached.
+
+Cached code objects are executed without recompiling, so the cache is only used if
+its directory belongs to the current user and is not writable by group or others.
+Missing directories are created with mode 0700, every level of them.
+
+Configuration:
+- `VLAAMSCODEX_CACHE_DIR`: location (default `$XDG_CACHE_HOME/vlaamscodex`, else
+  `~/.cache/vlaamscodex`).
+- `VLAAMSCODEX_CACHE`: set to `0` to disable the cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import stat
+import threading
+from functools import lru_cache
+from importlib.util import MAGIC_NUMBER
+from pathlib import Path
+from types import CodeType
+
+from . import __version__
+from . import compiler
+
+
+def cache_dir() -> Path | None:
+    """Return the cache directory, or None when caching is disabled."""
+    if os.getenv("VLAAMSCODEX_CACHE", "1").strip().lower() in ("0", "false", "no", "n", "off"):
+        return None
+    configured = os.getenv("VLAAMSCODEX_CACHE_DIR")
+    if configured:
+        return Path(configured).expanduser()
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "vlaamscodex"
+
+
+@lru_cache(maxsize=1)
+def _compiler_tag() -> bytes:
+    # Size and mtime of the compiler module catch edits in a development checkout.
+    st = os.stat(compiler.__file__)
+    return f"{__version__}|{st.st_size}|{st.st_mtime_ns}|".encode() + MAGIC_NUMBER
+
+
+def _entry_path(root: Path, kind: str, plats_src: str, filename: str = "", optimize: int = 0) -> Path:
+    h = hashlib.sha256(_compiler_tag())
+    for part in (kind, filename, str(optimize), plats_src):
+        h.update(b"\0")
+        h.update(part.encode("utf-8", "surrogatepass"))
+    key = h.hexdigest()
+    return root / key[:2] / f"{key}.{kind}"
+
+
+def _secure_dir(root: Path) -> bool:
+    """Create root if needed and check that nobody but the current user can write to it."""
+    try:
+        missing: list[Path] = []
+        level = root
+        while not level.exists() and level != level.parent:
+            missing.append(level)
+            level = level.parent
+        # mkdir(parents=True, mode=...) would only apply the mode to the last level.
+        for level in reversed(missing):
+            level.mkdir(mode=0o700, exist_ok=True)
+        st = root.stat()
+    except OSError:
+        return False
+    if not stat.S_ISDIR(st.st_mode):
+        return False
+    if hasattr(os, "getuid") and st.st_uid != os.getuid():
+        return False
+    return not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def _usable_dir() -> Path | None:
+    root = cache_dir()
+    return root if root is not None and _secure_dir(root) else None
+
+
+def _read(path: Path) -> bytes | None:
+    try:
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def _write(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(exist_ok=True, mode=0o700)
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def cached_source(plats_src: str, optimize: int = 0) -> str:
+    """Return `compile_plats(plats_src, optimize)`, from the cache when possible."""
+    root = _usable_dir()
+    if root is None:
+        return compiler.compile_plats(plats_src, optimize)
+    path = _entry_path(root, "py", plats_src, optimize=optimize)
+    data = _read(path)
+    if data is not None:
+        try:
+            return data.decode("utf-8")
+        except UnicodeDecodeError:
+            pass
+    py_src = compiler.compile_plats(plats_src, optimize)
+    _write(path, py_src.encode("utf-8"))
+    return py_src
+
+
+def cached_code(plats_src: str, filename: str, optimize: int = 0) -> CodeType:
+    """Return `compile_plats_code(plats_src, filename, optimize)`, from the cache when possible."""
+    root = _usable_dir()
+    if root is None:
+        return compiler.compile_plats_code(plats_src, filename, optimize)
+    path = _entry_path(root, "code", plats_src, filename, optimize)
+    data = _read(path)
+    if data is not None:
+        try:
+            code = marshal.loads(data)
+        except (EOFError, ValueError, TypeError):
+            code = None
+        if isinstance(code, CodeType):
+            return code
+    code = compiler.compile_plats_code(plats_src, filename, optimize)
+    _write(path, marshal.dumps(code))
+    return code
+
+
+def clear_cache() -> int:
+    """Delete every cache file (and leftover temporary file); return how many were removed."""
+    root = cache_dir()
+    removed = 0
+    # Never delete from a directory that other users can write to.
+    if root is None or not root.is_dir() or not _secure_dir(root):
+        return 0
+    for path in root.glob("*/*"):
+        if path.suffix in (".py", ".code", ".tmp"):
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
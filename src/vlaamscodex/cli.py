@@ -6,6 +6,7 @@ Usage:
   plats show-python path/to/script.plats (or: plats toon)
   plats vraag "<vraag>" --dialect <dialect_id>
   plats dialecten
+  plats omzetten <in.txt> --out <out.txt> --dialect <dialect_id>
   plats help                           (or: plats haalp)
   plats version                        (or: plats versie)
 
@@ -21,10 +22,12 @@ Multi-Vlaams Dialect Aliassen:
 from __future__ import annotations
 
 import argparse
+import os
 import sys
 from pathlib import Path
 
-from .compiler import compile_plats
+from .cache import cached_code
+from .compiler import OPT_LEVELS, compile_plats, compile_plats_iter
 from . import __version__
 from .repl import run_repl, detect_dialect, REPL_ALIASES
 from .fortune import print_fortune, detect_fortune_dialect, FORTUNE_ALIASES
@@ -270,25 +273,56 @@ def _read_plats(path: Path) -> str:
     return "\n".join(lines)
 
 
-def cmd_run(path: Path) -> int:
-    plats_src = _read_plats(path)
-    py_src = compile_plats(plats_src)
-    codeobj = compile(py_src, str(path), "exec")
+def cmd_run(path: Path, optimize: int = 0) -> int:
+    # Compile straight to a code object (or load it from the cache); the coding cookie
+    # is a comment line, so keeping it makes traceback line numbers match the .plats file.
+    codeobj = cached_code(path.read_text(encoding="utf-8"), str(path), optimize)
     exec(codeobj, {})
     return 0
 
 
-def cmd_build(path: Path, out: Path) -> int:
-    plats_src = _read_plats(path)
-    py_src = compile_plats(plats_src)
-    out.write_text(py_src, encoding="utf-8")
+def cmd_build(
+    path: Path, out: Path | None, *, jobs: int | None = None, force: bool = False, optimize: int = 0
+) -> int:
+    if path.is_dir():
+        return cmd_build_project(path, out, jobs=jobs, force=force, optimize=optimize)
+    if out is None:
+        print("--out is required when building a single file", file=sys.stderr)
+        return 2
+    # Stream line by line, so memory does not grow with the file; the output only
+    # replaces `out` once the whole file compiled.
+    tmp = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+    try:
+        with path.open(encoding="utf-8") as fin, tmp.open("w", encoding="utf-8") as fout:
+            fout.writelines(compile_plats_iter(fin, optimize))
+        os.replace(tmp, out)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
     print(f"Wrote: {out}")
     return 0
 
 
-def cmd_show_python(path: Path) -> int:
+def cmd_build_project(
+    src_dir: Path, out_dir: Path | None, *, jobs: int | None = None, force: bool = False, optimize: int = 0
+) -> int:
+    # Imported here: the process pool machinery costs every other command startup time.
+    from .build import build_project
+
+    report = build_project(src_dir, out_dir, workers=jobs, force=force, optimize=optimize)
+    for rel, error in report.failed:
+        print(f"{rel}: {error}", file=sys.stderr)
+    print(
+        f"Built: {out_dir or src_dir} ({len(report.rebuilt)} rebuilt, {len(report.skipped)} up to date, "
+        f"{len(report.failed)} failed, {len(report.removed)} removed; "
+        f"scan {report.scan_seconds:.2f}s, compile {report.compile_seconds:.2f}s)"
+    )
+    return 0 if report.ok else 1
+
+
+def cmd_show_python(path: Path, optimize: int = 0) -> int:
     plats_src = _read_plats(path)
-    py_src = compile_plats(plats_src)
+    py_src = compile_plats(plats_src, optimize)
     print(py_src)
     return 0
 
@@ -304,9 +338,12 @@ that uses Flemish dialect keywords and compiles to Python.
 COMMANDS (English):
   plats run <file.plats>                Run a Platskript program
   plats build <file.plats> --out <file> Compile to Python source file
+  plats build <dir> [--out <dir>]       Incrementally compile every .plats file in a tree
   plats show-python <file.plats>        Display generated Python code
   plats vraag "<vraag>" --dialect <id>  Vraag iets (antwoord in dialect packs)
   plats dialecten                       List dialect packs
+  plats omzetten <in> --out <out> --dialect <id>
+                                        Transform a (large) text file with a dialect pack
   plats help                            Show this help message
   plats version                         Show version information
 
@@ -538,6 +575,48 @@ def cmd_vraag(question: str, dialect_id: str = "vlaams/basis") -> int:
     return 0
 
 
+def cmd_omzetten(path: Path, out: Path, dialect_id: str, window_mb: int, quiet: bool = False) -> int:
+    from .dialects.files import transform_file
+
+    def report(done: int, total: int) -> None:
+        pct = 100.0 * done / total if total else 100.0
+        print(f"\r{done / 2**20:,.1f} / {total / 2**20:,.1f} MiB ({pct:5.1f}%)", end="", file=sys.stderr)
+
+    try:
+        stats = transform_file(
+            path,
+            out,
+            dialect_id,
+            window_bytes=window_mb * 2**20,
+            progress=None if quiet else report,
+        )
+    except KeyError:
+        print(f"Onbekend dialect_id: {dialect_id}")
+        print("Beschikbare dialecten: (use: plats dialecten)")
+        return 2
+    if not quiet:
+        print(file=sys.stderr)
+    print(
+        f"Wrote: {out} ({stats.bytes_in:,} -> {stats.bytes_out:,} bytes, {stats.sentences:,} zinnen, "
+        f"{stats.seconds:.2f}s, {stats.throughput / 2**20:.1f} MiB/s)"
+    )
+    return 0
+
+
+def _add_optimize_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "-O",
+        dest="optimize",
+        type=int,
+        choices=OPT_LEVELS,
+        default=0,
+        help="Optimisation level: -O0 none (default); -O1 fold constants, drop redundant "
+        "enook/ofwel operands and unreachable statements; -O2 also build plakt chains with "
+        "''.join, drop unused functions, turn self tail calls into loops and run the program "
+        "body inside a generated main()",
+    )
+
+
 def main(argv: list[str] | None = None) -> int:
     # Handle 'help' and 'version' before argparse
     if argv is None:
@@ -581,13 +660,18 @@ def main(argv: list[str] | None = None) -> int:
     # English commands
     p_run = sub.add_parser("run", help="Run a Platskript program", aliases=["loop"])
     p_run.add_argument("path", type=Path, help="Path to .plats file")
+    _add_optimize_argument(p_run)
 
     p_build = sub.add_parser("build", help="Compile to Python source file", aliases=["bouw"])
-    p_build.add_argument("path", type=Path, help="Path to .plats file")
-    p_build.add_argument("--out", type=Path, required=True, help="Output .py file")
+    p_build.add_argument("path", type=Path, help="Path to .plats file, or a directory to build incrementally")
+    p_build.add_argument("--out", "-o", type=Path, help="Output .py file (directory: output directory, default in place)")
+    p_build.add_argument("--jobs", "-j", type=int, help="Directory: parallel compile processes (default: CPU count)")
+    p_build.add_argument("--force", action="store_true", help="Directory: rebuild every file, ignoring the manifest")
+    _add_optimize_argument(p_build)
 
     p_show = sub.add_parser("show-python", help="Display generated Python code", aliases=["toon"])
     p_show.add_argument("path", type=Path, help="Path to .plats file")
+    _add_optimize_argument(p_show)
 
     # REPL command (Multi-Vlaams!)
     sub.add_parser("repl", help="Start interactive REPL (proboir/smos/efkes/klansen)")
@@ -614,6 +698,12 @@ def main(argv: list[str] | None = None) -> int:
     p_vraag.add_argument("question", help="De vraag (string)")
     p_vraag.add_argument("--dialect", default="vlaams/basis", help="Dialect pack id (default: vlaams/basis)")
     sub.add_parser("dialecten", help="Lijst alle beschikbare dialect packs")
+    p_omzetten = sub.add_parser("omzetten", help="Zet een (groot) tekstbestand om met een dialect pack")
+    p_omzetten.add_argument("path", type=Path, help="Input text file (UTF-8)")
+    p_omzetten.add_argument("--out", type=Path, required=True, help="Output text file")
+    p_omzetten.add_argument("--dialect", default="vlaams/basis", help="Dialect pack id (default: vlaams/basis)")
+    p_omzetten.add_argument("--window-mb", type=int, default=8, help="Window size in MiB; bounds memory use (default: 8)")
+    p_omzetten.add_argument("--quiet", action="store_true", help="No progress output")
 
     sub.add_parser("help", help="Show detailed help (English)")
     sub.add_parser("haalp", help="Toon hulp in 't Vlaams")
@@ -622,11 +712,11 @@ def main(argv: list[str] | None = None) -> int:
     args = p.parse_args(argv)
 
     if args.cmd in ("run", "loop"):
-        return cmd_run(args.path)
+        return cmd_run(args.path, args.optimize)
     if args.cmd in ("build", "bouw"):
-        return cmd_build(args.path, args.out)
+        return cmd_build(args.path, args.out, jobs=args.jobs, force=args.force, optimize=args.optimize)
     if args.cmd in ("show-python", "toon"):
-        return cmd_show_python(args.path)
+        return cmd_show_python(args.path, args.optimize)
     if args.cmd == "repl":
         dialect = detect_dialect(original_cmd)
         return cmd_repl(dialect=dialect)
@@ -644,6 +734,8 @@ def main(argv: list[str] | None = None) -> int:
         return cmd_examples(show=args.show, run=args.run, save=args.save, dialect=dialect)
     if args.cmd == "dialecten":
         return cmd_dialecten()
+    if args.cmd == "omzetten":
+        return cmd_omzetten(args.path, args.out, args.dialect, args.window_mb, quiet=args.quiet)
     if args.cmd == "vraag":
         return cmd_vraag(question=args.question, dialect_id=args.dialect)
     if args.cmd == "help":
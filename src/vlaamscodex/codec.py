@@ -19,7 +19,7 @@ from typing import Optional
 
 
 def _compile_plats_bytes(b: bytes, errors: str) -> tuple[str, int]:
-    from .compiler import compile_plats
+    from .cache import cached_source
 
     utf8 = codecs.lookup("utf-8")
 
@@ -32,8 +32,8 @@ def _compile_plats_bytes(b: bytes, errors: str) -> tuple[str, int]:
         lines = lines[1:]
     plats_src = "\n".join(lines)
 
-    # Compile to Python source text.
-    py_src = "# coding: utf-8\n" + compile_plats(plats_src)
+    # Compile to Python source text (reused from the on-disk cache when unchanged).
+    py_src = "# coding: utf-8\n" + cached_source(plats_src)
     return py_src, len(b)
 
 
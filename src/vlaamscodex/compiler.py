@@ -1,4 +1,4 @@
-"""Platskript -> Python compiler (toy).
+"""Platskript -> Python compiler.
 
 Supported constructs (v0.1):
 - program: `plan doe ... gedaan`
@@ -8,21 +8,38 @@ Supported constructs (v0.1):
 - function def: `maak funksie <name> met <params...> doe ... gedaan`
 - function call: `roep <name> [met <args...>] amen`
 - return: `geeftterug <expr> amen`
+- comments: lines starting with `#`
 
-Expressions (toy):
+Expressions:
 - `tekst <words...>` -> string literal
 - `getal <digits>` -> number literal
-- `da <name>` -> variable reference
+- `da <name>` -> variable reference; a dotted name (`da pad.name`) reads an attribute
+  and `True`, `False` and `None` are constants (also as bare words)
+- `roep <name> [met <args...>]` -> function call (arguments run to the end of the
+  expression, so a call with arguments comes last); `<name>` may be dotted too
 - `spatie` -> " "
-- operators: `plakt` (+) and a handful of arithmetic/boolean comparisons in OP_MAP
+- operators: `plakt` (+) and the arithmetic/boolean/comparison words in OP_MAP,
+  with Python's precedence
 
-This compiler is written to be easy to read, not to be fully correct.
-For a real language, write a real parser and an AST.
+Pipeline: `tokenize` (one pass, keyword table) -> `parse` (recursive descent into the
+typed AST below, every node carrying its 1-based line and column) -> `generate_source`
+(Python source) or `generate_ast` (a Python `ast.Module` whose line numbers point into
+the `.plats` source, ready for `compile()`). `compile_plats_iter` streams the same
+pipeline statement by statement. Between parsing and generation, `optimize_program`
+can fold constants and drop dead code (levels `-O0`, `-O1`, `-O2`).
 """
 
 from __future__ import annotations
 
+import ast
+import builtins
+import math
+import operator
 import re
+from keyword import iskeyword
+from types import CodeType
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Union
 
 OP_MAP = {
     "plakt": "+",
@@ -41,169 +58,1298 @@ OP_MAP = {
 
 _EXPR_STOP = {"dan", "doe", "amen"}
 
+# Token kinds.
+KEYWORD = "keyword"
+OP = "op"
+WORD = "word"
+NEWLINE = "newline"
+EOF = "eof"
 
-def _split_args(tokens: list[str]) -> list[list[str]]:
-    """Split arguments separated by the token `en`."""
-    args: list[list[str]] = []
-    cur: list[str] = []
-    for t in tokens:
-        if t == "en":
-            if cur:
-                args.append(cur)
-                cur = []
-        else:
-            cur.append(t)
-    if cur:
-        args.append(cur)
-    return args
-
-
-def _parse_expr(tokens: list[str]) -> str:
-    """Parse a minimal expression into a Python expression string."""
-    parts: list[str] = []
-    i = 0
-    while i < len(tokens):
-        t = tokens[i]
-        if t in _EXPR_STOP:
-            break
-
-        if t == "spatie":
-            parts.append(repr(" "))
-            i += 1
-            continue
+KEYWORDS = frozenset(
+    {
+        "plan", "doe", "gedaan", "amen", "zet", "op", "klap", "maak", "funksie",
+        "met", "en", "roep", "geeftterug", "tekst", "getal", "da", "spatie", "dan",
+    }
+)
 
-        if t == "tekst":
-            i += 1
-            words: list[str] = []
-            while (
-                i < len(tokens)
-                and tokens[i] not in OP_MAP
-                and tokens[i] not in _EXPR_STOP
-                and tokens[i] != "en"
-            ):
-                words.append(tokens[i])
-                i += 1
-            parts.append(repr(" ".join(words)))
-            continue
+_TOKEN_KINDS: dict[str, str] = {**{k: KEYWORD for k in KEYWORDS}, **{k: OP for k in OP_MAP}}
 
-        if t == "getal":
-            i += 1
-            if i >= len(tokens):
-                raise ValueError("getal without value")
-            num = tokens[i]
-            i += 1
-            if not re.fullmatch(r"-?\d+(\.\d+)?", num):
-                raise ValueError(f"invalid number literal: {num}")
-            parts.append(num)
-            continue
+_WORD_RE = re.compile(r"\S+")
+_NUMBER_RE = re.compile(r"-?\d+(\.\d+)?")
+_IDENT_RE = re.compile(r"[^\W\d]\w*")
 
-        if t == "da":
-            i += 1
-            if i >= len(tokens):
-                raise ValueError("da without identifier")
-            parts.append(tokens[i])
-            i += 1
-            continue
 
-        if t in OP_MAP:
-            parts.append(OP_MAP[t])
-            i += 1
-            continue
+def _is_identifier(word: str) -> bool:
+    # Python keywords (`None`, `class`, ...) would only fail later, in Python's compiler.
+    return _IDENT_RE.fullmatch(word) is not None and not iskeyword(word)
 
-        # fallback: treat as identifier
-        parts.append(t)
-        i += 1
 
-    return " ".join(parts) if parts else "None"
+def _is_reference(word: str) -> bool:
+    # A name that is read, not bound: it may be dotted (`os.getcwd`).
+    return all(_is_identifier(part) for part in word.split("."))
 
 
-def compile_plats(plats_src: str) -> str:
-    """Compile Platskript source to Python source."""
-    py_lines: list[str] = []
-    indent = 0
-    stack: list[str] = []
+# Python's keyword constants, accepted where an expression is read.
+_NAME_CONSTANTS: dict[str, bool | None] = {"True": True, "False": False, "None": None}
 
-    def emit(line: str) -> None:
-        py_lines.append(("    " * indent) + line)
 
-    for raw in plats_src.splitlines():
-        line = raw.strip()
-        if not line:
-            continue
+class PlatsSyntaxError(ValueError):
+    """A Platskript syntax error at a source position (1-based line and column)."""
 
-        # Skip coding cookie if present (the codec will remove it too, but this is safe).
-        if line.startswith("#") and "coding" in line:
-            continue
+    def __init__(self, message: str, line: int, col: int) -> None:
+        super().__init__(f"line {line}, col {col}: {message}")
+        self.msg = message
+        self.line = line
+        self.col = col
 
-        tokens = line.split()
 
-        # close block
-        if tokens == ["gedaan"]:
-            if not stack:
-                raise ValueError("gedaan without open block")
-            kind = stack.pop()
-            if kind in {"funksie"}:
-                indent -= 1
-            continue
+# A token is a plain (kind, value, line, col) tuple: building millions of them is the
+# lexer's main cost, and tuples are several times cheaper than any named record.
+Token = tuple[str, str, int, int]
 
-        # start program (no indent; just a marker)
-        if tokens[:2] == ["plan", "doe"]:
-            stack.append("plan")
-            continue
 
-        # function start: maak funksie NAME met ... doe
-        if len(tokens) >= 5 and tokens[0:2] == ["maak", "funksie"] and tokens[-1] == "doe":
-            name = tokens[2]
-            if "met" not in tokens:
-                raise ValueError("function missing 'met'")
-            met_i = tokens.index("met")
-            params_tokens = tokens[met_i + 1 : -1]
-            params = [t for t in params_tokens if t != "en"]
-            emit(f"def {name}({', '.join(params)}):")
-            indent += 1
-            stack.append("funksie")
+def tokenize(lines: Iterable[str]) -> Iterator[Token]:
+    """
+    Split Platskript source lines into tokens in a single pass.
+
+    Every non-empty line ends with a NEWLINE token (statements cannot span lines);
+    full-line `#` comments, including the coding cookie, produce nothing.
+    """
+    kind_of = _TOKEN_KINDS.get
+    finditer = _WORD_RE.finditer
+    line_no = 0
+    for line_no, raw in enumerate(lines, 1):
+        stripped = raw.strip()
+        if not stripped or stripped[0] == "#":
             continue
+        yield from [(kind_of(m[0], WORD), m[0], line_no, m.start() + 1) for m in finditer(raw)]
+        yield (NEWLINE, "", line_no, len(raw.rstrip()) + 1)
+    yield (EOF, "", line_no + 1, 1)
 
-        # statements must end with 'amen'
-        if not tokens or tokens[-1] != "amen":
-            raise ValueError(f"missing 'amen' statement terminator: {line}")
-        tokens = tokens[:-1]
 
-        if not tokens:
-            continue
+# --- AST -------------------------------------------------------------------------
 
-        if tokens[0] == "klap":
-            emit(f"print({_parse_expr(tokens[1:])})")
-            continue
 
-        if tokens[0] == "zet":
-            if "op" not in tokens:
-                raise ValueError("zet missing 'op'")
-            op_i = tokens.index("op")
-            var = tokens[1]
-            emit(f"{var} = {_parse_expr(tokens[op_i + 1:])}")
-            continue
+@dataclass(frozen=True, slots=True)
+class Constant:
+    value: str | int | float | bool | None
+    line: int
+    col: int
+
+
+@dataclass(frozen=True, slots=True)
+class Name:
+    id: str  # may be dotted (`os.sep`): attribute access on the first name
+    line: int
+    col: int
+
+
+@dataclass(frozen=True, slots=True)
+class BinOp:
+    left: Expr
+    op: str  # Python operator: + - * /
+    right: Expr
+    line: int
+    col: int
+
+
+@dataclass(frozen=True, slots=True)
+class UnaryOp:
+    op: str  # "not"
+    operand: Expr
+    line: int
+    col: int
+
+
+@dataclass(frozen=True, slots=True)
+class BoolOp:
+    op: str  # "and" | "or"
+    values: tuple[Expr, ...]
+    line: int
+    col: int
+
+
+@dataclass(frozen=True, slots=True)
+class Compare:
+    left: Expr
+    ops: tuple[str, ...]  # == != > <
+    comparators: tuple[Expr, ...]
+    line: int
+    col: int
+
+
+@dataclass(frozen=True, slots=True)
+class Call:
+    func: str  # may be dotted, like Name.id
+    args: tuple[Expr, ...]
+    line: int
+    col: int
+
+
+@dataclass(frozen=True, slots=True)
+class Concat:
+    """Text concatenation of `values` in one step (`''.join`); only made by the optimiser."""
+
+    values: tuple[Expr, ...]
+    line: int
+    col: int
+
+
+Expr = Union[Constant, Name, BinOp, UnaryOp, BoolOp, Compare, Call, Concat]
+
+
+@dataclass(frozen=True, slots=True)
+class Assign:
+    target: str
+    value: Expr
+    line: int
+    col: int
+    end_col: int = 0  # column just past `amen`
+
+
+@dataclass(frozen=True, slots=True)
+class Print:
+    value: Expr
+    line: int
+    col: int
+    end_col: int = 0  # column just past `amen`
+
+
+@dataclass(frozen=True, slots=True)
+class ExprStmt:
+    value: Expr
+    line: int
+    col: int
+    end_col: int = 0  # column just past `amen`
+
+
+@dataclass(frozen=True, slots=True)
+class Return:
+    value: Expr
+    line: int
+    col: int
+    end_col: int = 0  # column just past `amen`
+
+
+@dataclass(frozen=True, slots=True)
+class FunctionDef:
+    name: str
+    params: tuple[str, ...]
+    body: tuple[Stmt, ...]
+    line: int
+    col: int
+
+
+@dataclass(frozen=True, slots=True)
+class Plan:
+    body: tuple[Stmt, ...]
+    line: int
+    col: int
+
 
-        if tokens[0] == "roep":
-            func = tokens[1]
-            if "met" in tokens:
-                met_i = tokens.index("met")
-                args = [_parse_expr(a) for a in _split_args(tokens[met_i + 1 :])]
-                emit(f"{func}({', '.join(args)})")
+@dataclass(frozen=True, slots=True)
+class Global:
+    """`global` declaration; only made by the optimiser (see `_wrap_main`)."""
+
+    names: tuple[str, ...]
+    line: int
+    col: int
+
+
+@dataclass(frozen=True, slots=True)
+class Loop:
+    """`while True:` around `body`; only made by the optimiser (see `_eliminate_tail_calls`)."""
+
+    body: tuple[Stmt, ...]
+    line: int
+    col: int
+
+
+@dataclass(frozen=True, slots=True)
+class ReturnIf:
+    """Evaluate `value` into `temp` and return it if its truth equals `when`; optimiser only."""
+
+    value: Expr
+    when: bool
+    temp: str
+    line: int
+    col: int
+    end_col: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class Rebind:
+    """Assign all `values` to `targets` at once (`a, b = x, y`); optimiser only."""
+
+    targets: tuple[str, ...]
+    values: tuple[Expr, ...]
+    line: int
+    col: int
+    end_col: int = 0
+
+
+Stmt = Union[Assign, Print, ExprStmt, Return, FunctionDef, Plan, Global, Loop, ReturnIf, Rebind]
+
+
+@dataclass(frozen=True, slots=True)
+class Program:
+    body: tuple[Stmt, ...]
+    line: int = 1
+    col: int = 1
+
+
+# --- Parser ----------------------------------------------------------------------
+
+_PREC_OR, _PREC_AND, _PREC_NOT, _PREC_COMPARE, _PREC_ADD, _PREC_MUL = range(1, 7)
+_OP_PREC = {
+    "ofwel": _PREC_OR,
+    "enook": _PREC_AND,
+    "isgelijk": _PREC_COMPARE,
+    "isniegelijk": _PREC_COMPARE,
+    "isgroterdan": _PREC_COMPARE,
+    "iskleinerdan": _PREC_COMPARE,
+    "plakt": _PREC_ADD,
+    "derbij": _PREC_ADD,
+    "deraf": _PREC_ADD,
+    "keer": _PREC_MUL,
+    "gedeeld": _PREC_MUL,
+}
+# Binary operator word -> (precedence, Python operator).
+_BINARY_OPS = {word: (prec, OP_MAP[word]) for word, prec in _OP_PREC.items()}
+# Words that end an expression.
+_EXPR_END = frozenset(_EXPR_STOP | {"en"})
+# Words that end a `tekst` literal.
+_TEXT_STOP = frozenset(OP_MAP) | _EXPR_END
+
+
+class _Parser:
+    """Recursive-descent parser over a token iterator (one token of lookahead)."""
+
+    def __init__(self, tokens: Iterable[Token]) -> None:
+        self._tokens = iter(tokens)
+        self.tok = next(self._tokens)
+
+    def advance(self) -> Token:
+        tok = self.tok
+        if tok[0] != EOF:
+            self.tok = next(self._tokens)
+        return tok
+
+    def error(self, message: str, tok: Token | None = None) -> PlatsSyntaxError:
+        tok = tok or self.tok
+        return PlatsSyntaxError(message, tok[2], tok[3])
+
+    def at(self, value: str) -> bool:
+        # Kinds follow from the keyword table, so a keyword value is never a WORD token.
+        return self.tok[1] == value
+
+    def expect(self, value: str, message: str | None = None) -> Token:
+        if not self.at(value):
+            found = self.tok[1] or self.tok[0]
+            raise self.error(message or f"expected '{value}', found '{found}'")
+        return self.advance()
+
+    def expect_name(self, what: str) -> Token:
+        tok = self.tok
+        if tok[0] in (NEWLINE, EOF):
+            raise self.error(f"{what} without identifier")
+        if not _is_identifier(tok[1]):
+            raise self.error(f"invalid identifier: {tok[1]}")
+        return self.advance()
+
+    def expect_reference(self, what: str) -> Token:
+        tok = self.tok
+        if tok[0] in (NEWLINE, EOF):
+            raise self.error(f"{what} without identifier")
+        if not _is_reference(tok[1]):
+            raise self.error(f"invalid identifier: {tok[1]}")
+        return self.advance()
+
+    def end_statement(self) -> int:
+        """Consume `amen` and the end of the line; return the column just past `amen`."""
+        if not self.at("amen"):
+            if self.tok[0] in (NEWLINE, EOF):
+                raise self.error("missing 'amen' statement terminator")
+            raise self.error(f"unexpected '{self.tok[1]}' before 'amen'")
+        amen = self.advance()
+        self.end_line()
+        return amen[3] + len("amen")
+
+    def end_line(self) -> None:
+        if self.tok[0] == NEWLINE:
+            self.advance()
+        elif self.tok[0] != EOF:
+            raise self.error(f"unexpected '{self.tok[1]}' at end of line")
+
+    # Statements ------------------------------------------------------------------
+
+    def parse_program(self) -> Program:
+        body = self.parse_block(None)
+        return Program(body=tuple(body))
+
+    def parse_block(self, opener: Token | None) -> list[Stmt]:
+        return list(self.iter_block(opener))
+
+    def iter_block(self, opener: Token | None, *, inline_plans: bool = False) -> Iterator[Stmt]:
+        """
+        Yield a block's statements as each one is complete, up to its `gedaan`.
+
+        With `inline_plans`, nested `plan doe ... gedaan` blocks (which generate no
+        code of their own) are not collected into a Plan node: their statements are
+        yielded one by one too.
+        """
+        while True:
+            tok = self.tok
+            if tok[0] == EOF:
+                if opener is not None:
+                    raise PlatsSyntaxError(
+                        f"unclosed block '{opener[1]}' (missing 'gedaan')", opener[2], opener[3]
+                    )
+                return
+            if self.at("gedaan"):
+                if opener is None:
+                    raise self.error("gedaan without open block")
+                self.advance()
+                self.end_line()
+                return
+            if inline_plans and self.at("plan"):
+                self.advance()
+                self.expect("doe")
+                self.end_line()
+                yield from self.iter_block(tok, inline_plans=True)
+                continue
+            stmt = self.parse_statement()
+            if stmt is not None:
+                yield stmt
+
+    def parse_statement(self) -> Stmt | None:
+        tok = self.tok
+        if self.at("plan"):
+            self.advance()
+            self.expect("doe")
+            self.end_line()
+            return Plan(tuple(self.parse_block(tok)), tok[2], tok[3])
+        if self.at("maak"):
+            return self.parse_function()
+        if self.at("amen"):
+            # An empty statement.
+            self.advance()
+            self.end_line()
+            return None
+        if self.at("klap"):
+            self.advance()
+            value = self.parse_expr()
+            return Print(value, tok[2], tok[3], self.end_statement())
+        if self.at("zet"):
+            self.advance()
+            name = self.expect_name("zet")
+            self.expect("op", "zet missing 'op'")
+            value = self.parse_expr()
+            return Assign(name[1], value, tok[2], tok[3], self.end_statement())
+        if self.at("roep"):
+            call = self.parse_call()
+            return ExprStmt(call, tok[2], tok[3], self.end_statement())
+        if self.at("geeftterug"):
+            self.advance()
+            value = self.parse_expr()
+            return Return(value, tok[2], tok[3], self.end_statement())
+        raise self.error(f"unknown instruction: {tok[1]}")
+
+    def parse_function(self) -> FunctionDef:
+        tok = self.advance()  # maak
+        self.expect("funksie")
+        name = self.expect_name("funksie")
+        self.expect("met", "function missing 'met'")
+        params: list[str] = []
+        while not self.at("doe"):
+            if self.tok[0] in (NEWLINE, EOF):
+                raise self.error("function header must end with 'doe'")
+            if self.at("en"):
+                self.advance()
+                continue
+            params.append(self.expect_name("met")[1])
+        self.advance()
+        self.end_line()
+        body = self.parse_block(tok)
+        return FunctionDef(name[1], tuple(params), tuple(body), tok[2], tok[3])
+
+    def parse_call(self) -> Call:
+        tok = self.advance()  # roep
+        name = self.expect_reference("roep")
+        args: list[Expr] = []
+        if self.at("met"):
+            self.advance()
+            args.append(self.parse_expr())
+            while self.at("en"):
+                self.advance()
+                args.append(self.parse_expr())
+        return Call(name[1], tuple(args), tok[2], tok[3])
+
+    # Expressions (Python precedence: or < and < not < comparisons < + - < * /) -----
+
+    def parse_expr(self) -> Expr:
+        tok = self.tok
+        if tok[0] == NEWLINE or tok[0] == EOF or tok[1] in _EXPR_END:
+            return Constant(None, tok[2], tok[3])
+        return self.parse_binary(_PREC_OR)
+
+    def parse_binary(self, min_prec: int) -> Expr:
+        """Precedence climbing: parse operators binding at least as tightly as min_prec."""
+        tok = self.tok
+        if tok[1] == "nie":
+            if min_prec > _PREC_NOT:
+                raise self.error("unexpected operator 'nie'")
+            self.advance()
+            left: Expr = UnaryOp("not", self.parse_binary(_PREC_NOT), tok[2], tok[3])
+        else:
+            left = self.parse_atom()
+        while True:
+            binary = _BINARY_OPS.get(self.tok[1])
+            if binary is None or binary[0] < min_prec:
+                return left
+            prec, op = binary
+            if prec == _PREC_COMPARE:
+                ops: list[str] = []
+                comparators: list[Expr] = []
+                while binary is not None and binary[0] == _PREC_COMPARE:
+                    self.advance()
+                    ops.append(binary[1])
+                    comparators.append(self.parse_binary(_PREC_COMPARE + 1))
+                    binary = _BINARY_OPS.get(self.tok[1])
+                left = Compare(left, tuple(ops), tuple(comparators), left.line, left.col)
+            elif prec <= _PREC_AND:
+                word = self.tok[1]
+                values = [left]
+                while self.tok[1] == word:
+                    self.advance()
+                    values.append(self.parse_binary(prec + 1))
+                left = BoolOp(op, tuple(values), left.line, left.col)
             else:
-                emit(f"{func}()")
+                self.advance()
+                # Left-associative: the right operand binds strictly tighter.
+                left = BinOp(left, op, self.parse_binary(prec + 1), left.line, left.col)
+
+    def parse_atom(self) -> Expr:
+        tok = self.tok
+        kind, value, line, col = tok
+        if kind == WORD:
+            self.advance()
+            # A bare word is an identifier (or True/False/None).
+            if value in _NAME_CONSTANTS:
+                return Constant(_NAME_CONSTANTS[value], line, col)
+            if not _is_reference(value):
+                raise self.error(f"invalid identifier: {value}", tok)
+            return Name(value, line, col)
+        if kind == NEWLINE or kind == EOF or value in _EXPR_END:
+            raise self.error("expected an expression")
+        if kind == OP:
+            raise self.error(f"unexpected operator '{value}'")
+        if value == "roep":
+            # Arguments extend to the end of the expression (or the next `en`).
+            return self.parse_call()
+        self.advance()
+        if value == "tekst":
+            words: list[str] = []
+            while self.tok[0] != NEWLINE and self.tok[0] != EOF and self.tok[1] not in _TEXT_STOP:
+                words.append(self.advance()[1])
+            return Constant(" ".join(words), line, col)
+        if value == "da":
+            if self.tok[0] == WORD and self.tok[1] in _NAME_CONSTANTS:
+                return Constant(_NAME_CONSTANTS[self.advance()[1]], line, col)
+            return Name(self.expect_reference("da")[1], line, col)
+        if value == "getal":
+            if self.tok[0] == NEWLINE or self.tok[0] == EOF:
+                raise self.error("getal without value")
+            num = self.advance()
+            digits = num[1]
+            if not _NUMBER_RE.fullmatch(digits):
+                raise self.error(f"invalid number literal: {digits}", num)
+            return Constant(float(digits) if "." in digits else int(digits), line, col)
+        if value == "spatie":
+            return Constant(" ", line, col)
+        # Any other keyword used as a bare word is an identifier too.
+        return Name(value, line, col)
+
+
+def parse(plats_src: str | Iterable[str]) -> Program:
+    """Parse Platskript source (a string or an iterable of lines) into a Program AST."""
+    lines = plats_src.splitlines() if isinstance(plats_src, str) else plats_src
+    return _Parser(tokenize(lines)).parse_program()
+
+
+# --- Optimisation ----------------------------------------------------------------
+
+OPT_LEVELS = (0, 1, 2)
+
+# Folded constants are capped like CPython's own folding, so a literal can never
+# bloat the generated module (or take long to compute).
+_MAX_FOLDED_INT_BITS = 128
+_MAX_FOLDED_STR_LEN = 4096
+_FOLD_OPS: dict[str, Callable[[Any, Any], Any]] = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+_NO_FOLD = object()
+
+
+def _fold_value(op: str, left: object, right: object) -> object:
+    """Evaluate `left op right` at compile time, or return _NO_FOLD."""
+    if op == "*" and isinstance(left, int) and isinstance(right, int):
+        if left.bit_length() + right.bit_length() > _MAX_FOLDED_INT_BITS:
+            return _NO_FOLD
+    elif op == "*" and isinstance(left, (str, int)) and isinstance(right, (str, int)):
+        text, times = (left, right) if isinstance(left, str) else (right, left)
+        if isinstance(times, str) or len(text) * max(times, 0) > _MAX_FOLDED_STR_LEN:
+            return _NO_FOLD
+    try:
+        value = _FOLD_OPS[op](left, right)
+    except (ArithmeticError, TypeError, ValueError):
+        # Left for run time, which raises the same error at the right line.
+        return _NO_FOLD
+    if isinstance(value, str):
+        return value if len(value) <= _MAX_FOLDED_STR_LEN else _NO_FOLD
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int):
+        return value if value.bit_length() <= _MAX_FOLDED_INT_BITS else _NO_FOLD
+    if isinstance(value, float):
+        # repr() of inf/nan is not a Python literal.
+        return value if math.isfinite(value) else _NO_FOLD
+    return _NO_FOLD
+
+
+# From this many operands on, one `''.join` beats a chain of `+`, each of which
+# allocates an intermediate string.
+_MIN_JOIN_OPERANDS = 4
+
+
+def _concat(node: BinOp) -> Expr:
+    """
+    Rewrite a `+` chain with a text literal in it as one concatenation.
+
+    Such a chain can only succeed if every operand is text: no built-in type adds to
+    or is added to a str other than str itself. So the operands can be regrouped:
+    adjacent literals are merged, and four or more operands become a `Concat`. A
+    non-text operand still raises TypeError, after all operands are evaluated rather
+    than at the first bad one. Chains without a text literal (`da a plakt da b`)
+    may be numbers and keep `+`. F-strings are not used: they would format a number
+    instead of raising.
+    """
+    operands: list[Expr] = []
+    chain: Expr = node
+    while isinstance(chain, BinOp) and chain.op == "+":
+        operands.append(chain.right)
+        chain = chain.left
+    operands.append(chain)
+    operands.reverse()
+    if not any(isinstance(o, Constant) and isinstance(o.value, str) for o in operands):
+        return node
+    merged: list[Expr] = []
+    for operand in operands:
+        prev = merged[-1] if merged else None
+        if (
+            isinstance(operand, Constant)
+            and isinstance(operand.value, str)
+            and isinstance(prev, Constant)
+            and isinstance(prev.value, str)
+            and len(prev.value) + len(operand.value) <= _MAX_FOLDED_STR_LEN
+        ):
+            merged[-1] = Constant(prev.value + operand.value, prev.line, prev.col)
+        else:
+            merged.append(operand)
+    if len(merged) >= _MIN_JOIN_OPERANDS:
+        return Concat(tuple(merged), node.line, node.col)
+    result = merged[0]
+    for operand in merged[1:]:
+        result = BinOp(result, "+", operand, node.line, node.col)
+    return result
+
+
+def _fold(node: Expr, join_text: bool = False) -> Expr:
+    """
+    Fold constant subexpressions and drop `enook`/`ofwel` operands that cannot matter.
+
+    With `join_text`, text `+` chains are also regrouped by `_concat`.
+    """
+    if isinstance(node, BinOp):
+        # Walk the left spine iteratively, like expr_source.
+        spine: list[BinOp] = []
+        while isinstance(node, BinOp):
+            spine.append(node)
+            node = node.left
+        result = _fold(node, join_text)
+        for binop in reversed(spine):
+            right = _fold(binop.right, join_text)
+            if isinstance(result, Constant) and isinstance(right, Constant):
+                value = _fold_value(binop.op, result.value, right.value)
+                if value is not _NO_FOLD:
+                    result = Constant(value, binop.line, binop.col)
+                    continue
+            if result is not binop.left or right is not binop.right:
+                binop = BinOp(result, binop.op, right, binop.line, binop.col)
+            result = binop
+        if join_text and isinstance(result, BinOp) and result.op == "+":
+            return _concat(result)
+        return result
+    if isinstance(node, UnaryOp):
+        operand = _fold(node.operand, join_text)
+        if isinstance(operand, Constant):
+            return Constant(not operand.value, node.line, node.col)
+        return node if operand is node.operand else UnaryOp(node.op, operand, node.line, node.col)
+    if isinstance(node, Compare):
+        left = _fold(node.left, join_text)
+        comparators = tuple(_fold(c, join_text) for c in node.comparators)
+        if isinstance(left, Constant) and all(isinstance(c, Constant) for c in comparators):
+            # a < b < c is a < b and b < c: the first false comparison, else the last.
+            operands = [left.value, *(c.value for c in comparators)]  # type: ignore[union-attr]
+            values = [_fold_value(op, a, b) for op, a, b in zip(node.ops, operands, operands[1:])]
+            if all(v is not _NO_FOLD for v in values):
+                result = next((v for v in values if not v), values[-1])
+                return Constant(result, node.line, node.col)  # type: ignore[arg-type]
+        return Compare(left, node.ops, comparators, node.line, node.col)
+    if isinstance(node, BoolOp):
+        # `a and b` is the first falsy operand, else the last one (`or`: first truthy).
+        # A constant that does not decide the result is redundant unless it is last;
+        # one that does decides it, so nothing after it is evaluated.
+        decides = (lambda v: not v) if node.op == "and" else bool
+        values: list[Expr] = []
+        folded = [_fold(v, join_text) for v in node.values]
+        for i, value in enumerate(folded):
+            if isinstance(value, Constant):
+                if decides(value.value):
+                    values.append(value)
+                    break
+                if i < len(folded) - 1:
+                    continue
+            values.append(value)
+        if len(values) == 1:
+            return values[0]
+        return BoolOp(node.op, tuple(values), node.line, node.col)
+    if isinstance(node, Call):
+        return Call(node.func, tuple(_fold(a, join_text) for a in node.args), node.line, node.col)
+    return node
+
+
+def _without_plans(stmts: Iterable[Stmt]) -> Iterator[Stmt]:
+    for stmt in stmts:
+        if isinstance(stmt, Plan):
+            yield from _without_plans(stmt.body)
+        else:
+            yield stmt
+
+
+def _optimize_stmts(stmts: Iterable[Stmt], in_function: bool = False, join_text: bool = False) -> Iterator[Stmt]:
+    """
+    Fold the expressions of each statement (see `_fold`), lazily.
+
+    Nested `plan` blocks generate no code and are flattened into their parent. In a
+    function body, statements after a `geeftterug` are unreachable and dropped,
+    except `zet` and `maak funksie`: they never run, but they still make the name a
+    local of the function, so a read before them keeps raising UnboundLocalError.
+    """
+    unreachable = False
+    for stmt in _without_plans(stmts):
+        if isinstance(stmt, FunctionDef):
+            body = tuple(_optimize_stmts(stmt.body, True, join_text))
+            yield FunctionDef(stmt.name, stmt.params, body, stmt.line, stmt.col)
+        elif isinstance(stmt, Assign):
+            yield Assign(stmt.target, _fold(stmt.value, join_text), stmt.line, stmt.col, stmt.end_col)
+        elif not isinstance(stmt, (Print, ExprStmt, Return)):
+            raise TypeError(f"not a statement node: {stmt!r}")
+        elif unreachable:
             continue
+        elif isinstance(stmt, Print):
+            yield Print(_fold(stmt.value, join_text), stmt.line, stmt.col, stmt.end_col)
+        elif isinstance(stmt, ExprStmt):
+            yield ExprStmt(_fold(stmt.value, join_text), stmt.line, stmt.col, stmt.end_col)
+        else:
+            yield Return(_fold(stmt.value, join_text), stmt.line, stmt.col, stmt.end_col)
+            unreachable = in_function
+
+
+def _expr_names(node: Expr, names: set[str]) -> None:
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        # A dotted name uses the variable it starts with.
+        if isinstance(node, Name):
+            names.add(node.id.partition(".")[0])
+        elif isinstance(node, Call):
+            names.add(node.func.partition(".")[0])
+            stack.extend(node.args)
+        elif isinstance(node, BinOp):
+            stack.extend((node.left, node.right))
+        elif isinstance(node, UnaryOp):
+            stack.append(node.operand)
+        elif isinstance(node, (BoolOp, Concat)):
+            stack.extend(node.values)
+        elif isinstance(node, Compare):
+            stack.append(node.left)
+            stack.extend(node.comparators)
+
+
+def _collect_refs(stmts: Iterable[Stmt], refs: set[str], def_refs: dict[str, set[str]]) -> None:
+    # Names used by `stmts` go to `refs`; names used inside a function body go to
+    # def_refs[function name] instead, so they only count once the function is live.
+    for stmt in stmts:
+        if isinstance(stmt, FunctionDef):
+            _collect_refs(stmt.body, def_refs.setdefault(stmt.name, set()), def_refs)
+        elif isinstance(stmt, (Plan, Loop)):
+            _collect_refs(stmt.body, refs, def_refs)
+        elif isinstance(stmt, Rebind):
+            for value in stmt.values:
+                _expr_names(value, refs)
+        elif not isinstance(stmt, Global):
+            if isinstance(stmt, Print):
+                # `klap` calls print(), which a `maak funksie print` would replace.
+                refs.add("print")
+            _expr_names(stmt.value, refs)
+
+
+def _drop_dead_functions(stmts: tuple[Stmt, ...], live: set[str]) -> tuple[Stmt, ...]:
+    kept: list[Stmt] = []
+    for stmt in stmts:
+        if isinstance(stmt, FunctionDef):
+            if stmt.name not in live:
+                continue
+            stmt = FunctionDef(stmt.name, stmt.params, _drop_dead_functions(stmt.body, live), stmt.line, stmt.col)
+        elif isinstance(stmt, Plan):
+            stmt = Plan(_drop_dead_functions(stmt.body, live), stmt.line, stmt.col)
+        kept.append(stmt)
+    return tuple(kept)
+
+
+def _eliminate_dead_functions(program: Program) -> Program:
+    """Drop functions that no live code can call (by name, so conservatively)."""
+    refs: set[str] = set()
+    def_refs: dict[str, set[str]] = {}
+    _collect_refs(program.body, refs, def_refs)
+    live: set[str] = set()
+    todo = list(refs)
+    while todo:
+        name = todo.pop()
+        if name not in live:
+            live.add(name)
+            todo.extend(def_refs.get(name, ()))
+    return Program(_drop_dead_functions(program.body, live), program.line, program.col)
+
+
+def _count_bindings(stmts: Iterable[Stmt], counts: dict[str, int]) -> None:
+    for stmt in stmts:
+        if isinstance(stmt, FunctionDef):
+            for name in (stmt.name, *stmt.params):
+                counts[name] = counts.get(name, 0) + 1
+            _count_bindings(stmt.body, counts)
+        elif isinstance(stmt, Plan):
+            _count_bindings(stmt.body, counts)
+        elif isinstance(stmt, Assign):
+            counts[stmt.target] = counts.get(stmt.target, 0) + 1
+
+
+def _tail_call(value: Expr, name: str) -> tuple[list[tuple[Expr, bool]], Call] | None:
+    """
+    Split `value` into early-return checks and a call to `name` in tail position.
+
+    In `a ofwel b enook roep f`, the call is the last operand of the last operand:
+    `a` is returned if true, then `b` if false, and only then is `f` called.
+    """
+    checks: list[tuple[Expr, bool]] = []
+    while isinstance(value, BoolOp):
+        checks.extend((v, value.op == "or") for v in value.values[:-1])
+        value = value.values[-1]
+    if isinstance(value, Call) and value.func == name:
+        return checks, value
+    return None
+
+
+def _loop_body(fn: FunctionDef, bindings: dict[str, int]) -> tuple[Stmt, ...] | None:
+    """Return `fn`'s body rewritten as a loop, or None if that could change behaviour."""
+    if not fn.body or bindings.get(fn.name) != 1:
+        return None
+    *stmts, last = fn.body
+    if not isinstance(last, Return):
+        return None
+    found = _tail_call(last.value, fn.name)
+    if found is None:
+        return None
+    checks, call = found
+    # Without an early return the recursion can only end by raising (usually
+    # RecursionError); as a loop it would never end.
+    if not checks or len(call.args) != len(fn.params):
+        return None
+    # A fresh call starts without locals, a loop iteration does not: a variable
+    # read before its assignment would see the previous iteration's value. The
+    # body is straight-line, so this is exact. Nested functions would share one
+    # closure cell between iterations.
+    local_names = {stmt.target for stmt in stmts if isinstance(stmt, Assign)}
+    assigned = set(fn.params)
+    used: set[str] = set(fn.params) | local_names
+    for stmt in stmts:
+        if isinstance(stmt, FunctionDef):
+            return None
+        names: set[str] = set()
+        _collect_refs((stmt,), names, {})
+        if names & (local_names - assigned):
+            return None
+        used |= names
+        if isinstance(stmt, Assign):
+            assigned.add(stmt.target)
+    _collect_refs((last,), used, {})
+    temp = "_tail"
+    while temp in used or temp == fn.name:
+        temp = f"_{temp}"
+    end_col = last.end_col
+    loop_body: list[Stmt] = [*stmts]
+    loop_body.extend(ReturnIf(value, when, temp, last.line, last.col, end_col) for value, when in checks)
+    loop_body.append(Rebind(fn.params, call.args, last.line, last.col, end_col))
+    return (Loop(tuple(loop_body), fn.body[0].line, fn.body[0].col),)
+
+
+def _rewrite_tail_calls(stmts: tuple[Stmt, ...], bindings: dict[str, int]) -> tuple[Stmt, ...]:
+    rewritten: list[Stmt] = []
+    for stmt in stmts:
+        if isinstance(stmt, FunctionDef):
+            body = _rewrite_tail_calls(stmt.body, bindings)
+            stmt = FunctionDef(stmt.name, stmt.params, body, stmt.line, stmt.col)
+            loop = _loop_body(stmt, bindings)
+            if loop is not None:
+                stmt = FunctionDef(stmt.name, stmt.params, loop, stmt.line, stmt.col)
+        elif isinstance(stmt, Plan):
+            stmt = Plan(_rewrite_tail_calls(stmt.body, bindings), stmt.line, stmt.col)
+        rewritten.append(stmt)
+    return tuple(rewritten)
+
+
+def _eliminate_tail_calls(program: Program) -> Program:
+    """
+    Turn functions whose `geeftterug` ends in a call to themselves into loops.
+
+    The call's arguments are assigned to the parameters and the body runs again,
+    in the same frame, so deep recursion needs no stack. Only done when that is
+    exact: the function name is bound nowhere else (no `zet`, parameter or second
+    definition), the call passes one argument per parameter, and an `enook`/`ofwel`
+    before the call can end the recursion.
+    """
+    bindings: dict[str, int] = {}
+    _count_bindings(program.body, bindings)
+    return Program(_rewrite_tail_calls(program.body, bindings), program.line, program.col)
 
-        if tokens[0] == "geeftterug":
-            emit(f"return {_parse_expr(tokens[1:])}")
+
+_BUILTIN_NAMES = frozenset(dir(builtins))
+
+
+def _read_before_assigned(stmts: Iterable[Stmt]) -> set[str]:
+    # Names a flat statement list reads before its first assignment to them. At module
+    # level such a read finds the global or builtin; in a function it would raise
+    # UnboundLocalError.
+    read: set[str] = set()
+    early: set[str] = set()
+    seen_assign: set[str] = set()
+    for stmt in stmts:
+        if isinstance(stmt, FunctionDef):
             continue
+        names: set[str] = set()
+        _collect_refs((stmt,), names, {})
+        read |= names - seen_assign
+        if isinstance(stmt, Assign):
+            if stmt.target in read:
+                early.add(stmt.target)
+            seen_assign.add(stmt.target)
+    return early
+
+
+def _wrap_main(program: Program) -> Program:
+    """
+    Run the top-level statements inside a generated `main()` function.
+
+    Variables assigned there become fast locals instead of module globals. Names
+    that must stay global are declared `global` in main: variables that a function
+    body refers to, variables read before their first assignment (which would
+    otherwise find the builtin or raise UnboundLocalError), variables that shadow a
+    builtin, and functions defined in place. A function is hoisted to
+    module level (ahead of main) if it is defined once, never assigned by `zet`,
+    and not reachable from any statement before its definition, so hoisting cannot
+    turn a NameError into a call. A program with a top-level `geeftterug`, which
+    Python rejects outside a function, is left as is.
+    """
+    body = program.body
+    if any(isinstance(stmt, (Return, Plan, Global, Loop, ReturnIf, Rebind)) for stmt in body):
+        return program
+    refs: set[str] = set()
+    def_refs: dict[str, set[str]] = {}
+    _collect_refs(body, refs, def_refs)
+    defined = [stmt.name for stmt in body if isinstance(stmt, FunctionDef)]
+    assigned = {stmt.target for stmt in body if isinstance(stmt, Assign)}
+
+    hoisted: list[Stmt] = []
+    rest: list[Stmt] = []
+    reachable: set[str] = set()
+    for stmt in body:
+        if isinstance(stmt, FunctionDef):
+            if defined.count(stmt.name) == 1 and stmt.name not in assigned and stmt.name not in reachable:
+                hoisted.append(stmt)
+                continue
+        else:
+            names: set[str] = set()
+            _collect_refs((stmt,), names, def_refs)
+            todo = list(names)
+            while todo:
+                name = todo.pop()
+                if name not in reachable:
+                    reachable.add(name)
+                    todo.extend(def_refs.get(name, ()))
+        rest.append(stmt)
+    if not rest:
+        return program
+
+    used_in_functions = set().union(*def_refs.values())
+    keep_global = (
+        (assigned & used_in_functions)
+        | (assigned & _read_before_assigned(rest))
+        | (assigned & _BUILTIN_NAMES)
+        | {s.name for s in rest if isinstance(s, FunctionDef)}
+    )
+    taken = refs | used_in_functions | assigned | set(def_refs)
+    main = "main"
+    while main in taken:
+        main = f"_{main}"
+    first, last = rest[0], rest[-1]
+    if keep_global:
+        rest.insert(0, Global(tuple(sorted(keep_global)), first.line, first.col))
+    wrapper = FunctionDef(main, (), tuple(rest), first.line, first.col)
+    call = ExprStmt(Call(main, (), last.line, last.col), last.line, last.col, last.col)
+    return Program((*hoisted, wrapper, call), program.line, program.col)
+
+
+def _check_level(level: int) -> None:
+    if level not in OPT_LEVELS:
+        raise ValueError(f"optimisation level must be one of {OPT_LEVELS}, got {level!r}")
+
+
+def optimize_program(program: Program, level: int = 1) -> Program:
+    """
+    Run the optimisation passes selected by `level` over a Program AST.
+
+    - 0: none; the program is returned unchanged.
+    - 1: constant folding of number and text literals (operators, comparisons and
+      `nie`), removal of `enook`/`ofwel` operands that cannot affect the result,
+      removal of unreachable statements after `geeftterug` (a `zet` or `maak funksie`
+      there is kept, as it still decides which names are local). Behaviour is unchanged.
+    - 2: level 1, plus text `+` chains built with one `''.join` (a non-text operand
+      then raises TypeError only after all operands are evaluated), removal of
+      functions that are never called, self tail calls turned into loops, and the
+      top-level statements run inside a generated `main()` so their variables are
+      fast locals. The resulting module defines fewer names and tail calls leave
+      no traceback frames, so use it for programs, not for imported modules.
+    """
+    _check_level(level)
+    if level == 0:
+        return program
+    program = Program(tuple(_optimize_stmts(program.body, join_text=level >= 2)), program.line, program.col)
+    if level >= 2:
+        program = _wrap_main(_eliminate_tail_calls(_eliminate_dead_functions(program)))
+    return program
+
+
+# --- Python source generation ----------------------------------------------------
+
+# Binding strength of Python operators, weakest first.
+_PRECEDENCE = {"or": 1, "and": 2, "not": 3, "compare": 4, "+": 5, "-": 5, "*": 6, "/": 6}
+_ATOM = 7
+
+
+def _expr_prec(node: Expr) -> int:
+    if isinstance(node, BinOp):
+        return _PRECEDENCE[node.op]
+    if isinstance(node, BoolOp):
+        return _PRECEDENCE[node.op]
+    if isinstance(node, UnaryOp):
+        return _PRECEDENCE["not"]
+    if isinstance(node, Compare):
+        return _PRECEDENCE["compare"]
+    return _ATOM
+
+
+def _wrap(node: Expr, min_prec: int) -> str:
+    src = expr_source(node)
+    return f"({src})" if _expr_prec(node) < min_prec else src
+
+
+def expr_source(node: Expr) -> str:
+    """Render an expression node as Python source (parenthesised only where needed)."""
+    if isinstance(node, Constant):
+        return repr(node.value)
+    if isinstance(node, Name):
+        return node.id
+    if isinstance(node, BinOp):
+        prec = _PRECEDENCE[node.op]
+        # Walk the left spine iteratively: long `plakt` chains are thousands deep.
+        tail: list[str] = []
+        while isinstance(node, BinOp) and _PRECEDENCE[node.op] == prec:
+            # Left-associative: the right operand needs parens at equal precedence.
+            tail.append(f" {node.op} {_wrap(node.right, prec + 1)}")
+            node = node.left
+        tail.append(_wrap(node, prec))
+        return "".join(reversed(tail))
+    if isinstance(node, UnaryOp):
+        return f"not {_wrap(node.operand, _PRECEDENCE['not'])}"
+    if isinstance(node, BoolOp):
+        prec = _PRECEDENCE[node.op]
+        return f" {node.op} ".join(_wrap(v, prec + 1) for v in node.values)
+    if isinstance(node, Compare):
+        prec = _PRECEDENCE["compare"] + 1
+        parts = [_wrap(node.left, prec)]
+        for op, comparator in zip(node.ops, node.comparators):
+            parts.append(f"{op} {_wrap(comparator, prec)}")
+        return " ".join(parts)
+    if isinstance(node, Call):
+        return f"{node.func}({', '.join(expr_source(a) for a in node.args)})"
+    if isinstance(node, Concat):
+        return f"''.join(({', '.join(expr_source(v) for v in node.values)}))"
+    raise TypeError(f"not an expression node: {node!r}")
+
+
+def _stmt_lines(stmt: Stmt, indent: int) -> Iterator[str]:
+    pad = "    " * indent
+    if isinstance(stmt, Plan):
+        for inner in stmt.body:
+            yield from _stmt_lines(inner, indent)
+    elif isinstance(stmt, FunctionDef):
+        yield f"{pad}def {stmt.name}({', '.join(stmt.params)}):"
+        body = [line for inner in stmt.body for line in _stmt_lines(inner, indent + 1)]
+        yield from body or [f"{pad}    pass"]
+    elif isinstance(stmt, Assign):
+        yield f"{pad}{stmt.target} = {expr_source(stmt.value)}"
+    elif isinstance(stmt, Print):
+        yield f"{pad}print({expr_source(stmt.value)})"
+    elif isinstance(stmt, ExprStmt):
+        yield f"{pad}{expr_source(stmt.value)}"
+    elif isinstance(stmt, Return):
+        yield f"{pad}return {expr_source(stmt.value)}"
+    elif isinstance(stmt, Global):
+        yield f"{pad}global {', '.join(stmt.names)}"
+    elif isinstance(stmt, Loop):
+        yield f"{pad}while True:"
+        for inner in stmt.body:
+            yield from _stmt_lines(inner, indent + 1)
+    elif isinstance(stmt, ReturnIf):
+        test = f"{stmt.temp} := {expr_source(stmt.value)}"
+        yield f"{pad}if {test if stmt.when else f'not ({test})'}:"
+        yield f"{pad}    return {stmt.temp}"
+    elif isinstance(stmt, Rebind):
+        if stmt.targets:
+            values = ", ".join(expr_source(v) for v in stmt.values)
+            yield f"{pad}{', '.join(stmt.targets)} = {values}"
+    else:
+        raise TypeError(f"not a statement node: {stmt!r}")
+
+
+def generate_source(program: Program) -> str:
+    """Render a Program AST as Python source."""
+    return "".join(f"{line}\n" for stmt in program.body for line in _stmt_lines(stmt, 0)) or "\n"
+
+
+def compile_plats(plats_src: str, optimize: int = 0) -> str:
+    """Compile Platskript source to Python source, optimised at level `optimize`."""
+    return generate_source(optimize_program(parse(plats_src), optimize))
+
+
+def compile_plats_iter(lines: Iterable[str], optimize: int = 0) -> Iterator[str]:
+    """
+    Compile Platskript lazily: read `lines` on demand and yield Python lines
+    (newline-terminated) as soon as each top-level statement or function is complete.
+
+    Only the statement being parsed is held in memory, so a huge generated file
+    can be compiled from an open file straight to another. The joined output equals
+    `compile_plats(src, optimize)`; syntax errors surface when the iterator reaches
+    them. Level 2 needs the whole program to find unused functions, so it parses
+    everything before yielding the first line.
+    """
+    stmts: Iterable[Stmt]
+    if optimize >= 2:
+        stmts = optimize_program(_Parser(tokenize(lines)).parse_program(), optimize).body
+    else:
+        _check_level(optimize)
+        stmts = _Parser(tokenize(lines)).iter_block(None, inline_plans=True)
+        if optimize:
+            stmts = _optimize_stmts(stmts)
+    emitted = False
+    for stmt in stmts:
+        for line in _stmt_lines(stmt, 0):
+            emitted = True
+            yield f"{line}\n"
+    if not emitted:
+        yield "\n"
+
+
+# --- Python AST generation -------------------------------------------------------
+
+# Operator and context nodes carry no position, so one shared instance of each will do.
+_LOAD = ast.Load()
+_STORE = ast.Store()
+_NOT = ast.Not()
+_AST_BINOPS: dict[str, ast.operator] = {"+": ast.Add(), "-": ast.Sub(), "*": ast.Mult(), "/": ast.Div()}
+_AST_BOOLOPS: dict[str, ast.boolop] = {"and": ast.And(), "or": ast.Or()}
+_AST_CMPOPS: dict[str, ast.cmpop] = {"==": ast.Eq(), "!=": ast.NotEq(), ">": ast.Gt(), "<": ast.Lt()}
+# Python 3.12 added `type_params` to function definitions.
+_FUNCTIONDEF_EXTRA: dict[str, list[ast.AST]] = (
+    {"type_params": []} if "type_params" in ast.FunctionDef._fields else {}
+)
+
+
+def _load_ast(name: str, col: int, loc: dict[str, int]) -> ast.expr:
+    # `a.b.c` -> Attribute(Attribute(Name(a), b), c).
+    first, *attrs = name.split(".")
+    result: ast.expr = ast.Name(first, _LOAD, col_offset=col, **loc)
+    for attr in attrs:
+        result = ast.Attribute(result, attr, _LOAD, col_offset=col, **loc)
+    return result
+
+
+def _expr_ast(node: Expr, loc: dict[str, int]) -> ast.expr:
+    """
+    Convert an expression node; `loc` holds the enclosing statement's line and end.
+
+    Plats columns are 1-based, Python's offsets 0-based. Every expression ends where
+    its statement ends, which is all traceback carets need.
+    """
+    col = node.col - 1
+    if isinstance(node, Constant):
+        return ast.Constant(node.value, col_offset=col, **loc)
+    if isinstance(node, Name):
+        return _load_ast(node.id, col, loc)
+    if isinstance(node, BinOp):
+        # Walk the left spine iteratively, like expr_source.
+        spine: list[BinOp] = []
+        while isinstance(node, BinOp):
+            spine.append(node)
+            node = node.left
+        result = _expr_ast(node, loc)
+        for binop in reversed(spine):
+            right = _expr_ast(binop.right, loc)
+            result = ast.BinOp(result, _AST_BINOPS[binop.op], right, col_offset=binop.col - 1, **loc)
+        return result
+    if isinstance(node, Call):
+        func = _load_ast(node.func, col, loc)
+        return ast.Call(func, [_expr_ast(a, loc) for a in node.args], [], col_offset=col, **loc)
+    if isinstance(node, Compare):
+        return ast.Compare(
+            _expr_ast(node.left, loc),
+            [_AST_CMPOPS[op] for op in node.ops],
+            [_expr_ast(c, loc) for c in node.comparators],
+            col_offset=col,
+            **loc,
+        )
+    if isinstance(node, BoolOp):
+        values = [_expr_ast(v, loc) for v in node.values]
+        return ast.BoolOp(_AST_BOOLOPS[node.op], values, col_offset=col, **loc)
+    if isinstance(node, UnaryOp):
+        return ast.UnaryOp(_NOT, _expr_ast(node.operand, loc), col_offset=col, **loc)
+    if isinstance(node, Concat):
+        join = ast.Attribute(ast.Constant("", col_offset=col, **loc), "join", _LOAD, col_offset=col, **loc)
+        values = ast.Tuple([_expr_ast(v, loc) for v in node.values], _LOAD, col_offset=col, **loc)
+        return ast.Call(join, [values], [], col_offset=col, **loc)
+    raise TypeError(f"not an expression node: {node!r}")
+
+
+def _stmt_asts(stmt: Stmt) -> Iterator[ast.stmt]:
+    if isinstance(stmt, Plan):
+        for inner in stmt.body:
+            yield from _stmt_asts(inner)
+        return
+    col = stmt.col - 1
+    if isinstance(stmt, FunctionDef):
+        header = {"lineno": stmt.line, "end_lineno": stmt.line, "end_col_offset": col + len("maak")}
+        body = [node for inner in stmt.body for node in _stmt_asts(inner)]
+        if not body:
+            body = [ast.Pass(col_offset=col, **header)]
+        args = ast.arguments(
+            posonlyargs=[],
+            args=[ast.arg(p, col_offset=col, **header) for p in stmt.params],
+            kwonlyargs=[],
+            kw_defaults=[],
+            defaults=[],
+        )
+        yield ast.FunctionDef(
+            stmt.name,
+            args,
+            body,
+            [],
+            **_FUNCTIONDEF_EXTRA,
+            lineno=stmt.line,
+            col_offset=col,
+            end_lineno=body[-1].end_lineno,
+            end_col_offset=body[-1].end_col_offset,
+        )
+        return
+    if isinstance(stmt, Global):
+        yield ast.Global(list(stmt.names), lineno=stmt.line, col_offset=col, end_lineno=stmt.line, end_col_offset=col)
+        return
+    if isinstance(stmt, Loop):
+        body = [node for inner in stmt.body for node in _stmt_asts(inner)]
+        header = {"lineno": stmt.line, "end_lineno": stmt.line, "end_col_offset": col}
+        yield ast.While(
+            ast.Constant(True, col_offset=col, **header),
+            body,
+            [],
+            lineno=stmt.line,
+            col_offset=col,
+            end_lineno=body[-1].end_lineno,
+            end_col_offset=body[-1].end_col_offset,
+        )
+        return
+    loc = {"lineno": stmt.line, "end_lineno": stmt.line, "end_col_offset": stmt.end_col - 1}
+    if isinstance(stmt, Assign):
+        target = ast.Name(stmt.target, _STORE, col_offset=col, **loc)
+        yield ast.Assign([target], _expr_ast(stmt.value, loc), col_offset=col, **loc)
+    elif isinstance(stmt, Print):
+        func = ast.Name("print", _LOAD, col_offset=col, **loc)
+        yield ast.Expr(ast.Call(func, [_expr_ast(stmt.value, loc)], [], col_offset=col, **loc), col_offset=col, **loc)
+    elif isinstance(stmt, ExprStmt):
+        yield ast.Expr(_expr_ast(stmt.value, loc), col_offset=col, **loc)
+    elif isinstance(stmt, Return):
+        yield ast.Return(_expr_ast(stmt.value, loc), col_offset=col, **loc)
+    elif isinstance(stmt, ReturnIf):
+        temp = ast.Name(stmt.temp, _STORE, col_offset=col, **loc)
+        test: ast.expr = ast.NamedExpr(temp, _expr_ast(stmt.value, loc), col_offset=col, **loc)
+        if not stmt.when:
+            test = ast.UnaryOp(_NOT, test, col_offset=col, **loc)
+        ret = ast.Return(ast.Name(stmt.temp, _LOAD, col_offset=col, **loc), col_offset=col, **loc)
+        yield ast.If(test, [ret], [], col_offset=col, **loc)
+    elif isinstance(stmt, Rebind):
+        if not stmt.targets:
+            return
+        if len(stmt.targets) == 1:
+            target: ast.expr = ast.Name(stmt.targets[0], _STORE, col_offset=col, **loc)
+            value = _expr_ast(stmt.values[0], loc)
+        else:
+            names = [ast.Name(t, _STORE, col_offset=col, **loc) for t in stmt.targets]
+            target = ast.Tuple(names, _STORE, col_offset=col, **loc)
+            value = ast.Tuple([_expr_ast(v, loc) for v in stmt.values], _LOAD, col_offset=col, **loc)
+        yield ast.Assign([target], value, col_offset=col, **loc)
+    else:
+        raise TypeError(f"not a statement node: {stmt!r}")
+
 
-        raise ValueError(f"unknown instruction: {line}")
+def generate_ast(program: Program) -> ast.Module:
+    """Convert a Program AST to a Python `ast.Module` with line numbers from the Plats source."""
+    return ast.Module([node for stmt in program.body for node in _stmt_asts(stmt)], [])
 
-    if stack:
-        raise ValueError(f"unclosed blocks: {stack}")
-    if indent != 0:
-        raise ValueError(f"internal error: indent={indent}")
 
-    return "\n".join(py_lines) + "\n"
+def compile_plats_code(
+    plats_src: str | Iterable[str], filename: str = "<plats>", optimize: int = 0
+) -> CodeType:
+    """
+    Compile Platskript source straight to a Python code object.
 
+    Skips generating and re-parsing Python source; tracebacks report `filename` and
+    the line numbers of the Plats source (comment lines included). `optimize` is the
+    level for `optimize_program`.
+    """
+    return compile(generate_ast(optimize_program(parse(plats_src), optimize)), filename, "exec")
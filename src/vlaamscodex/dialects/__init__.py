@@ -1,6 +1,53 @@
 from __future__ import annotations
 
-from .transformer import PackInfo, available_packs, transform
+from importlib import import_module
+from typing import Any
 
-__all__ = ["PackInfo", "available_packs", "transform"]
+from .transformer import DialectTimeoutError, PackInfo, available_packs, transform
 
+# Exported lazily: the helper submodules pull in heavy standard modules (asyncio,
+# concurrent.futures, mmap, ...) that most users of the package, including
+# `plats run`, never need.
+_LAZY_EXPORTS = {
+    "DialectCandidate": "identify",
+    "FileTransformStats": "files",
+    "IncrementalTransform": "incremental",
+    "ReverseTable": "reverse",
+    "atransform_stream": "streaming",
+    "identify_dialect": "identify",
+    "reverse_table": "reverse",
+    "reverse_transform": "reverse",
+    "transform_bytes": "utf8",
+    "transform_file": "files",
+    "transform_markup": "markup",
+    "transform_parallel": "parallel",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = [
+    "DialectCandidate",
+    "DialectTimeoutError",
+    "FileTransformStats",
+    "IncrementalTransform",
+    "PackInfo",
+    "ReverseTable",
+    "atransform_stream",
+    "available_packs",
+    "identify_dialect",
+    "reverse_table",
+    "reverse_transform",
+    "transform",
+    "transform_bytes",
+    "transform_file",
+    "transform_markup",
+    "transform_parallel",
+]
@@ -0,0 +1,146 @@
+"""File-to-file dialect transformation with bounded memory.
+
+`transform_file` memory-maps the input, walks it in sentence-aligned windows and
+streams the transformed text to the output file, so a multi-gigabyte dump never has
+to be held in RAM as a whole. Peak memory is a small multiple of `window_bytes`
+(the window's bytes, its decoded text and its transformed output).
+
+Windows end on sentence boundaries and carry their starting sentence index, so the
+output is identical to `transform(src.read_bytes().decode("utf-8"), dialect_id)`.
+Newlines are not translated: CRLF input gives CRLF output, unlike `read_text()`,
+which would turn it into LF. A single sentence longer than the window grows the
+window until it fits. Packs whose rules are not
+sentence-local are transformed in one window.
+
+Example:
+    >>> import tempfile
+    >>> from pathlib import Path
+    >>> from vlaamscodex.dialects.files import transform_file
+    >>> tmp = Path(tempfile.mkdtemp())
+    >>> _ = (tmp / "in.txt").write_text("Dat is goed. Wat wil jij?", encoding="utf-8")
+    >>> stats = transform_file(tmp / "in.txt", tmp / "out.txt", "vlaams/basis", window_bytes=8)
+    >>> (tmp / "out.txt").read_text(encoding="utf-8"), stats.sentences
+    ('Da’s goed. Wa wil ge?', 2)
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from .transformer import (
+    _DEFAULT_REGISTRY,
+    _build_config,
+    _env_int,
+    _iter_sentence_spans,
+    _pipeline_is_sentence_local,
+    _run_pipeline,
+)
+
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass(frozen=True, slots=True)
+class FileTransformStats:
+    bytes_in: int
+    bytes_out: int
+    sentences: int
+    windows: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Input bytes per second."""
+        return self.bytes_in / self.seconds if self.seconds > 0 else 0.0
+
+
+def _char_boundary(buf: mmap.mmap, pos: int) -> int:
+    """Move pos back to the start of the UTF-8 sequence it points into."""
+    while pos > 0 and 0x80 <= buf[pos] < 0xC0:
+        pos -= 1
+    return pos
+
+
+def transform_file(
+    src: str | os.PathLike[str],
+    dst: str | os.PathLike[str],
+    dialect_id: str,
+    *,
+    window_bytes: int | None = None,
+    progress: ProgressCallback | None = None,
+    **config: Any,
+) -> FileTransformStats:
+    """
+    Transform the UTF-8 file `src` into `dst`, window by window.
+
+    - `window_bytes`: input bytes per window (default from
+      `VLAAMSCODEX_DIALECT_FILE_WINDOW`, 8 MiB).
+    - `progress`: called as `progress(bytes_done, bytes_total)` after every window.
+
+    The output is written to a temporary file next to `dst` and renamed into place
+    when complete. Keyword arguments are the config overrides accepted by `transform()`.
+    """
+    if not isinstance(dialect_id, str) or not dialect_id:
+        raise TypeError("dialect_id must be non-empty str")
+    if window_bytes is None:
+        window_bytes = _env_int("VLAAMSCODEX_DIALECT_FILE_WINDOW", 8 * 1024 * 1024)
+    if window_bytes < 1:
+        raise ValueError("window_bytes must be >= 1")
+
+    cfg = _build_config(**config)
+    pipeline = _DEFAULT_REGISTRY.pipeline(dialect_id, cfg)
+    src_path = Path(src)
+    dst_path = Path(dst)
+    total = src_path.stat().st_size
+    if not _pipeline_is_sentence_local(pipeline, cfg):
+        window_bytes = max(window_bytes, total)
+
+    started = time.perf_counter()
+    bytes_out = 0
+    sentences = 0
+    windows = 0
+    tmp_path = dst_path.with_name(f".{dst_path.name}.{os.getpid()}.tmp")
+    try:
+        with src_path.open("rb") as fin, tmp_path.open("wb") as fout:
+            if total:
+                with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    pos = 0
+                    size = window_bytes
+                    while pos < total:
+                        end = min(total, pos + size)
+                        if end < total:
+                            end = _char_boundary(mm, end)
+                        text = mm[pos:end].decode("utf-8")
+                        spans = list(_iter_sentence_spans(text))
+                        if end < total:
+                            # The last span may continue past the window; keep it for the next one.
+                            if len(spans) < 2:
+                                size *= 2
+                                continue
+                            spans.pop()
+                            text = text[: spans[-1][1]]
+                        out = _run_pipeline(text, pipeline, cfg, sentence_offset=sentences).encode("utf-8")
+                        fout.write(out)
+                        pos += len(text.encode("utf-8"))
+                        bytes_out += len(out)
+                        sentences += len(spans)
+                        windows += 1
+                        size = window_bytes
+                        if progress is not None:
+                            progress(pos, total)
+        os.replace(tmp_path, dst_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    return FileTransformStats(
+        bytes_in=total,
+        bytes_out=bytes_out,
+        sentences=sentences,
+        windows=windows,
+        seconds=time.perf_counter() - started,
+    )
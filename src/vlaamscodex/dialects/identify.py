@@ -0,0 +1,137 @@
+"""Dialect identification: which pack does a piece of text most resemble?
+
+The index is built from the output side of every resolved pack: the words its
+rules write (`to` of `replace_word`/`replace_regex`, particles). Each such marker
+word maps to the packs that can produce it, weighted by how rare it is across packs
+(inverse document frequency), so words every Flemish pack inherits from
+`vlaams/basis` count for little and a pack's own vocabulary counts for a lot.
+
+`identify_dialect` tokenises the text once and sums marker weights per pack.
+
+Example:
+    >>> from vlaamscodex.dialects.identify import identify_dialect
+    >>> identify_dialect("Da’s goe en rap, ge moet effen wachten.", limit=1)[0].id
+    'vlaams/west-vlaams'
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Iterable
+
+from .transformer import _DEFAULT_REGISTRY, _DialectRegistry, _default_config, _expand_vars
+
+_TOKEN_RE = re.compile(r"\w+(?:[’']\w+)*")
+
+
+def _tokens(text: str) -> Iterable[str]:
+    return (m.group(0).lower() for m in _TOKEN_RE.finditer(text))
+
+
+def _marker_words(rules: Iterable[dict[str, Any]]) -> set[str]:
+    config = _default_config()
+    words: set[str] = set()
+    for rule in rules:
+        rtype = rule.get("type")
+        if rtype in ("replace_word", "replace_regex"):
+            dst = _expand_vars(str(rule.get("to", "")), config)
+            # Backreferences (\1, \g<name>) are not literal output.
+            dst = re.sub(r"\\(?:\d+|g<\w+>)", " ", dst)
+            words.update(_tokens(dst))
+        elif rtype == "append_particle":
+            words.update(_tokens(str(rule.get("particle", ""))))
+    return words
+
+
+@dataclass(frozen=True, slots=True)
+class DialectCandidate:
+    id: str
+    label: str
+    score: float
+    markers: tuple[str, ...]
+
+
+class DialectIndex:
+    """Inverted index from dialect marker words to the packs that produce them."""
+
+    def __init__(self, postings: dict[str, tuple[tuple[str, float], ...]], labels: dict[str, str]) -> None:
+        self._postings = postings
+        self._labels = labels
+
+    @classmethod
+    def build(cls, registry: _DialectRegistry | None = None) -> "DialectIndex":
+        registry = registry or _DEFAULT_REGISTRY
+        packs = registry.available()
+        markers: dict[str, set[str]] = {}
+        for pack in packs:
+            resolved = registry.resolve(pack.id)
+            words = _marker_words(resolved.rules)
+            if words:
+                markers[pack.id] = words
+
+        df: Counter[str] = Counter()
+        for words in markers.values():
+            df.update(words)
+        n = len(markers)
+        postings: dict[str, list[tuple[str, float]]] = {}
+        for pack_id, words in markers.items():
+            for word in words:
+                weight = math.log((n + 1) / df[word])
+                postings.setdefault(word, []).append((pack_id, weight))
+        return cls(
+            {word: tuple(entries) for word, entries in postings.items()},
+            {p.id: p.label for p in packs},
+        )
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def identify(self, text: str, *, limit: int | None = 5) -> list[DialectCandidate]:
+        """Rank packs by the summed weight of their marker words found in text."""
+        scores: dict[str, float] = {}
+        matched: dict[str, set[str]] = {}
+        for token in _tokens(text):
+            entries = self._postings.get(token)
+            if entries is None:
+                continue
+            for pack_id, weight in entries:
+                scores[pack_id] = scores.get(pack_id, 0.0) + weight
+                matched.setdefault(pack_id, set()).add(token)
+
+        ranked = sorted(
+            (pid for pid, score in scores.items() if score > 0),
+            # Highest score first; on ties prefer the more specific (fewer markers hit) pack, then id.
+            key=lambda pid: (-scores[pid], len(matched[pid]), pid),
+        )
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [
+            DialectCandidate(
+                id=pid,
+                label=self._labels.get(pid, pid),
+                score=round(scores[pid], 6),
+                markers=tuple(sorted(matched[pid])),
+            )
+            for pid in ranked
+        ]
+
+
+@lru_cache(maxsize=1)
+def _default_index() -> DialectIndex:
+    return DialectIndex.build()
+
+
+def identify_dialect(text: str, *, limit: int | None = 5) -> list[DialectCandidate]:
+    """
+    Return the packs `text` most resembles, best first.
+
+    An empty list means no marker word of any pack occurs in the text (which is
+    what standard Dutch looks like to this index).
+    """
+    if not isinstance(text, str):
+        raise TypeError("text must be str")
+    return _default_index().identify(text, limit=limit)
@@ -0,0 +1,170 @@
+"""Incremental dialect transformation for documents that are edited in place.
+
+An editor integration keeps one `IncrementalTransform` per open document and feeds
+it every edit. Only the sentences touched by an edit are transformed again; the
+rest of the output is reused. Results are identical to calling `transform()` on the
+whole document, including deterministic particle placement.
+
+Example:
+    >>> from vlaamscodex.dialects.incremental import IncrementalTransform
+    >>> doc = IncrementalTransform("Dat is goed. Wat wil jij?", "vlaams/basis")
+    >>> doc.output
+    'Da’s goed. Wa wil ge?'
+    >>> doc.edit(7, 11, "fijn")
+    (0, 11, 'Da’s fijn. ')
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Any
+
+from .transformer import (
+    _DEFAULT_REGISTRY,
+    _build_config,
+    _iter_sentence_spans,
+    _pipeline_is_sentence_local,
+    _pipeline_uses_sentence_index,
+    _run_pipeline,
+)
+
+_CLOSED_SENTENCE_RE = re.compile(r"[.!?]+(\s*)$")
+
+
+def _ends_sentence(region: str, next_char: str) -> bool:
+    """True if the full-text sentence splitter would end a sentence exactly at the end of `region`."""
+    m = _CLOSED_SENTENCE_RE.search(region)
+    if m is None:
+        return False
+    if m.group(1):
+        return not next_char.isspace()
+    return next_char not in ".!?" and not next_char.isspace()
+
+
+class IncrementalTransform:
+    """
+    A document plus its dialect transform, kept in sync sentence by sentence.
+
+    Sentence boundaries come from the same splitter `transform()` uses. An edit
+    re-splits only the sentences it touches (plus the one before, whose trailing
+    whitespace may change) and transforms those again, so the cost follows the size
+    of the edit rather than the document.
+
+    Two situations fall back to wider work to keep output identical to a full run:
+    - when the pack's rules are not sentence-local (see `_pipeline_is_sentence_local`),
+      every edit re-transforms the whole document;
+    - when particles are enabled with probability < 1 and an edit changes the number of
+      sentences, later sentences are re-transformed because particle sampling is keyed
+      on the sentence index.
+
+    Keyword arguments are the config overrides accepted by `transform()`.
+    """
+
+    def __init__(self, text: str, dialect_id: str, **config: Any) -> None:
+        if not isinstance(text, str):
+            raise TypeError("text must be str")
+        self.dialect_id = dialect_id
+        self._config = _build_config(**config)
+        self._pipeline = _DEFAULT_REGISTRY.pipeline(dialect_id, self._config)
+        self._local = _pipeline_is_sentence_local(self._pipeline, self._config)
+        self._indexed = _pipeline_uses_sentence_index(self._pipeline, self._config)
+        self._src: list[str] = []
+        self._out: list[str] = []
+        self._starts: list[int] | None = None
+        self._output: str | None = None
+        self.set_text(text)
+
+    @property
+    def text(self) -> str:
+        return "".join(self._src)
+
+    @property
+    def output(self) -> str:
+        if self._output is None:
+            self._output = "".join(self._out)
+        return self._output
+
+    def set_text(self, text: str) -> None:
+        """Replace the whole document (full transform)."""
+        if not self._local:
+            self._src = [text] if text else []
+            self._out = [self._transform(text, 0)] if text else []
+        else:
+            self._src = [text[s:e] for s, e, _q in _iter_sentence_spans(text)]
+            self._out = [self._transform(src, i) for i, src in enumerate(self._src)]
+        self._starts = None
+        self._output = None
+
+    def edit(self, start: int, end: int, replacement: str) -> tuple[int, int, str]:
+        """
+        Replace text[start:end] with `replacement` and update the output.
+
+        Returns (out_start, out_end, out_text): the output changed by replacing
+        output[out_start:out_end] (old coordinates) with out_text.
+        """
+        text_len = self._text_len()
+        if not (0 <= start <= end <= text_len):
+            raise ValueError(f"edit range {start}:{end} outside document of length {text_len}")
+        if not isinstance(replacement, str):
+            raise TypeError("replacement must be str")
+
+        if not self._local or not self._src:
+            old_output = self.output
+            text = self.text
+            self.set_text(text[:start] + replacement + text[end:])
+            return 0, len(old_output), self.output
+
+        starts = self._sentence_starts()
+        n = len(self._src)
+        first = max(0, self._index_at(start) - 1)
+        last = self._index_at(end)
+        region_start = starts[first]
+        region_end = starts[last] + len(self._src[last])
+        while True:
+            region = (
+                "".join(self._src[first : last + 1])[: start - region_start]
+                + replacement
+                + "".join(self._src[first : last + 1])[end - region_start :]
+            )
+            if last == n - 1:
+                break
+            if _ends_sentence(region, self._src[last + 1][:1]):
+                break
+            last += 1
+            region_end += len(self._src[last])
+
+        new_src = [region[s:e] for s, e, _q in _iter_sentence_spans(region)]
+        new_out = [self._transform(src, first + k) for k, src in enumerate(new_src)]
+        stop = last + 1
+        if self._indexed and len(new_src) != stop - first:
+            # Later sentences moved to a new index; their particle draws change.
+            suffix = self._src[stop:]
+            new_src.extend(suffix)
+            base = first + len(new_out)
+            new_out.extend(self._transform(src, base + k) for k, src in enumerate(suffix))
+            stop = n
+
+        out_start = sum(len(o) for o in self._out[:first])
+        out_end = out_start + sum(len(o) for o in self._out[first:stop])
+        self._src[first:stop] = new_src
+        self._out[first:stop] = new_out
+        self._starts = None
+        self._output = None
+        return out_start, out_end, "".join(new_out)
+
+    def _transform(self, text: str, sentence_offset: int) -> str:
+        return _run_pipeline(text, self._pipeline, self._config, sentence_offset=sentence_offset)
+
+    def _text_len(self) -> int:
+        starts = self._sentence_starts()
+        return starts[-1] + len(self._src[-1]) if self._src else 0
+
+    def _sentence_starts(self) -> list[int]:
+        if self._starts is None:
+            self._starts = [0, *accumulate(len(s) for s in self._src[:-1])] if self._src else []
+        return self._starts
+
+    def _index_at(self, pos: int) -> int:
+        return min(len(self._src) - 1, bisect_right(self._sentence_starts(), pos) - 1)
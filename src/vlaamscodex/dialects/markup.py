@@ -0,0 +1,154 @@
+"""Markup-aware dialect transformation for HTML and Markdown documents.
+
+Only human-readable text is transformed. Tags (including their attributes), comments,
+entities, `<script>`/`<style>`/`<pre>`/`<code>` bodies, Markdown code spans, fenced
+code blocks and link destinations are passed through byte-for-byte.
+
+The document is tokenised in a single regex pass. Every non-text segment is swapped
+for a short private-use placeholder, each block of masked text goes through the
+compiled pack once, and the placeholders are swapped back. Within a block the text
+nodes are one string, so sentence context survives inline tags: in
+`Wat wil <b>jij</b>?` the word `jij` is part of a question, so `only_in_questions`
+rules apply. Block-level tags (`<p>`, `<li>`, `<br>`, headings, table cells, ...),
+Markdown fenced code blocks and blank lines end a block, and with it the sentence.
+
+Example:
+    >>> from vlaamscodex.dialects.markup import transform_markup
+    >>> transform_markup('<p class="wat">Wat wil <b>jij</b>?</p>', "vlaams/basis", markup="html")
+    '<p class="wat">Wa wil <b>ge</b>?</p>'
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Iterator
+
+from .transformer import _DEFAULT_REGISTRY, _build_config, _iter_sentence_spans, _run_pipeline
+
+# Placeholder delimiters (private use area, distinct from the protected-term masks).
+_RAW_OPEN = "\uE002"
+_RAW_CLOSE = "\uE003"
+_RAW_PLACEHOLDER_RE = re.compile(f"{_RAW_OPEN}(\\d+){_RAW_CLOSE}")
+
+# Tag body: quoted attribute values may contain `>`.
+_TAG_BODY = r"""(?:[^>"']|"[^"]*"|'[^']*')*"""
+
+_HTML_RAW_RE = re.compile(
+    r"<!--.*?-->"
+    rf"|<(script|style|pre|code|textarea)\b{_TAG_BODY}>.*?</\1\s*>"
+    rf"|<[A-Za-z/!?]{_TAG_BODY}>"
+    # Unbalanced quote (invalid HTML): up to the first `>`.
+    r"|<[A-Za-z/!?][^>]*>"
+    r"|&(?:#\d+|#[xX][0-9A-Fa-f]+|[A-Za-z][A-Za-z0-9]*);",
+    flags=re.DOTALL | re.IGNORECASE,
+)
+
+_MARKDOWN_RAW_RE = re.compile(
+    # Fenced code block: ``` or ~~~ up to a matching closing fence (or end of text).
+    r"^[ ]{0,3}(?P<fence>`{3,}|~{3,})[^\n]*(?:\n.*?)??(?:\n[ ]{0,3}(?P=fence)[`~]*[ \t]*(?=\n|\Z)|\Z)"
+    # Inline code span with a matching backtick run.
+    r"|(?P<ticks>`+)[^\n]+?(?P=ticks)"
+    # Link/image destinations and reference definitions.
+    r"|\]\([^)\n]*\)"
+    r"|^[ ]{0,3}\[[^\]\n]+\]:[^\n]*$"
+    # Autolinks, inline HTML and entities.
+    r"""|<[A-Za-z/!?](?:[^>"'\n]|"[^"\n]*"|'[^'\n]*')*>"""
+    r"|<[A-Za-z/!?][^>\n]*>"
+    r"|&(?:#\d+|#[xX][0-9A-Fa-f]+|[A-Za-z][A-Za-z0-9]*);",
+    flags=re.DOTALL | re.MULTILINE,
+)
+
+_RAW_PATTERNS = {"html": _HTML_RAW_RE, "markdown": _MARKDOWN_RAW_RE}
+
+# Tags that start or end a block of text; inline tags (`<b>`, `<a>`, `<code>`, ...)
+# keep the surrounding sentence together.
+_BLOCK_TAGS = frozenset(
+    """
+    address article aside blockquote body br dd details dialog div dl dt fieldset
+    figcaption figure footer form h1 h2 h3 h4 h5 h6 head header hr html legend li
+    main nav ol option p pre script section style summary table tbody td textarea
+    tfoot th thead title tr ul
+    """.split()
+)
+_TAG_NAME_RE = re.compile(r"</?([A-Za-z][A-Za-z0-9]*)")
+_BLANK_LINE_RE = re.compile(r"(\n[ \t]*\n\s*)")
+
+
+def _ends_block(segment: str) -> bool:
+    # A fenced code block spans lines; a code span never does.
+    if segment.lstrip(" ").startswith(("```", "~~~")) and "\n" in segment:
+        return True
+    m = _TAG_NAME_RE.match(segment)
+    return m is not None and m.group(1).lower() in _BLOCK_TAGS
+
+
+def iter_markup_segments(text: str, markup: str = "html") -> Iterator[tuple[bool, str]]:
+    """Yield (is_text, segment) pairs covering `text` in order."""
+    try:
+        raw_re = _RAW_PATTERNS[markup]
+    except KeyError:
+        raise ValueError(f"Unsupported markup: {markup!r} (expected 'html' or 'markdown')") from None
+    pos = 0
+    for m in raw_re.finditer(text):
+        if m.start() > pos:
+            yield True, text[pos : m.start()]
+        yield False, m.group(0)
+        pos = m.end()
+    if pos < len(text):
+        yield True, text[pos:]
+
+
+def transform_markup(text: str, dialect_id: str, *, markup: str = "html", **config: Any) -> str:
+    """
+    Transform the text nodes of an HTML or Markdown document with a dialect pack.
+
+    Keyword arguments are the config overrides accepted by `transform()`.
+    """
+    if not isinstance(text, str):
+        raise TypeError("text must be str")
+    if not isinstance(dialect_id, str) or not dialect_id:
+        raise TypeError("dialect_id must be non-empty str")
+
+    cfg = _build_config(**config)
+    pipeline = _DEFAULT_REGISTRY.pipeline(dialect_id, cfg)
+    out: list[str] = []
+    raw: list[str] = []
+    parts: list[str] = []
+    sentences = 0
+
+    def flush() -> None:
+        # Transform the pending block on its own, numbering its sentences after the
+        # ones before it so particle placement does not depend on the block split.
+        nonlocal sentences
+        masked = "".join(parts)
+        parts.clear()
+        if not masked.strip():
+            out.append(masked)
+            return
+        out.append(_run_pipeline(masked, pipeline, cfg, sentence_offset=sentences))
+        sentences += sum(1 for _span in _iter_sentence_spans(masked))
+
+    for is_text, segment in iter_markup_segments(text, markup):
+        if is_text:
+            if markup == "markdown":
+                pieces = _BLANK_LINE_RE.split(segment)
+                for k, piece in enumerate(pieces):
+                    if k % 2:
+                        flush()
+                        out.append(piece)
+                    elif piece:
+                        parts.append(piece)
+            else:
+                parts.append(segment)
+        elif _ends_block(segment):
+            flush()
+            out.append(segment)
+        else:
+            parts.append(f"{_RAW_OPEN}{len(raw)}{_RAW_CLOSE}")
+            raw.append(segment)
+    flush()
+
+    result = "".join(out)
+    if not raw:
+        return result
+    return _RAW_PLACEHOLDER_RE.sub(lambda m: raw[int(m.group(1))], result)
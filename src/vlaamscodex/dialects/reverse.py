@@ -0,0 +1,179 @@
+"""Reverse transformation: normalise dialect text back towards `nl/standard`.
+
+For search indexing we want `Da’s goe, ge moet effen wachten.` and `Dat is goed, jij
+moet even wachten.` to index the same. `reverse_transform` does that with an inverse
+lookup table derived from a resolved pack's rules:
+
+- `replace_word` rules contribute `to -> from`;
+- `replace_regex` rules contribute too when they are simple: the pattern is a literal
+  (optionally wrapped in `\\b`) and the replacement has no group references.
+
+Forward rules are composed first (`a -> b` then `b -> c` inverts as `c -> a`). A dialect
+form that more than one standard form maps to (e.g. `ge` when both subject and
+object pronoun are `ge`) is ambiguous: it is recorded in `ReverseTable.ambiguous` and
+left untouched instead of guessed. Forms that collide with protected terms are
+skipped and recorded in `ReverseTable.skipped`.
+
+All entries are fused into one alternation, so a document is normalised with a single
+`re.sub` pass. Particles and non-literal regex rules are not reversed.
+
+Example:
+    >>> from vlaamscodex.dialects.reverse import reverse_transform
+    >>> reverse_transform("Da’s goe, ge moet effen wachten.", "vlaams/west-vlaams")
+    'Dat is goed, jij moet even wachten.'
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+from .transformer import (
+    GLOBAL_PROTECTED_TERMS,
+    DialectTransformConfig,
+    _DEFAULT_REGISTRY,
+    _LRUCache,
+    _apply_leading_case,
+    _build_config,
+    _env_int,
+    _expand_vars,
+)
+
+# A regex body that is a plain literal: no metacharacters except escaped non-word chars.
+_LITERAL_REGEX_RE = re.compile(r"(?:[^\\.^$*+?{}\[\]|()]|\\[^\w])+")
+_UNESCAPE_RE = re.compile(r"\\(.)")
+
+
+def _literal_pattern(pattern: str) -> str | None:
+    """Return the literal text a simple `replace_regex` pattern matches, else None."""
+    body = pattern
+    if body.startswith(r"\b"):
+        body = body[2:]
+    if body.endswith(r"\b") and not body.endswith(r"\\b"):
+        body = body[:-2]
+    if not _LITERAL_REGEX_RE.fullmatch(body):
+        return None
+    return _UNESCAPE_RE.sub(r"\1", body)
+
+
+@dataclass(frozen=True, slots=True)
+class ReverseTable:
+    dialect_id: str
+    # dialect form (lowercase) -> (standard form, preserve_case)
+    mapping: Mapping[str, tuple[str, bool]]
+    # dialect form (lowercase) -> every standard form that produces it
+    ambiguous: Mapping[str, tuple[str, ...]]
+    # (rule index, reason) for rules that contribute nothing
+    skipped: tuple[tuple[int, str], ...]
+    pattern: re.Pattern[str] | None
+
+    def apply(self, text: str) -> str:
+        if self.pattern is None:
+            return text
+        mapping = self.mapping
+
+        def repl(m: re.Match[str]) -> str:
+            src = m.group(0)
+            dst, preserve_case = mapping[src.lower()]
+            return _apply_leading_case(dst, src) if preserve_case else dst
+
+        return self.pattern.sub(repl, text)
+
+
+def _build_reverse_table(dialect_id: str, config: DialectTransformConfig) -> ReverseTable:
+    resolved = _DEFAULT_REGISTRY.resolve(dialect_id)
+    protected = {t.strip().lower() for t in (*GLOBAL_PROTECTED_TERMS, *resolved.protected_terms)}
+
+    forward: dict[str, tuple[str, bool]] = {}
+    rule_index: dict[str, int] = {}
+    skipped: list[tuple[int, str]] = []
+    for i, rule in enumerate(resolved.rules):
+        rtype = rule.get("type")
+        if rtype == "replace_word":
+            src = str(rule["from"])
+            preserve_case = bool(rule.get("preserve_case", True))
+        elif rtype == "replace_regex":
+            literal = _literal_pattern(str(rule["pattern"]))
+            if literal is None or "\\" in str(rule["to"]):
+                skipped.append((i, "regex is not a literal replacement"))
+                continue
+            src = literal
+            preserve_case = bool(rule.get("preserve_case", False))
+        else:
+            skipped.append((i, f"{rtype} is not reversible"))
+            continue
+        dst = _expand_vars(str(rule["to"]), config)
+        # The first rule for a source wins: it rewrites the word before later rules see it.
+        if src.lower() not in forward:
+            forward[src.lower()] = (dst.lower(), preserve_case)
+            rule_index[src.lower()] = i
+
+    def final(word: str) -> tuple[str, bool]:
+        seen = {word}
+        out, preserve_case = forward[word]
+        while out in forward and out not in seen:
+            seen.add(out)
+            out, preserve_case = forward[out]
+        return out, preserve_case
+
+    inverse: dict[str, set[tuple[str, bool]]] = {}
+    for src in forward:
+        dst, preserve_case = final(src)
+        if dst != src:
+            inverse.setdefault(dst, set()).add((src, preserve_case))
+
+    mapping: dict[str, tuple[str, bool]] = {}
+    ambiguous: dict[str, tuple[str, ...]] = {}
+    for dst, sources in inverse.items():
+        if len({s for s, _ in sources}) > 1:
+            ambiguous[dst] = tuple(sorted(s for s, _ in sources))
+        elif dst in protected or any(w in protected for w in dst.split()):
+            ((src, _),) = sources
+            skipped.append((rule_index[src], f"{dst!r} is a protected term"))
+        else:
+            (mapping[dst],) = sources
+
+    pattern = None
+    if mapping:
+        alternatives = sorted(mapping, key=lambda w: (-len(w), w))
+        pattern = re.compile(
+            r"(?<!\w)(?:" + "|".join(re.escape(w) for w in alternatives) + r")(?!\w)",
+            flags=re.IGNORECASE,
+        )
+    return ReverseTable(
+        dialect_id=dialect_id,
+        mapping=mapping,
+        ambiguous=ambiguous,
+        skipped=tuple(skipped),
+        pattern=pattern,
+    )
+
+
+_REVERSE_TABLES = _LRUCache(max_entries=_env_int("VLAAMSCODEX_DIALECT_CACHE_MAX_ENTRIES", 256))
+_DEFAULT_REGISTRY.add_derived_cache(_REVERSE_TABLES)
+
+
+def reverse_table(dialect_id: str, **config: Any) -> ReverseTable:
+    """Build (and cache) the inverse lookup table for a pack."""
+    if not isinstance(dialect_id, str) or not dialect_id:
+        raise TypeError("dialect_id must be non-empty str")
+    cfg = _build_config(**config)
+    key = (dialect_id, cfg)
+    table = _REVERSE_TABLES.get(key)
+    if table is None:
+        table = _build_reverse_table(dialect_id, cfg)
+        _REVERSE_TABLES.put(key, table)
+    return table
+
+
+def reverse_transform(text: str, dialect_id: str, **config: Any) -> str:
+    """
+    Normalise text written in `dialect_id` back towards standard Dutch.
+
+    Keyword arguments are the config overrides accepted by `transform()` (the pronoun
+    settings decide which forms are reversed).
+    """
+    if not isinstance(text, str):
+        raise TypeError("text must be str")
+    return reverse_table(dialect_id, **config).apply(text)
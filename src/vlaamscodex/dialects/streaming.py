@@ -0,0 +1,119 @@
+"""Streaming dialect transformation for chunked input.
+
+`atransform_stream` consumes an async iterable of text chunks (e.g. websocket
+frames), reassembles sentences that are split across chunks and yields each
+transformed sentence as soon as it is complete. The regex work runs in an
+executor so the event loop is never blocked.
+
+Example:
+    >>> import asyncio
+    >>> from vlaamscodex.dialects.streaming import atransform_stream
+    >>> async def chunks():
+    ...     for part in ["Dat is wa", "t jij zegt. Wat wil", " jij?"]:
+    ...         yield part
+    >>> async def main():
+    ...     return [s async for s in atransform_stream(chunks(), "vlaams/basis")]
+    >>> asyncio.run(main())
+    ['Da’s wat ge zegt. ', 'Wa wil ge?']
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, AsyncIterable, AsyncIterator
+
+from .transformer import (
+    DialectTransformConfig,
+    _CompiledPipeline,
+    _DEFAULT_REGISTRY,
+    _build_config,
+    _iter_sentence_spans,
+    _pipeline_is_sentence_local,
+    _run_pipeline,
+)
+
+
+def _split_complete(buf: str, scan: int = 0) -> tuple[list[str], str, int]:
+    """
+    Split buf into sentences whose boundaries can no longer move, and the pending tail.
+
+    A sentence ends after its punctuation and trailing whitespace; that end is only
+    certain once the next sentence's first character has arrived, so the last span is
+    always held back.
+
+    buf[:scan] must hold no sentence punctuation, so only the rest is searched. The
+    third value is that offset for the returned tail: the start of its trailing
+    punctuation run, which more punctuation may still extend.
+    """
+    spans = list(_iter_sentence_spans(buf[scan:]))
+    if len(spans) < 2:
+        return [], buf, _resume_offset(buf)
+    ends = [scan + e for _s, e, _q in spans[:-1]]
+    starts = [0, *ends[:-1]]
+    tail = buf[ends[-1] :]
+    return [buf[s:e] for s, e in zip(starts, ends)], tail, _resume_offset(tail)
+
+
+def _resume_offset(tail: str) -> int:
+    pos = len(tail.rstrip())
+    while pos and tail[pos - 1] in ".!?":
+        pos -= 1
+    return pos
+
+
+def _transform_sentences(
+    sentences: list[str],
+    pipeline: _CompiledPipeline,
+    config: DialectTransformConfig,
+    first_index: int,
+) -> list[str]:
+    return [
+        _run_pipeline(sentence, pipeline, config, sentence_offset=first_index + k)
+        for k, sentence in enumerate(sentences)
+    ]
+
+
+async def atransform_stream(
+    chunks: AsyncIterable[str],
+    dialect_id: str,
+    *,
+    executor: Executor | None = None,
+    **config: Any,
+) -> AsyncIterator[str]:
+    """
+    Transform a chunked text stream sentence by sentence.
+
+    Joining everything this yields gives exactly `transform(full_text, dialect_id)`.
+    CPU work runs via `loop.run_in_executor(executor, ...)` (the loop's default
+    executor when None). Keyword arguments are the config overrides accepted by
+    `transform()`. For packs whose rules are not sentence-local the whole stream is
+    buffered and transformed once at the end.
+    """
+    if not isinstance(dialect_id, str) or not dialect_id:
+        raise TypeError("dialect_id must be non-empty str")
+    cfg = _build_config(**config)
+    loop = asyncio.get_running_loop()
+    # Loading packs reads files; keep that off the event loop too.
+    pipeline = await loop.run_in_executor(executor, _DEFAULT_REGISTRY.pipeline, dialect_id, cfg)
+    local = _pipeline_is_sentence_local(pipeline, cfg)
+
+    buf = ""
+    scan = 0
+    index = 0
+    async for chunk in chunks:
+        if not isinstance(chunk, str):
+            raise TypeError("stream chunks must be str")
+        buf += chunk
+        if not local:
+            continue
+        done, buf, scan = _split_complete(buf, scan)
+        if done:
+            outs = await loop.run_in_executor(executor, _transform_sentences, done, pipeline, cfg, index)
+            index += len(done)
+            for out in outs:
+                yield out
+
+    if buf:
+        outs = await loop.run_in_executor(executor, _transform_sentences, [buf], pipeline, cfg, index)
+        yield outs[0]
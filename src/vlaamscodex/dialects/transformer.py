@@ -16,7 +16,11 @@ Environment Variables:
     VLAAMSCODEX_DIALECT_DETERMINISTIC: Enable deterministic mode (default: True)
     VLAAMSCODEX_DIALECT_SEED: Seed for deterministic randomness (default: 0)
     VLAAMSCODEX_DIALECT_PARTICLES: Enable particle insertion (default: False)
+    VLAAMSCODEX_DIALECT_PARTICLE_HASH: Particle sampling scheme, "fast" or "sha256" (default: fast)
     VLAAMSCODEX_PRONOUN_*: Override default pronouns (ge/u/uw)
+    VLAAMSCODEX_DIALECT_CACHE_MAX_ENTRIES: Max entries per registry cache (default: 256, 0 = unbounded)
+    VLAAMSCODEX_DIALECT_CACHE_MAX_BYTES: Approx. byte budget per registry cache (default: 0 = unbounded)
+    VLAAMSCODEX_DIALECT_METRICS: Collect run metrics from import time (default: False)
 
 Example:
     >>> from vlaamscodex.dialects.transformer import transform, available_packs
@@ -33,9 +37,16 @@ import hashlib
 import json
 import os
 import re
+import sys
+import threading
+import time
+import zlib
+from bisect import bisect_left
+from collections import OrderedDict
+from contextvars import ContextVar
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Iterable, Mapping
+from typing import Any, Callable, Hashable, Iterable, Mapping
 
 
 GLOBAL_PROTECTED_TERMS: tuple[str, ...] = (
@@ -61,6 +72,28 @@ GLOBAL_PROTECTED_TERMS: tuple[str, ...] = (
 )
 
 
+class DialectTimeoutError(TimeoutError):
+    """
+    Raised when a transform exceeds its deadline and the caller asked for an error.
+
+    Attributes:
+        dialect_id: Pack that was being applied.
+        rule_index: Index into the resolved pack's rules of the rule that was running.
+        rule: The rule definition itself (as loaded from the pack JSON).
+        partial: Best result so far (protected terms restored), usable as a fallback.
+    """
+
+    def __init__(self, dialect_id: str, rule_index: int, rule: Mapping[str, Any], partial: str) -> None:
+        self.dialect_id = dialect_id
+        self.rule_index = rule_index
+        self.rule = rule
+        self.partial = partial
+        super().__init__(
+            f"Dialect transform for {dialect_id} ran out of time in rules[{rule_index}] "
+            f"({rule.get('type')!r})"
+        )
+
+
 @dataclass(frozen=True, slots=True)
 class PackInfo:
     id: str
@@ -78,6 +111,7 @@ class DialectTransformConfig:
     pronoun_possessive: str = "uw"
     max_passes: int = 3
     strict_idempotency: bool = False
+    particle_hash: str = "fast"
 
 
 def _env_bool(name: str, default: bool) -> bool:
@@ -124,6 +158,37 @@ def _default_config() -> DialectTransformConfig:
         pronoun_possessive=_env_str("VLAAMSCODEX_PRONOUN_POSSESSIVE", "uw"),
         max_passes=_env_int("VLAAMSCODEX_DIALECT_MAX_PASSES", 3),
         strict_idempotency=_env_bool("VLAAMSCODEX_DIALECT_STRICT_IDEMPOTENCY", False),
+        particle_hash=_env_str("VLAAMSCODEX_DIALECT_PARTICLE_HASH", "fast"),
+    )
+
+
+def _build_config(
+    *,
+    deterministic: bool | None = None,
+    seed: int | None = None,
+    enable_particles: bool | None = None,
+    pronoun_subject: str | None = None,
+    pronoun_object: str | None = None,
+    pronoun_possessive: str | None = None,
+    max_passes: int | None = None,
+    strict_idempotency: bool | None = None,
+    particle_hash: str | None = None,
+) -> DialectTransformConfig:
+    """Merge explicit overrides (None = not given) onto the environment defaults."""
+    base = _default_config()
+    particle_hash = base.particle_hash if particle_hash is None else str(particle_hash)
+    if particle_hash not in PARTICLE_HASHES:
+        raise ValueError(f"particle_hash must be one of {PARTICLE_HASHES}, got {particle_hash!r}")
+    return DialectTransformConfig(
+        deterministic=base.deterministic if deterministic is None else bool(deterministic),
+        seed=base.seed if seed is None else int(seed),
+        enable_particles=base.enable_particles if enable_particles is None else bool(enable_particles),
+        pronoun_subject=base.pronoun_subject if pronoun_subject is None else str(pronoun_subject),
+        pronoun_object=base.pronoun_object if pronoun_object is None else str(pronoun_object),
+        pronoun_possessive=base.pronoun_possessive if pronoun_possessive is None else str(pronoun_possessive),
+        max_passes=base.max_passes if max_passes is None else int(max_passes),
+        strict_idempotency=base.strict_idempotency if strict_idempotency is None else bool(strict_idempotency),
+        particle_hash=particle_hash,
     )
 
 
@@ -202,12 +267,47 @@ def _iter_sentence_spans(text: str) -> Iterable[tuple[int, int, bool]]:
         yield start, len(text), False
 
 
+# Number of sentences preceding the text a rule is applied to. Sentence-indexed rules
+# (particle sampling) add it so a slice of a document behaves as in the full document.
+_SENTENCE_OFFSET: ContextVar[int] = ContextVar("_SENTENCE_OFFSET", default=0)
+
+
 def _hash_float_0_1(key: str) -> float:
     h = hashlib.sha256(key.encode("utf-8")).digest()
     x = int.from_bytes(h[:8], "big", signed=False)
     return x / 2**64
 
 
+# Particle sampling schemes: "fast" (per-rule seed + CRC32/murmur3 finalizer) and "sha256"
+# (the earlier per-sentence SHA-256 of a formatted key). Both drop the document-wide
+# placeholder numbers from the key (see `_sampling_text`), so "sha256" reproduces the
+# earlier placement only for sentences without protected terms.
+PARTICLE_HASHES: tuple[str, ...] = ("fast", "sha256")
+
+_MASK32 = 0xFFFFFFFF
+
+
+def _particle_rule_seed(config: DialectTransformConfig, dialect_id: str, rule_index: int) -> int:
+    """32-bit seed for one particle rule, computed once when the rule is compiled."""
+    key = f"{config.seed}|{dialect_id}|append_particle|{rule_index}".encode("utf-8")
+    return int.from_bytes(hashlib.sha256(key).digest()[:4], "big", signed=False)
+
+
+def _fast_particle_draw(rule_seed: int, sent_i: int, chunk: bytes | None) -> int:
+    """
+    Uniform 32-bit draw keyed on the rule seed, sentence index and (optionally) the
+    sentence's UTF-8 bytes: CRC32 seeded with the rule seed, then the murmur3 finalizer.
+    Compare against `int(probability * 2**32)`.
+    """
+    h = zlib.crc32(chunk, rule_seed) if chunk is not None else rule_seed
+    h ^= (sent_i * 0x9E3779B1) & _MASK32
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & _MASK32
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & _MASK32
+    return h ^ (h >> 16)
+
+
 def _build_protected_pattern(terms: Iterable[str]) -> re.Pattern[str] | None:
     pats: list[str] = []
     for term in terms:
@@ -228,7 +328,10 @@ def _build_protected_pattern(terms: Iterable[str]) -> re.Pattern[str] | None:
 
 
 def _mask_protected(text: str, protected_terms: Iterable[str]) -> tuple[str, dict[str, str]]:
-    pat = _build_protected_pattern(protected_terms)
+    return _mask_with_pattern(text, _build_protected_pattern(protected_terms))
+
+
+def _mask_with_pattern(text: str, pat: re.Pattern[str] | None) -> tuple[str, dict[str, str]]:
     if pat is None:
         return text, {}
 
@@ -245,6 +348,19 @@ def _mask_protected(text: str, protected_terms: Iterable[str]) -> tuple[str, dic
     return pat.sub(repl, text), mapping
 
 
+_PLACEHOLDER_NUMBER_RE = re.compile("\uE000\\d+\uE001")
+
+
+def _sampling_text(chunk: str) -> str:
+    """
+    Chunk text as seen by particle sampling: placeholders are numbered across the
+    whole document, so drop the numbers to keep the draw sentence-local.
+    """
+    if "\uE000" not in chunk:
+        return chunk
+    return _PLACEHOLDER_NUMBER_RE.sub("\uE000\uE001", chunk)
+
+
 def _unmask(text: str, mapping: Mapping[str, str]) -> str:
     if not mapping:
         return text
@@ -254,6 +370,112 @@ def _unmask(text: str, mapping: Mapping[str, str]) -> str:
     return text
 
 
+def _approx_sizeof(obj: Any) -> int:
+    """Rough recursive size estimate for pack data (strings, containers, slotted dataclasses)."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, Mapping):
+        return size + sum(_approx_sizeof(k) + _approx_sizeof(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(_approx_sizeof(x) for x in obj)
+    if isinstance(obj, re.Pattern):
+        return size + _approx_sizeof(obj.pattern)
+    slots = getattr(type(obj), "__slots__", ())
+    return size + sum(_approx_sizeof(getattr(obj, name, None)) for name in slots)
+
+
+class _LRUCache:
+    """
+    Least-recently-used cache bounded by entry count and approximate bytes.
+
+    A limit of 0 (or None) disables that bound. An entry larger than the whole byte
+    budget is not stored at all, so one huge pack cannot flush every hot dialect.
+    Safe to share between threads (e.g. a `transform_parallel` thread pool).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        sizeof: Callable[[Any], int] = _approx_sizeof,
+    ) -> None:
+        self.max_entries = max(0, max_entries or 0)
+        self.max_bytes = max(0, max_bytes or 0)
+        self._sizeof = sizeof
+        self._data: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self._sizeof(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            if self.max_bytes and size > self.max_bytes:
+                return
+            self._data[key] = (value, size)
+            self.bytes += size
+            self._evict()
+
+    def resize(self, *, max_entries: int | None = None, max_bytes: int | None = None) -> None:
+        """Change the limits that are given and evict entries over them."""
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max(0, max_entries)
+            if max_bytes is not None:
+                self.max_bytes = max(0, max_bytes)
+            self._evict()
+
+    def _evict(self) -> None:
+        # Caller holds self._lock.
+        while self._data and (
+            (self.max_entries and len(self._data) > self.max_entries)
+            or (self.max_bytes and self.bytes > self.max_bytes)
+        ):
+            _key, (_value, size) = self._data.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self.bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
 @dataclass(frozen=True, slots=True)
 class _LoadedPack:
     id: str
@@ -270,16 +492,63 @@ class _ResolvedPack:
     inherits: tuple[str, ...]
     protected_terms: tuple[str, ...]
     rules: tuple[dict[str, Any], ...]
+    # Pack id each rule came from (parallel to `rules`).
+    rule_sources: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class _CompiledPipeline:
+    dialect_id: str
+    protected_pattern: re.Pattern[str] | None
+    # Rules that survived pruning, their compiled callables and their index in the resolved pack.
+    rules: tuple[dict[str, Any], ...]
+    compiled_rules: tuple[Callable[[str], str], ...]
+    rule_indices: tuple[int, ...] = ()
+    # (resolved rule index, reason) for every rule pruned as unable to affect output.
+    removed: tuple[tuple[int, str], ...] = ()
 
 
 class _DialectRegistry:
-    def __init__(self, dialects_dir: Path | None = None) -> None:
+    def __init__(
+        self,
+        dialects_dir: Path | None = None,
+        *,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
         self.dialects_dir = dialects_dir or _find_dialects_dir()
         self.index_path = self.dialects_dir / "index.json"
         self.packs_dir = self.dialects_dir / "packs"
         self._index: dict[str, dict[str, Any]] | None = None
-        self._loaded: dict[str, _LoadedPack] = {}
-        self._resolved: dict[str, _ResolvedPack] = {}
+        if max_entries is None:
+            max_entries = _env_int("VLAAMSCODEX_DIALECT_CACHE_MAX_ENTRIES", 256)
+        if max_bytes is None:
+            max_bytes = _env_int("VLAAMSCODEX_DIALECT_CACHE_MAX_BYTES", 0)
+        self._loaded = _LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+        self._resolved = _LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+        self._pipelines = _LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+        # Caches of values built from this registry's packs (bytes pipelines, reverse tables).
+        self._derived: list[_LRUCache] = []
+
+    def configure_cache(self, *, max_entries: int | None = None, max_bytes: int | None = None) -> None:
+        """Change cache limits; entries over the new limits are evicted immediately."""
+        for cache in (self._loaded, self._resolved, self._pipelines):
+            cache.resize(max_entries=max_entries, max_bytes=max_bytes)
+
+    def add_derived_cache(self, cache: _LRUCache) -> None:
+        """Register a cache of values built from this registry's packs; clear_cache() clears it too."""
+        self._derived.append(cache)
+
+    def clear_cache(self) -> None:
+        for cache in (self._loaded, self._resolved, self._pipelines, *self._derived):
+            cache.clear()
+
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        return {
+            "loaded": self._loaded.stats(),
+            "resolved": self._resolved.stats(),
+            "pipelines": self._pipelines.stats(),
+        }
 
     def _load_index(self) -> dict[str, dict[str, Any]]:
         if self._index is not None:
@@ -324,8 +593,9 @@ class _DialectRegistry:
         return self.packs_dir / _pack_filename(dialect_id)
 
     def load(self, dialect_id: str) -> _LoadedPack:
-        if dialect_id in self._loaded:
-            return self._loaded[dialect_id]
+        cached = self._loaded.get(dialect_id)
+        if cached is not None:
+            return cached
 
         path = self._pack_path(dialect_id)
         data = json.loads(path.read_text(encoding="utf-8"))
@@ -361,12 +631,13 @@ class _DialectRegistry:
             protected_terms=tuple(protected_terms),
             rules=tuple(rules),
         )
-        self._loaded[dialect_id] = pack
+        self._loaded.put(dialect_id, pack)
         return pack
 
     def resolve(self, dialect_id: str) -> _ResolvedPack:
-        if dialect_id in self._resolved:
-            return self._resolved[dialect_id]
+        cached = self._resolved.get(dialect_id)
+        if cached is not None:
+            return cached
 
         idx = self._load_index()
         if dialect_id not in idx:
@@ -394,15 +665,18 @@ class _DialectRegistry:
 
         dfs(dialect_id)
 
-        label = self.load(dialect_id).label
-        inherits = self.load(dialect_id).inherits
+        own = self.load(dialect_id)
+        label = own.label
+        inherits = own.inherits
 
         protected: list[str] = []
         rules: list[dict[str, Any]] = []
+        sources: list[str] = []
         for pid in order:
             p = self.load(pid)
             protected.extend(p.protected_terms)
             rules.extend(p.rules)
+            sources.extend([pid] * len(p.rules))
 
         resolved = _ResolvedPack(
             id=dialect_id,
@@ -410,10 +684,49 @@ class _DialectRegistry:
             inherits=inherits,
             protected_terms=tuple(dict.fromkeys(protected)),  # stable unique
             rules=tuple(rules),
+            rule_sources=tuple(sources),
         )
-        self._resolved[dialect_id] = resolved
+        self._resolved.put(dialect_id, resolved)
         return resolved
 
+    def pipeline(
+        self, dialect_id: str, config: DialectTransformConfig, *, optimize: bool = True
+    ) -> _CompiledPipeline:
+        """
+        Return the compiled rule pipeline for (dialect, config), compiling on first use.
+
+        With optimize=True, rules that provably cannot change the output under this config
+        are dropped (see `_prune_rules`). Rules keep their original index, so deterministic
+        particle sampling is unaffected.
+        """
+        key = (dialect_id, config, optimize)
+        cached = self._pipelines.get(key)
+        if cached is not None:
+            return cached
+
+        resolved = self.resolve(dialect_id)
+        # Compile everything first so malformed rules fail loudly even if they would be pruned.
+        all_compiled = [
+            _compile_rule(r, config=config, dialect_id=dialect_id, rule_index=i)
+            for i, r in enumerate(resolved.rules)
+        ]
+        if optimize:
+            kept, removed = _prune_rules(resolved.rules, config)
+        else:
+            kept, removed = tuple(range(len(resolved.rules))), ()
+        compiled = _CompiledPipeline(
+            dialect_id=dialect_id,
+            protected_pattern=_build_protected_pattern(
+                (*GLOBAL_PROTECTED_TERMS, *resolved.protected_terms)
+            ),
+            rules=tuple(resolved.rules[i] for i in kept),
+            compiled_rules=tuple(all_compiled[i] for i in kept),
+            rule_indices=kept,
+            removed=removed,
+        )
+        self._pipelines.put(key, compiled)
+        return compiled
+
 
 _DEFAULT_REGISTRY = _DialectRegistry()
 
@@ -422,13 +735,142 @@ def available_packs() -> list[PackInfo]:
     return _DEFAULT_REGISTRY.available()
 
 
+def configure_cache(*, max_entries: int | None = None, max_bytes: int | None = None) -> None:
+    """
+    Set LRU limits for the default registry's pack, resolution and pipeline caches.
+
+    Each cache is bounded independently; 0 means unbounded.
+    """
+    _DEFAULT_REGISTRY.configure_cache(max_entries=max_entries, max_bytes=max_bytes)
+
+
+def pruned_rules(dialect_id: str, **config: Any) -> list[tuple[int, str]]:
+    """
+    List rules of a resolved pack that transform() skips because they cannot affect output.
+
+    Keyword arguments are the same config overrides transform() accepts (e.g.
+    enable_particles=True). Returns (index into the resolved rules, reason) pairs.
+    """
+    return list(_DEFAULT_REGISTRY.pipeline(dialect_id, _build_config(**config)).removed)
+
+
+def cache_stats() -> dict[str, dict[str, int]]:
+    """Return entry/byte usage and hit/miss/eviction counters per registry cache."""
+    return _DEFAULT_REGISTRY.cache_stats()
+
+
+_SINGLE_WORD_RE = re.compile(r"\w+")
+_SENTENCE_PUNCT_CHARS_RE = re.compile(r"[.!?]")
+
+
+def _can_create_word(text: str, probe: re.Pattern[str]) -> bool:
+    # Upper-casing (preserve_case) can change letters, e.g. "ß" -> "SS".
+    return bool(probe.search(text) or probe.search(text.upper()))
+
+
+def _shadowing_reason(
+    rules: tuple[dict[str, Any], ...],
+    kept: list[int],
+    j: int,
+    config: DialectTransformConfig,
+) -> str | None:
+    """
+    Explain why replace_word rule j can never match, or return None if that is not provable.
+
+    Rule j is dead when an earlier kept replace_word rule i matches a superset of j's
+    matches (same word, at least as broad in case and sentence scope), and neither rule
+    i's replacement nor any kept rule between i and j can produce j's word again. Since
+    j's word is a single run of word characters matched with \b on both sides, a new
+    match would have to lie entirely inside some replacement text (the text around a
+    word-delimited replacement is non-word), so checking replacement strings suffices.
+    Regex rules in between cannot be reasoned about and block the proof.
+    """
+    rule = rules[j]
+    if rule.get("type") != "replace_word":
+        return None
+    src_j = rule["from"]
+    if not _SINGLE_WORD_RE.fullmatch(src_j):
+        return None
+    only_q_j = bool(rule.get("only_in_questions", False))
+    case_j = bool(rule.get("case_sensitive", False))
+    probe = re.compile(rf"\b{re.escape(src_j)}\b", flags=re.IGNORECASE)
+
+    for i in reversed(kept):
+        prev = rules[i]
+        ptype = prev.get("type")
+        if ptype == "append_particle":
+            particle = str(prev["particle"]).strip()
+            if _can_create_word(particle, probe):
+                return None
+            if only_q_j and _SENTENCE_PUNCT_CHARS_RE.search(particle):
+                return None
+            continue
+        if ptype != "replace_word":
+            return None
+
+        src_i = prev["from"]
+        dst_i = _expand_vars(prev["to"], config)
+        if _can_create_word(dst_i, probe):
+            return None
+        if only_q_j and _SENTENCE_PUNCT_CHARS_RE.search(dst_i):
+            # Could move sentence boundaries and turn a statement into a question.
+            return None
+
+        case_i = bool(prev.get("case_sensitive", False))
+        only_q_i = bool(prev.get("only_in_questions", False))
+        pat_i = re.compile(rf"\b{re.escape(src_i)}\b", flags=0 if case_i else re.IGNORECASE)
+        covers = (not only_q_i or only_q_j) and (case_j or not case_i) and pat_i.fullmatch(src_j)
+        if covers:
+            if prev == rule:
+                return f"duplicate of rules[{i}]"
+            return f"shadowed by rules[{i}] ({src_i!r} already rewritten)"
+
+        # Intermediate rule: its match must be word-delimited so it cannot merge with neighbours.
+        if not (_SINGLE_WORD_RE.match(src_i[0]) and _SINGLE_WORD_RE.match(src_i[-1])):
+            return None
+        if only_q_j and _SENTENCE_PUNCT_CHARS_RE.search(src_i):
+            # Rewriting away punctuation can also move sentence boundaries.
+            return None
+    return None
+
+
+def _prune_rules(
+    rules: tuple[dict[str, Any], ...],
+    config: DialectTransformConfig,
+) -> tuple[tuple[int, ...], tuple[tuple[int, str], ...]]:
+    """
+    Drop rules that cannot affect transform() output under this config.
+
+    Removed: particle rules while particles are disabled (or with probability <= 0),
+    exact duplicates and shadowed replace_word rules (see `_shadowing_reason`). Each
+    removed rule is the identity on every text it can receive in the original
+    pipeline, so the pruned pipeline produces identical output in every pass.
+    """
+    kept: list[int] = []
+    removed: list[tuple[int, str]] = []
+    for j, rule in enumerate(rules):
+        reason: str | None = None
+        if rule.get("type") == "append_particle":
+            if not config.enable_particles:
+                reason = "particles disabled"
+            elif float(rule["probability"]) <= 0:
+                reason = "probability is 0"
+        else:
+            reason = _shadowing_reason(rules, kept, j, config)
+        if reason is None:
+            kept.append(j)
+        else:
+            removed.append((j, reason))
+    return tuple(kept), tuple(removed)
+
+
 def _compile_rule(
     rule: Mapping[str, Any],
     *,
     config: DialectTransformConfig,
     dialect_id: str,
     rule_index: int,
-) -> callable[[str], str]:
+) -> Callable[[str], str]:
     rtype = rule.get("type")
     if rtype == "replace_word":
         src = rule.get("from")
@@ -516,28 +958,39 @@ def _compile_rule(
             raise ValueError("append_particle currently supports only positions=['end_of_sentence']")
 
         already_pat = re.compile(
-            rf"(?:,\\s*)?{re.escape(particle)}\\s*[.!?]+\\s*$", flags=re.IGNORECASE
+            rf"(?:,\s*)?{re.escape(particle)}\s*[.!?]+\s*$", flags=re.IGNORECASE
         )
-        punct_pat = re.compile(r"([.!?]+)(\\s*)$")
+        punct_pat = re.compile(r"([.!?]+)(\s*)$")
+        sample_fast = prob < 1 and config.particle_hash == "fast"
+        rule_seed = _particle_rule_seed(config, dialect_id, rule_index)
+        threshold = int(prob * 2**32)
 
         def apply(text: str) -> str:
             if not config.enable_particles:
                 return text
 
             out_parts: list[str] = []
-            sent_i = 0
+            sent_i = _SENTENCE_OFFSET.get()
             for s, e, _is_q in _iter_sentence_spans(text):
                 chunk = text[s:e]
                 sent_i += 1
 
+                if sample_fast:
+                    # Draw first: most sentences are rejected here and skip both regex searches.
+                    chunk_key = _sampling_text(chunk).encode("utf-8") if config.deterministic else None
+                    if _fast_particle_draw(rule_seed, sent_i, chunk_key) >= threshold:
+                        out_parts.append(chunk)
+                        continue
+
                 # Only operate on real sentences with ending punctuation.
                 if not punct_pat.search(chunk) or already_pat.search(chunk):
                     out_parts.append(chunk)
                     continue
 
-                if prob < 1:
+                if prob < 1 and not sample_fast:
                     if config.deterministic:
-                        key = f"{config.seed}|{dialect_id}|append_particle|{rule_index}|{sent_i}|{chunk}"
+                        sample = _sampling_text(chunk)
+                        key = f"{config.seed}|{dialect_id}|append_particle|{rule_index}|{sent_i}|{sample}"
                         if _hash_float_0_1(key) >= prob:
                             out_parts.append(chunk)
                             continue
@@ -564,6 +1017,288 @@ def _compile_rule(
     raise ValueError(f"Unknown rule type: {rtype!r}")
 
 
+_SENTENCE_PUNCT_IN_REGEX_RE = re.compile(
+    r"\\[.!?AZWSD]"  # escaped punctuation, \A/\Z anchors, negated classes
+    r"|\[\^"  # negated character set
+    r"|\[[^\]]*[.!?][^\]]*\]"  # punctuation inside a set
+    r"|(?<!\\)[.^$]"  # any-char, ^ and $ anchors
+    r"|(?<!\(\?)(?<!\(\?<)!"  # literal '!' (not a lookaround)
+)
+
+
+def _pipeline_is_sentence_local(pipeline: _CompiledPipeline, config: DialectTransformConfig) -> bool:
+    """
+    True if transforming each sentence on its own gives the same result as the whole text.
+
+    That holds when no rule or protected term can match across a sentence boundary and no
+    replacement introduces sentence punctuation (which would move boundaries). Regex
+    rules are checked conservatively: anything that could match punctuation or anchor on
+    the start/end of the text makes the pipeline non-local.
+    """
+    if pipeline.protected_pattern is not None and _SENTENCE_PUNCT_IN_REGEX_RE.search(
+        pipeline.protected_pattern.pattern.replace("\\b", "").replace("\\s+", " ")
+    ):
+        return False
+    for rule in pipeline.rules:
+        rtype = rule.get("type")
+        if rtype == "append_particle":
+            if _SENTENCE_PUNCT_CHARS_RE.search(str(rule["particle"])):
+                return False
+            continue
+        if _SENTENCE_PUNCT_CHARS_RE.search(_expand_vars(str(rule.get("to", "")), config)):
+            return False
+        if rtype == "replace_word":
+            if _SENTENCE_PUNCT_CHARS_RE.search(str(rule["from"])):
+                return False
+        elif rtype == "replace_regex":
+            if _SENTENCE_PUNCT_IN_REGEX_RE.search(str(rule["pattern"])):
+                return False
+        else:
+            return False
+    return True
+
+
+def _pipeline_uses_sentence_index(pipeline: _CompiledPipeline, config: DialectTransformConfig) -> bool:
+    """True if some rule's output depends on a sentence's position in the text."""
+    if not config.enable_particles:
+        return False
+    return any(
+        r.get("type") == "append_particle" and 0 < float(r["probability"]) < 1 for r in pipeline.rules
+    )
+
+
+MetricsCallback = Callable[[str, float, int, int], None]
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit.
+METRICS_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+
+
+class _TransformMetrics:
+    """Counters and latency histograms for pipeline runs, keyed by dialect id."""
+
+    def __init__(self, callback: MetricsCallback | None = None) -> None:
+        self.callback = callback
+        self._lock = threading.Lock()
+        self.runs: dict[str, int] = {}
+        self.passes: dict[str, int] = {}
+        self.protected_matches: dict[str, int] = {}
+        self.latency_buckets: dict[str, list[int]] = {}
+        self.latency_sum: dict[str, float] = {}
+
+    def observe(self, dialect_id: str, seconds: float, passes: int, protected_matches: int) -> None:
+        bucket = bisect_left(METRICS_LATENCY_BUCKETS, seconds)
+        with self._lock:
+            self.runs[dialect_id] = self.runs.get(dialect_id, 0) + 1
+            self.passes[dialect_id] = self.passes.get(dialect_id, 0) + passes
+            self.protected_matches[dialect_id] = self.protected_matches.get(dialect_id, 0) + protected_matches
+            counts = self.latency_buckets.get(dialect_id)
+            if counts is None:
+                counts = self.latency_buckets[dialect_id] = [0] * (len(METRICS_LATENCY_BUCKETS) + 1)
+            counts[bucket] += 1
+            self.latency_sum[dialect_id] = self.latency_sum.get(dialect_id, 0.0) + seconds
+        if self.callback is not None:
+            self.callback(dialect_id, seconds, passes, protected_matches)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            dialects = {
+                dialect_id: {
+                    "runs": runs,
+                    "passes": self.passes[dialect_id],
+                    "protected_matches": self.protected_matches[dialect_id],
+                    "latency_seconds": {
+                        "buckets": dict(zip((*METRICS_LATENCY_BUCKETS, float("inf")), self.latency_buckets[dialect_id])),
+                        "sum": self.latency_sum[dialect_id],
+                        "count": runs,
+                    },
+                }
+                for dialect_id, runs in self.runs.items()
+            }
+        return {"dialects": dialects, "cache": _DEFAULT_REGISTRY.cache_stats()}
+
+
+_METRICS: _TransformMetrics | None = (
+    _TransformMetrics() if _env_bool("VLAAMSCODEX_DIALECT_METRICS", False) else None
+)
+
+
+def enable_metrics(callback: MetricsCallback | None = None) -> None:
+    """
+    Start collecting transform metrics (resets any previous counts).
+
+    `callback`, if given, is called after every pipeline run as
+    `callback(dialect_id, seconds, passes, protected_matches)`; use it to forward
+    observations to another metrics system. It runs on the transforming thread, so keep
+    it cheap.
+    """
+    global _METRICS
+    _METRICS = _TransformMetrics(callback)
+
+
+def disable_metrics() -> None:
+    """Stop collecting metrics; transform() then skips all bookkeeping."""
+    global _METRICS
+    _METRICS = None
+
+
+def metrics_snapshot() -> dict[str, Any]:
+    """
+    Return collected metrics as a plain dict.
+
+    `dialects` maps each dialect id to its run count, total passes, total protected-term
+    matches and a latency histogram (non-cumulative bucket counts keyed by upper bound).
+    `cache` is `cache_stats()`. Returns `{}` when metrics are disabled.
+
+    A run is one pass loop over a text: one per `transform()` or `transform_bytes()`
+    call, and one per sentence or chunk for the incremental, streaming, parallel and
+    file helpers.
+    """
+    metrics = _METRICS
+    return {} if metrics is None else metrics.snapshot()
+
+
+def _prom_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def metrics_prometheus() -> str:
+    """Render `metrics_snapshot()` in the Prometheus text exposition format."""
+    snap = metrics_snapshot()
+    if not snap:
+        return ""
+    dialects = snap["dialects"]
+    lines: list[str] = []
+
+    def counter(name: str, help_text: str, key: str) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for dialect_id, d in sorted(dialects.items()):
+            lines.append(f'{name}{{dialect="{_prom_label(dialect_id)}"}} {d[key]}')
+
+    counter("vlaamscodex_dialect_runs_total", "Dialect pipeline runs.", "runs")
+    counter("vlaamscodex_dialect_passes_total", "Rule passes over the text.", "passes")
+    counter("vlaamscodex_dialect_protected_matches_total", "Protected-term matches masked.", "protected_matches")
+
+    name = "vlaamscodex_dialect_run_seconds"
+    lines.append(f"# HELP {name} Dialect pipeline run latency.")
+    lines.append(f"# TYPE {name} histogram")
+    for dialect_id, d in sorted(dialects.items()):
+        label = _prom_label(dialect_id)
+        hist = d["latency_seconds"]
+        cumulative = 0
+        for upper, count in hist["buckets"].items():
+            cumulative += count
+            le = "+Inf" if upper == float("inf") else repr(upper)
+            lines.append(f'{name}_bucket{{dialect="{label}",le="{le}"}} {cumulative}')
+        lines.append(f'{name}_sum{{dialect="{label}"}} {hist["sum"]!r}')
+        lines.append(f'{name}_count{{dialect="{label}"}} {hist["count"]}')
+
+    for key, kind in (("hits", "counter"), ("misses", "counter"), ("evictions", "counter"), ("entries", "gauge")):
+        name = f"vlaamscodex_dialect_cache_{key}" + ("_total" if kind == "counter" else "")
+        lines.append(f"# HELP {name} Dialect registry cache {key}.")
+        lines.append(f"# TYPE {name} {kind}")
+        for cache_name, stats in sorted(snap["cache"].items()):
+            lines.append(f'{name}{{cache="{cache_name}"}} {stats[key]}')
+    return "\n".join(lines) + "\n"
+
+
+def _run_pipeline(
+    text: str,
+    pipeline: _CompiledPipeline,
+    config: DialectTransformConfig,
+    *,
+    deadline_at: float | None = None,
+    on_timeout: str = "partial",
+    sentence_offset: int = 0,
+) -> str:
+    """Apply a compiled pipeline until the text converges (the core of `transform`)."""
+    metrics = _METRICS
+    if metrics is None:
+        return _run_passes(text, pipeline, config, deadline_at, on_timeout, sentence_offset, None)
+    started = time.perf_counter()
+    counts = [0, 0]  # passes, protected-term matches in the input
+    try:
+        return _run_passes(text, pipeline, config, deadline_at, on_timeout, sentence_offset, counts)
+    finally:
+        metrics.observe(pipeline.dialect_id, time.perf_counter() - started, counts[0], counts[1])
+
+
+# Runs rule number i of a pipeline: rule_hook(i, rule, text) returns the new text.
+# Tools use it to time, count or skip single rules inside the real pass loop.
+_RuleHook = Callable[[int, Callable[[str], str], str], str]
+
+
+def _run_passes(
+    text: str,
+    pipeline: _CompiledPipeline,
+    config: DialectTransformConfig,
+    deadline_at: float | None,
+    on_timeout: str,
+    sentence_offset: int,
+    counts: list[int] | None,
+    rule_hook: _RuleHook | None = None,
+) -> str:
+    dialect_id = pipeline.dialect_id
+    protected_pattern = pipeline.protected_pattern
+    compiled_rules = pipeline.compiled_rules
+
+    def apply_once(src_text: str) -> str:
+        masked, mapping = _mask_with_pattern(src_text, protected_pattern)
+        if counts is not None:
+            if counts[0] == 0:
+                counts[1] = len(mapping)
+            counts[0] += 1
+        out = masked
+        if deadline_at is None and rule_hook is None:
+            for fn in compiled_rules:
+                out = fn(out)
+        else:
+            for i, fn in enumerate(compiled_rules):
+                out = fn(out) if rule_hook is None else rule_hook(i, fn, out)
+                if deadline_at is not None and time.monotonic() >= deadline_at:
+                    raise DialectTimeoutError(
+                        dialect_id, pipeline.rule_indices[i], pipeline.rules[i], _unmask(out, mapping)
+                    )
+        out = _unmask(out, mapping)
+        return out
+
+    token = _SENTENCE_OFFSET.set(sentence_offset) if sentence_offset else None
+    try:
+        out = text
+        seen: set[str] = {out}
+        max_iters = max(1, config.max_passes)
+        for _ in range(max_iters):
+            try:
+                new = apply_once(out)
+            except DialectTimeoutError as exc:
+                if on_timeout == "raise":
+                    raise
+                return exc.partial
+            if new == out:
+                return out
+            if new in seen:
+                # Cycle detected; return the last stable-ish output.
+                break
+            seen.add(new)
+            out = new
+
+        if config.strict_idempotency:
+            try:
+                converged = apply_once(out) == out
+            except DialectTimeoutError:
+                if on_timeout == "raise":
+                    raise
+                return out
+            if not converged:
+                raise RuntimeError(f"Dialect transform did not converge for {dialect_id}")
+        return out
+    finally:
+        if token is not None:
+            _SENTENCE_OFFSET.reset(token)
+
+
 def transform(
     text: str,
     dialect_id: str,
@@ -576,6 +1311,10 @@ def transform(
     pronoun_possessive: str | None = None,
     max_passes: int | None = None,
     strict_idempotency: bool | None = None,
+    particle_hash: str | None = None,
+    timeout: float | None = None,
+    deadline: float | None = None,
+    on_timeout: str = "partial",
 ) -> str:
     """
     Transform text using a dialect pack.
@@ -583,52 +1322,41 @@ def transform(
     Notes:
     - Default config is deterministic and does not add particles.
     - Protected terms are masked and restored verbatim.
+    - `particle_hash` picks how particle rules sample sentences: "fast" (default) or
+      "sha256", the earlier per-sentence SHA-256 scheme. Both key the draw on the
+      sentence index and the sentence text with protected terms masked (placeholder
+      numbers dropped), so a sentence samples the same wherever the document is split.
+      "sha256" therefore matches the earlier placement only in sentences without
+      protected terms.
+    - `timeout` (seconds from now) and/or `deadline` (absolute `time.monotonic()` value)
+      bound the run. The clock is checked after every rule; once it has expired no
+      further rules or passes are applied. With on_timeout="partial" the best result so
+      far is returned, with on_timeout="raise" a DialectTimeoutError is raised that names
+      the rule that was running and carries the partial result.
     """
     if not isinstance(text, str):
         raise TypeError("text must be str")
     if not isinstance(dialect_id, str) or not dialect_id:
         raise TypeError("dialect_id must be non-empty str")
-
-    base = _default_config()
-    config = DialectTransformConfig(
-        deterministic=base.deterministic if deterministic is None else bool(deterministic),
-        seed=base.seed if seed is None else int(seed),
-        enable_particles=base.enable_particles if enable_particles is None else bool(enable_particles),
-        pronoun_subject=base.pronoun_subject if pronoun_subject is None else str(pronoun_subject),
-        pronoun_object=base.pronoun_object if pronoun_object is None else str(pronoun_object),
-        pronoun_possessive=base.pronoun_possessive if pronoun_possessive is None else str(pronoun_possessive),
-        max_passes=base.max_passes if max_passes is None else int(max_passes),
-        strict_idempotency=base.strict_idempotency if strict_idempotency is None else bool(strict_idempotency),
+    if on_timeout not in ("partial", "raise"):
+        raise ValueError("on_timeout must be 'partial' or 'raise'")
+
+    deadline_at = deadline
+    if timeout is not None:
+        timeout_at = time.monotonic() + float(timeout)
+        deadline_at = timeout_at if deadline_at is None else min(deadline_at, timeout_at)
+
+    config = _build_config(
+        deterministic=deterministic,
+        seed=seed,
+        enable_particles=enable_particles,
+        pronoun_subject=pronoun_subject,
+        pronoun_object=pronoun_object,
+        pronoun_possessive=pronoun_possessive,
+        max_passes=max_passes,
+        strict_idempotency=strict_idempotency,
+        particle_hash=particle_hash,
     )
 
-    resolved = _DEFAULT_REGISTRY.resolve(dialect_id)
-    protected_terms = (*GLOBAL_PROTECTED_TERMS, *resolved.protected_terms)
-    compiled_rules = [
-        _compile_rule(r, config=config, dialect_id=dialect_id, rule_index=i)
-        for i, r in enumerate(resolved.rules)
-    ]
-
-    def apply_once(src_text: str) -> str:
-        masked, mapping = _mask_protected(src_text, protected_terms)
-        out = masked
-        for fn in compiled_rules:
-            out = fn(out)
-        out = _unmask(out, mapping)
-        return out
-
-    out = text
-    seen: set[str] = {out}
-    max_iters = max(1, config.max_passes)
-    for _ in range(max_iters):
-        new = apply_once(out)
-        if new == out:
-            return out
-        if new in seen:
-            # Cycle detected; return the last stable-ish output.
-            break
-        seen.add(new)
-        out = new
-
-    if config.strict_idempotency and apply_once(out) != out:
-        raise RuntimeError(f"Dialect transform did not converge for {dialect_id}")
-    return out
+    pipeline = _DEFAULT_REGISTRY.pipeline(dialect_id, config)
+    return _run_pipeline(text, pipeline, config, deadline_at=deadline_at, on_timeout=on_timeout)
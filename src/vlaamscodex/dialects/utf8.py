@@ -0,0 +1,369 @@
+"""Bytes-in/bytes-out dialect transformation for UTF-8 bulk pipelines.
+
+`transform_bytes` runs the pack rules as `bytes` regexes directly on UTF-8 input
+(`bytes`, `bytearray` or `memoryview`) and writes the result into an optional,
+reusable `bytearray`, avoiding the decode/encode round trip of `transform()`.
+
+Byte-level matching is only equivalent to `transform()` when every non-ASCII
+character involved is neither a word character nor whitespace (e.g. `’`, `€`, `–`):
+bytes regexes treat all non-ASCII bytes as non-word, non-space, caseless. So:
+- a pack whose rules or replacements need Unicode semantics (non-ASCII letters,
+  `.`/negated classes that count characters, a non-ASCII character inside `[...]`
+  or before a quantifier, ...) always takes the decode path;
+- per call, the non-ASCII runs of the input are decoded and checked, and if any of
+  them holds a Unicode letter, digit or space, that call takes the decode path.
+Plain ASCII input is detected with a single byte scan and never decoded.
+
+Example:
+    >>> from vlaamscodex.dialects.utf8 import transform_bytes
+    >>> transform_bytes(b"Dat is wat jij zegt.", "vlaams/basis").decode("utf-8")
+    'Da’s wat ge zegt.'
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Union
+
+from . import transformer as _transformer
+from .transformer import (
+    GLOBAL_PROTECTED_TERMS,
+    DialectTransformConfig,
+    _CompiledPipeline,
+    _DEFAULT_REGISTRY,
+    _LRUCache,
+    _SENTENCE_OFFSET,
+    _build_config,
+    _build_protected_pattern,
+    _env_int,
+    _expand_vars,
+    _fast_particle_draw,
+    _particle_rule_seed,
+    _run_pipeline,
+)
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+# Non-ASCII runs, plus the ASCII separators that str (but not bytes) regexes treat as \s.
+_NON_ASCII_RUN_RE = re.compile(rb"[\x80-\xff]+|[\x1c-\x1f]")
+_WORD_CHAR_RE = re.compile(r"\w")
+_SENTENCE_PUNCT_BYTES_RE = re.compile(rb"[.!?]+")
+# Regex syntax whose meaning depends on counting characters rather than bytes, and
+# non-ASCII characters that a bytes regex would split into separate bytes: inside a
+# character class, or followed by a quantifier.
+_CHAR_COUNTING_REGEX_RE = re.compile(
+    r"\\[WSDuUNx]|\[\^|(?<!\\)\."
+    r"|\[\]?(?:\\.|[^\]\\])*?[^\x00-\x7f]"
+    r"|[^\x00-\x7f][*+?{]"
+)
+
+_WHITESPACE_BYTES = frozenset(b" \t\n\r\x0b\x0c")
+
+_PLACEHOLDER_OPEN_BYTES = "\uE000".encode("utf-8")
+_PLACEHOLDER_NUMBER_BYTES_RE = re.compile("\uE000".encode("utf-8") + rb"\d+" + "\uE001".encode("utf-8"))
+_PLACEHOLDER_BYTES = "\uE000\uE001".encode("utf-8")
+
+
+def _sampling_bytes(chunk: bytes) -> bytes:
+    """Bytes twin of `_sampling_text`: the chunk with placeholder numbers dropped."""
+    if _PLACEHOLDER_OPEN_BYTES not in chunk:
+        return chunk
+    return _PLACEHOLDER_NUMBER_BYTES_RE.sub(_PLACEHOLDER_BYTES, chunk)
+
+
+def _byte_safe(text: str) -> bool:
+    """True if every non-ASCII char in text behaves the same in bytes and str regexes."""
+    if text.isascii():
+        return True
+    return all(
+        ch.isascii() or not (_WORD_CHAR_RE.match(ch) or ch.isspace() or ch.lower() != ch.upper())
+        for ch in text
+    )
+
+
+def _input_byte_safe(data: BytesLike) -> bool:
+    for m in _NON_ASCII_RUN_RE.finditer(data):
+        if len(m.group(0)) == 1 and m.group(0) < b"\x80":
+            return False
+        try:
+            run = m.group(0).decode("utf-8")
+        except UnicodeDecodeError:
+            return False
+        if not _byte_safe(run):
+            return False
+    return True
+
+
+def _iter_sentence_spans_bytes(text: bytes) -> Any:
+    """Bytes twin of `_iter_sentence_spans` (whitespace is ASCII whitespace)."""
+    start = 0
+    found = False
+    n = len(text)
+    for m in _SENTENCE_PUNCT_BYTES_RE.finditer(text):
+        found = True
+        is_question = b"?" in m.group(0)
+        end = m.end()
+        while end < n and text[end] in _WHITESPACE_BYTES:
+            end += 1
+        yield start, end, is_question
+        start = end
+    if not found and text:
+        yield 0, n, False
+    elif start < n:
+        yield start, n, False
+
+
+def _apply_leading_case_bytes(dst: bytes, src: bytes) -> bytes:
+    if not src:
+        return dst
+    if src.isupper():
+        return dst.upper()
+    if src[:1].isupper() and dst:
+        return dst[:1].upper() + dst[1:]
+    return dst
+
+
+def _bytes_flags(flags_list: list[str] | None) -> int:
+    flags = 0
+    for f in flags_list or []:
+        flags |= re.IGNORECASE if f == "IGNORECASE" else re.MULTILINE
+    return flags
+
+
+def _compile_rule_bytes(
+    rule: dict[str, Any],
+    *,
+    config: DialectTransformConfig,
+    dialect_id: str,
+    rule_index: int,
+) -> Callable[[bytes], bytes] | None:
+    """Bytes twin of `_compile_rule` for an already validated rule; None if not byte-safe."""
+    rtype = rule.get("type")
+    if rtype in ("replace_word", "replace_regex"):
+        dst_text = _expand_vars(rule["to"], config)
+        if not _byte_safe(dst_text):
+            return None
+        dst = dst_text.encode("utf-8")
+
+    if rtype == "replace_word":
+        src_text = rule["from"]
+        if not _byte_safe(src_text):
+            return None
+        flags = 0 if rule.get("case_sensitive", False) else re.IGNORECASE
+        pat = re.compile(rb"\b" + re.escape(src_text.encode("utf-8")) + rb"\b", flags=flags)
+        preserve_case = bool(rule.get("preserve_case", True))
+
+        def replace_in_segment(seg: bytes) -> bytes:
+            if preserve_case:
+                return pat.sub(lambda m: _apply_leading_case_bytes(dst, m.group(0)), seg)
+            return pat.sub(lambda m: dst, seg)
+
+        if not rule.get("only_in_questions", False):
+            return replace_in_segment
+
+        def replace_questions(text: bytes) -> bytes:
+            return b"".join(
+                replace_in_segment(text[s:e]) if is_q else text[s:e]
+                for s, e, is_q in _iter_sentence_spans_bytes(text)
+            )
+
+        return replace_questions
+
+    if rtype == "replace_regex":
+        pattern = rule["pattern"]
+        if not _byte_safe(pattern) or _CHAR_COUNTING_REGEX_RE.search(pattern):
+            return None
+        try:
+            pat = re.compile(pattern.encode("utf-8"), flags=_bytes_flags(rule.get("flags")))
+        except re.error:
+            return None
+        if bool(rule.get("preserve_case", False)) and "\\" not in dst_text and "$" not in dst_text:
+            return lambda text: pat.sub(lambda m: _apply_leading_case_bytes(dst, m.group(0)), text)
+        return lambda text: pat.sub(dst, text)
+
+    if rtype == "append_particle":
+        particle_text = str(rule["particle"]).strip()
+        if not _byte_safe(particle_text):
+            return None
+        particle = particle_text.encode("utf-8")
+        prob = float(rule["probability"])
+        if prob <= 0 or not config.enable_particles:
+            return lambda text: text
+        already_pat = re.compile(
+            rb"(?:,\s*)?" + re.escape(particle) + rb"\s*[.!?]+\s*$", flags=re.IGNORECASE
+        )
+        punct_pat = re.compile(rb"([.!?]+)(\s*)$")
+        key_prefix = f"{config.seed}|{dialect_id}|append_particle|{rule_index}|"
+        sample_fast = prob < 1 and config.particle_hash == "fast"
+        rule_seed = _particle_rule_seed(config, dialect_id, rule_index)
+        threshold = int(prob * 2**32)
+
+        def apply(text: bytes) -> bytes:
+            out_parts: list[bytes] = []
+            sent_i = _SENTENCE_OFFSET.get()
+            for s, e, _is_q in _iter_sentence_spans_bytes(text):
+                chunk = text[s:e]
+                sent_i += 1
+                if sample_fast:
+                    # The str path hashes _sampling_text(chunk).encode("utf-8"), i.e. these same bytes.
+                    key = _sampling_bytes(chunk) if config.deterministic else None
+                    draw = _fast_particle_draw(rule_seed, sent_i, key)
+                    if draw >= threshold:
+                        out_parts.append(chunk)
+                        continue
+                m = punct_pat.search(chunk)
+                if m is None or already_pat.search(chunk):
+                    out_parts.append(chunk)
+                    continue
+                if prob < 1 and not sample_fast:
+                    # Same key bytes as transform(): "...|{sent_i}|{sample}" encoded as UTF-8.
+                    key_bytes = f"{key_prefix}{sent_i}".encode("utf-8")
+                    if config.deterministic:
+                        key_bytes += b"|" + _sampling_bytes(chunk)
+                    h = hashlib.sha256(key_bytes).digest()
+                    if int.from_bytes(h[:8], "big", signed=False) / 2**64 >= prob:
+                        out_parts.append(chunk)
+                        continue
+                out_parts.append(chunk[: m.start(1)] + b", " + particle + m.group(1) + m.group(2))
+            return b"".join(out_parts)
+
+        return apply
+
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class _BytesPipeline:
+    protected_pattern: re.Pattern[bytes] | None
+    compiled_rules: tuple[Callable[[bytes], bytes], ...]
+
+
+_BYTES_PIPELINES = _LRUCache(max_entries=_env_int("VLAAMSCODEX_DIALECT_CACHE_MAX_ENTRIES", 256))
+_DEFAULT_REGISTRY.add_derived_cache(_BYTES_PIPELINES)
+
+
+def _bytes_pipeline(
+    dialect_id: str, pipeline: _CompiledPipeline, config: DialectTransformConfig
+) -> _BytesPipeline | None:
+    """Compile (and cache) the bytes twin of a pipeline; None if any rule needs Unicode."""
+    key = (dialect_id, config)
+    cached = _BYTES_PIPELINES.get(key)
+    if cached is not None:
+        return cached or None
+
+    resolved = _DEFAULT_REGISTRY.resolve(dialect_id)
+    terms = (*GLOBAL_PROTECTED_TERMS, *resolved.protected_terms)
+    compiled: _BytesPipeline | None = None
+    if all(_byte_safe(t) for t in terms):
+        rules = [
+            _compile_rule_bytes(r, config=config, dialect_id=dialect_id, rule_index=i)
+            for r, i in zip(pipeline.rules, pipeline.rule_indices)
+        ]
+        if all(fn is not None for fn in rules):
+            str_pat = _build_protected_pattern(terms)
+            compiled = _BytesPipeline(
+                protected_pattern=None
+                if str_pat is None
+                else re.compile(str_pat.pattern.encode("utf-8"), flags=str_pat.flags & ~re.UNICODE),
+                compiled_rules=tuple(rules),  # type: ignore[arg-type]
+            )
+    # Cache the negative result too (as False) so unsafe packs are not re-analysed.
+    _BYTES_PIPELINES.put(key, compiled if compiled is not None else False)
+    return compiled
+
+
+def _run_bytes_pipeline(
+    data: BytesLike, pipeline: _BytesPipeline, config: DialectTransformConfig, dialect_id: str
+) -> BytesLike:
+    """The bytes counterpart of `_run_pipeline`, recording metrics the same way."""
+    metrics = _transformer._METRICS
+    if metrics is None:
+        return _run_bytes_passes(data, pipeline, config, dialect_id, None)
+    started = time.perf_counter()
+    counts = [0, 0]  # passes, protected-term matches in the input
+    try:
+        return _run_bytes_passes(data, pipeline, config, dialect_id, counts)
+    finally:
+        metrics.observe(dialect_id, time.perf_counter() - started, counts[0], counts[1])
+
+
+def _run_bytes_passes(
+    data: BytesLike,
+    pipeline: _BytesPipeline,
+    config: DialectTransformConfig,
+    dialect_id: str,
+    counts: list[int] | None,
+) -> BytesLike:
+    def apply_once(src: BytesLike) -> bytes:
+        mapping: list[tuple[bytes, bytes]] = []
+        out: BytesLike = src
+        if pipeline.protected_pattern is not None:
+
+            def repl(m: re.Match[bytes]) -> bytes:
+                placeholder = f"\uE000{len(mapping)}\uE001".encode("utf-8")
+                mapping.append((placeholder, m.group(0)))
+                return placeholder
+
+            out = pipeline.protected_pattern.sub(repl, src)
+        if counts is not None:
+            if counts[0] == 0:
+                counts[1] = len(mapping)
+            counts[0] += 1
+        for fn in pipeline.compiled_rules:
+            out = fn(out)  # type: ignore[arg-type]
+        out = bytes(out)
+        for placeholder, original in mapping:
+            out = out.replace(placeholder, original)
+        return out
+
+    out: BytesLike = data
+    seen: set[bytes] = {bytes(data)}
+    for _ in range(max(1, config.max_passes)):
+        new = apply_once(out)
+        if new == out:
+            return out
+        if new in seen:
+            break
+        seen.add(new)
+        out = new
+    if config.strict_idempotency and apply_once(out) != out:
+        raise RuntimeError(f"Dialect transform did not converge for {dialect_id}")
+    return out
+
+
+def transform_bytes(
+    data: BytesLike,
+    dialect_id: str,
+    *,
+    out: bytearray | None = None,
+    **config: Any,
+) -> bytes | bytearray:
+    """
+    Transform UTF-8 encoded text, returning UTF-8 bytes.
+
+    If `out` is given the result is copied into it, reusing its allocation, and it is
+    returned, so a bulk pipeline can keep one output buffer for every document. Keyword arguments are the config
+    overrides accepted by `transform()`. Output equals `transform(text).encode()`.
+    """
+    if not isinstance(data, (bytes, bytearray, memoryview)):
+        raise TypeError("data must be bytes, bytearray or memoryview")
+    if not isinstance(dialect_id, str) or not dialect_id:
+        raise TypeError("dialect_id must be non-empty str")
+
+    cfg = _build_config(**config)
+    pipeline = _DEFAULT_REGISTRY.pipeline(dialect_id, cfg)
+    bytes_pipeline = _bytes_pipeline(dialect_id, pipeline, cfg)
+    if bytes_pipeline is not None and _input_byte_safe(data):
+        result: BytesLike = _run_bytes_pipeline(data, bytes_pipeline, cfg, dialect_id)
+    else:
+        text = bytes(data).decode("utf-8")
+        result = _run_pipeline(text, pipeline, cfg).encode("utf-8")
+
+    if out is None:
+        return result if isinstance(result, bytes) else bytes(result)
+    # Slice assignment resizes in place; clear() would free the buffer first.
+    out[:] = result
+    return out
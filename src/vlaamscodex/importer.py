@@ -0,0 +1,110 @@
+"""Import hook: `import foo` finds and loads `foo.plats`.
+
+`install()` appends `PlatsFinder` to `sys.meta_path`, after Python's own finders, so
+a `foo.py` (or package `foo/`) still wins over `foo.plats`. Modules are found on
+`sys.path`, or on a package's `__path__` for submodules.
+
+`PlatsLoader` is a `SourceFileLoader`: Python's own `SourceLoader.get_code` checks
+the source's mtime and size against `__pycache__` and writes bytecode after a
+compile, so a Plats module is compiled once and afterwards loads at `.pyc` speed.
+The bytecode file is named after the compiler version
+(`foo.cpython-311.plats-<tag>.pyc`), so it never collides with a `foo.py` in the
+same directory and a compiler upgrade recompiles instead of reusing stale code.
+
+Example:
+    >>> import sys, tempfile
+    >>> from pathlib import Path
+    >>> from vlaamscodex import importer
+    >>> tmp = Path(tempfile.mkdtemp())
+    >>> _ = (tmp / "groeten.plats").write_text(
+    ...     "plan doe\\n  maak funksie groet met wie doe\\n"
+    ...     "    geeftterug tekst gdag plakt spatie plakt da wie amen\\n  gedaan\\ngedaan\\n"
+    ... )
+    >>> sys.path.insert(0, str(tmp)); importer.install()
+    >>> import groeten
+    >>> groeten.groet("weeireld")
+    'gdag weeireld'
+    >>> importer.uninstall(); sys.path.remove(str(tmp))
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+from importlib.abc import MetaPathFinder
+from importlib.machinery import ModuleSpec, SourceFileLoader
+from importlib.util import cache_from_source, spec_from_file_location
+from types import CodeType, ModuleType
+from typing import Sequence
+
+from .cache import _compiler_tag
+from .compiler import compile_plats_code
+
+PLATS_SUFFIX = ".plats"
+
+
+class PlatsLoader(SourceFileLoader):
+    """Compile `.plats` source to a code object; bytecode caching is inherited."""
+
+    def _bytecode_path(self) -> str:
+        standard = cache_from_source(self.path)
+        tag = hashlib.sha256(_compiler_tag()).hexdigest()[:12]
+        return f"{standard[: -len('.pyc')]}.plats-{tag}.pyc"
+
+    # SourceLoader.get_code derives the bytecode path itself (foo.cpython-311.pyc, the
+    # same as foo.py's); redirect reads and writes of that path to our own name.
+    def get_data(self, path: str) -> bytes:
+        if path != self.path and path == cache_from_source(self.path):
+            path = self._bytecode_path()
+        return super().get_data(path)
+
+    def set_data(self, path: str, data: bytes, *, _mode: int = 0o666) -> None:
+        if path == cache_from_source(self.path):
+            path = self._bytecode_path()
+        super().set_data(path, data, _mode=_mode)
+
+    def source_to_code(self, data: bytes, path: str, *, _optimize: int = -1) -> CodeType:  # type: ignore[override]
+        # `python -O` selects Plats level 1 (its bytecode goes to an `opt-1` .pyc, as
+        # for .py files). Never level 2: importers need every function to stay defined.
+        level = sys.flags.optimize if _optimize == -1 else _optimize
+        return compile_plats_code(data.decode("utf-8-sig"), path, 1 if level > 0 else 0)
+
+    def get_source(self, fullname: str) -> str:
+        # The Plats text itself (not decoded through the `vlaamsplats` cookie), so
+        # tracebacks and `inspect` show .plats lines.
+        return self.get_data(self.get_filename(fullname)).decode("utf-8-sig")
+
+
+class PlatsFinder(MetaPathFinder):
+    """Find `<name>.plats` on `sys.path` or a package's `__path__`."""
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None,
+        target: ModuleType | None = None,
+    ) -> ModuleSpec | None:
+        name = fullname.rpartition(".")[2]
+        for entry in sys.path if path is None else path:
+            if not isinstance(entry, str):
+                continue
+            candidate = os.path.join(entry or os.getcwd(), name + PLATS_SUFFIX)
+            if os.path.isfile(candidate):
+                return spec_from_file_location(fullname, candidate, loader=PlatsLoader(fullname, candidate))
+        return None
+
+
+_FINDER = PlatsFinder()
+
+
+def install() -> None:
+    """Make `.plats` files importable (idempotent)."""
+    if _FINDER not in sys.meta_path:
+        sys.meta_path.append(_FINDER)
+
+
+def uninstall() -> None:
+    """Remove the import hook; modules already imported stay loaded."""
+    while _FINDER in sys.meta_path:
+        sys.meta_path.remove(_FINDER)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from vlaamscodex import build
+from vlaamscodex.cli import main
+
+HALLO = "plan doe\n  klap tekst hallo amen\ngedaan\n"
+
+
+def test_build_project_rebuilds_only_changed_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    src, out = tmp_path / "src", tmp_path / "out"
+    (src / "pkg").mkdir(parents=True)
+    for name in ("a", "b", "pkg/c"):
+        (src / f"{name}.plats").write_text(HALLO.replace("hallo", name.replace("/", "")), encoding="utf-8")
+
+    report = build.build_project(src, out, workers=2)
+    assert report.rebuilt == ("a.plats", "b.plats", "pkg/c.plats") and report.ok
+    assert (out / "pkg" / "c.py").read_text(encoding="utf-8") == "print('pkgc')\n"
+
+    # Touched but unchanged: hashed, not compiled.
+    os.utime(src / "a.plats", ns=(1, 1))
+    (src / "b.plats").write_text(HALLO.replace("hallo", "nieuw"), encoding="utf-8")
+    report = build.build_project(src, out)
+    assert report.rebuilt == ("b.plats",)
+    assert report.skipped == ("a.plats", "pkg/c.plats")
+    assert (out / "b.py").read_text(encoding="utf-8") == "print('nieuw')\n"
+
+    # A deleted output is rebuilt; --force rebuilds everything.
+    (out / "a.py").unlink()
+    assert build.build_project(src, out).rebuilt == ("a.plats",)
+    assert len(build.build_project(src, out, force=True).rebuilt) == 3
+    # So does another optimisation level.
+    assert len(build.build_project(src, out, optimize=1).rebuilt) == 3
+    assert build.build_project(src, out, optimize=1).rebuilt == ()
+
+    # A deleted source takes its output along.
+    (src / "pkg" / "c.plats").unlink()
+    assert build.build_project(src, out).removed == ("pkg/c.plats",)
+    assert not (out / "pkg" / "c.py").exists()
+
+
+def test_build_failures_are_reported_and_retried(tmp_path: Path, capsys) -> None:
+    (tmp_path / "goed.plats").write_text(HALLO, encoding="utf-8")
+    bad = tmp_path / "kapot.plats"
+    bad.write_text("plan doe\n  klap tekst oei amen\n", encoding="utf-8")
+
+    assert main(["build", str(tmp_path)]) == 1
+    captured = capsys.readouterr()
+    assert "kapot.plats: line 1, col 1: unclosed block 'plan'" in captured.err
+    assert "1 rebuilt, 0 up to date, 1 failed" in captured.out
+    assert not (tmp_path / "kapot.py").exists()
+    # No temporary files left behind.
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".plats-build.json", "goed.plats", "goed.py", "kapot.plats"]
+
+    # Still failing: compiled again, not cached as done.
+    assert build.build_project(tmp_path).failed[0][0] == "kapot.plats"
+    bad.write_text(HALLO, encoding="utf-8")
+    assert main(["build", str(tmp_path)]) == 0
+    assert "1 rebuilt, 1 up to date, 0 failed" in capsys.readouterr().out
+
+    assert main(["build", str(bad)]) == 2
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from vlaamscodex import cache, compiler
+
+PLATS = "plan doe\n  zet x op getal 2 amen\n  klap da x keer getal 21 amen\ngedaan\n"
+
+
+def test_cached_code_and_source_skip_recompilation(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys) -> None:
+    monkeypatch.setenv("VLAAMSCODEX_CACHE_DIR", str(tmp_path))
+
+    code = cache.cached_code(PLATS, "x.plats")
+    py_src = cache.cached_source(PLATS)
+    assert py_src == compiler.compile_plats(PLATS)
+    assert sorted(p.suffix for p in tmp_path.glob("*/*")) == [".code", ".py"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("recompiled despite a cache entry")
+
+    monkeypatch.setattr(compiler, "compile_plats", fail)
+    monkeypatch.setattr(compiler, "compile_plats_code", fail)
+    cached = cache.cached_code(PLATS, "x.plats")
+    assert cached.co_filename == "x.plats"
+    exec(cached, {})
+    assert capsys.readouterr().out == "42\n"
+    assert cache.cached_source(PLATS) == py_src
+
+    # A different filename is a different code object.
+    with pytest.raises(AssertionError):
+        cache.cached_code(PLATS, "y.plats")
+
+
+def test_cache_fills_concurrently_and_can_be_disabled(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("VLAAMSCODEX_CACHE_DIR", str(tmp_path))
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        results = list(ex.map(lambda _: cache.cached_source(PLATS), range(32)))
+    assert set(results) == {compiler.compile_plats(PLATS)}
+    # Only the final entry is left: no partial or temporary files.
+    assert [p.suffix for p in tmp_path.glob("*/*")] == [".py"]
+    assert not list(tmp_path.glob("*/.*"))
+
+    assert cache.clear_cache() == 1
+    monkeypatch.setenv("VLAAMSCODEX_CACHE", "0")
+    assert cache.cache_dir() is None
+    cache.cached_source(PLATS)
+    assert not list(tmp_path.glob("*/*"))
+
+
+def test_cache_dir_is_private(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import os
+    import stat
+
+    root = tmp_path / "a" / "b" / "cache"
+    monkeypatch.setenv("VLAAMSCODEX_CACHE_DIR", str(root))
+    cache.cached_source(PLATS)
+    # Every level that had to be created is private, not just the last one.
+    for level in (tmp_path / "a", tmp_path / "a" / "b", root):
+        assert stat.S_IMODE(level.stat().st_mode) & 0o077 == 0, level
+    assert len(list(root.glob("*/*.py"))) == 1
+
+    def compiled(*args, **kwargs):
+        raise LookupError("compiled")
+
+    monkeypatch.setattr(compiler, "compile_plats", compiled)
+    # A directory others can write to, or that belongs to someone else, is not read.
+    root.chmod(0o777)
+    with pytest.raises(LookupError):
+        cache.cached_source(PLATS)
+    assert cache.clear_cache() == 0
+    root.chmod(0o700)
+    assert cache.cached_source(PLATS) == "x = 2\nprint(x * 21)\n"
+    if hasattr(os, "getuid"):
+        monkeypatch.setattr(os, "getuid", lambda: os.stat(root).st_uid + 1)
+        with pytest.raises(LookupError):
+            cache.cached_source(PLATS)
@@ -22,3 +22,351 @@ gedaan
     assert "print(" in py
     assert "groet(naam)" in py
 
+
+
+def test_parse_builds_ast_with_positions() -> None:
+    import pytest
+
+    from vlaamscodex.compiler import Assign, BinOp, Constant, FunctionDef, Plan, PlatsSyntaxError, parse
+
+    program = parse("# coding: vlaamsplats\nplan doe\n  zet x op getal 2 keer getal 3 derbij getal 1 amen\n  maak funksie f met a en b doe\n  gedaan\ngedaan\n")
+    (plan,) = program.body
+    assert isinstance(plan, Plan) and (plan.line, plan.col) == (2, 1)
+    assign, func = plan.body
+    assert isinstance(assign, Assign) and (assign.line, assign.col) == (3, 3)
+    assert isinstance(assign.value, BinOp) and assign.value.op == "+"
+    assert assign.value.left == BinOp(Constant(2, 3, 12), "*", Constant(3, 3, 25), 3, 12)
+    assert isinstance(func, FunctionDef) and func.params == ("a", "b") and func.body == ()
+
+    with pytest.raises(PlatsSyntaxError) as exc:
+        parse("plan doe\n  klap tekst hallo\ngedaan\n")
+    assert (exc.value.line, exc.value.col) == (2, 19)
+    with pytest.raises(ValueError, match="unclosed block 'plan'"):
+        parse("plan doe\n  klap tekst hallo amen\n")
+
+
+def test_compile_plats_reads_constants_and_dotted_names() -> None:
+    import os
+
+    import pytest
+
+    from vlaamscodex.compiler import PlatsSyntaxError, compile_plats_code
+
+    plats = """
+plan doe
+  zet pad op roep os.path.join met tekst a en tekst b amen
+  klap True enook da None ofwel False amen
+  klap da os.sep plakt roep os.path.basename met da pad amen
+  maak funksie f met doe
+    klap da pad.upper isgelijk None amen
+  gedaan
+  roep f amen
+gedaan
+""".strip()
+    for level in (0, 1, 2):
+        py = compile_plats(plats, level)
+        assert "os.path.join('a', 'b')" in py
+        for code in (compile(py, "<py>", "exec"), compile_plats_code(plats, "<plats>", level)):
+            lines: list = []
+            exec(code, {"print": lines.append, "os": os})
+            assert lines == [False, os.sep + "b", False]
+
+    # Names that are bound must stay plain identifiers; Python keywords are never names.
+    for bad in ("zet os.sep op getal 1 amen", "zet None op getal 1 amen", "klap da class amen", "roep os..x amen"):
+        with pytest.raises(PlatsSyntaxError, match="invalid identifier"):
+            compile_plats(f"plan doe\n  {bad}\ngedaan\n")
+
+
+def test_compile_plats_keeps_operator_precedence() -> None:
+    plats = "plan doe\n  klap da a deraf da b deraf da c keer da d isgroterdan getal 1 enook nie da e ofwel da f amen\ngedaan"
+    py = compile_plats(plats)
+    assert py == "print(a - b - c * d > 1 and not e or f)\n"
+    a, b, c, d, e, f = 10, 3, 2, 2, False, False
+    assert eval(py[len("print(") : -2]) == (a - b - c * d > 1 and not e or f)
+
+    # Long left-associative chains are built and rendered without deep recursion.
+    chain = " plakt ".join(["tekst x"] * 5000)
+    assert compile_plats(f"plan doe\n  klap {chain} amen\ngedaan") == f"print({' + '.join([repr('x')] * 5000)})\n"
+
+
+def test_compile_plats_code_maps_lines_to_plats_source() -> None:
+    import traceback
+
+    import pytest
+
+    from vlaamscodex.compiler import PlatsSyntaxError, compile_plats_code
+
+    plats = """# coding: vlaamsplats
+plan doe
+  maak funksie deel met a doe
+    klap da a gedeeld getal 0 amen
+  gedaan
+
+  roep deel met getal 1 amen
+gedaan
+"""
+    code = compile_plats_code(plats, "deel.plats")
+    with pytest.raises(ZeroDivisionError) as excinfo:
+        exec(code, {})
+    frames = traceback.extract_tb(excinfo.tb)[-2:]
+    assert [(f.filename, f.lineno) for f in frames] == [("deel.plats", 7), ("deel.plats", 4)]
+    assert (frames[-1].colno, frames[-1].end_colno) == (9, 34)
+
+    with pytest.raises(PlatsSyntaxError, match="invalid identifier: None"):
+        compile_plats_code("plan doe\n  zet None op getal 1 amen\ngedaan\n")
+
+
+def test_compile_plats_iter_streams_statements() -> None:
+    from vlaamscodex.compiler import compile_plats_iter
+
+    plats = """plan doe
+  zet naam op tekst weeireld amen
+  maak funksie groet met wie doe
+    klap tekst gdag plakt spatie plakt da wie amen
+  gedaan
+  roep groet met da naam amen
+gedaan
+"""
+    assert "".join(compile_plats_iter(plats.splitlines())) == compile_plats(plats)
+
+    consumed = 0
+
+    def lines():
+        nonlocal consumed
+        yield "plan doe\n"
+        for i in range(10_000):
+            consumed += 1
+            yield f"  klap getal {i} amen\n"
+        yield "gedaan\n"
+
+    out = compile_plats_iter(lines())
+    assert next(out) == "print(0)\n"
+    # Output starts long before the input is exhausted (one line of lookahead).
+    assert consumed <= 2
+    assert sum(1 for _ in out) == 9_999
+
+
+def test_optimisation_levels_fold_and_drop_dead_code() -> None:
+    import pytest
+
+    from vlaamscodex.compiler import compile_plats_code
+
+    plats = """
+plan doe
+  maak funksie ongebruikt met x doe
+    roep ongebruikt met da x amen
+  gedaan
+  maak funksie dubbel met x doe
+    geeftterug da x keer getal 2 derbij getal 0 amen
+    klap tekst nooit amen
+  gedaan
+  klap getal 6 keer getal 7 amen
+  klap tekst a plakt spatie plakt tekst b plakt da x amen
+  klap getal 1 enook da x ofwel getal 2 isgroterdan getal 3 amen
+  klap nie getal 0 amen
+  klap getal 1 gedeeld getal 0 amen
+  roep dubbel met getal 1 derbij getal 1 amen
+gedaan
+""".strip()
+    assert compile_plats(plats, 0) == compile_plats(plats)
+    assert "6 * 7" in compile_plats(plats)
+    assert compile_plats(plats, 1).splitlines()[3:] == [
+        "    return x * 2 + 0",
+        "print(42)",
+        "print('a b' + x)",
+        "print(x or False)",
+        "print(True)",
+        # Would raise at compile time: left for run time.
+        "print(1 / 0)",
+        "dubbel(2)",
+    ]
+    assert "nooit" not in compile_plats(plats, 1) and "def ongebruikt" in compile_plats(plats, 1)
+    assert "def ongebruikt" not in compile_plats(plats, 2) and "def dubbel" in compile_plats(plats, 2)
+
+    # Same behaviour at every level, through both back ends.
+    runnable = plats.replace("  klap getal 1 gedeeld getal 0 amen\n", "").replace("plan doe\n", "plan doe\n  zet x op tekst c amen\n")
+    outputs = set()
+    for level in (0, 1, 2):
+        for code in (compile(compile_plats(runnable, level), "<py>", "exec"), compile_plats_code(runnable, "<plats>", level)):
+            lines: list[str] = []
+            exec(code, {"print": lines.append})
+            outputs.add(tuple(lines))
+    assert len(outputs) == 1
+
+    with pytest.raises(ValueError, match="optimisation level"):
+        compile_plats(plats, 3)
+
+    # A `zet` after `geeftterug` never runs, but it still makes `x` local to f.
+    plats = """
+plan doe
+  zet x op tekst globaal amen
+  maak funksie f met doe
+    klap da x amen
+    geeftterug getal 1 amen
+    zet x op tekst lokaal amen
+    klap tekst nooit amen
+  gedaan
+  roep f amen
+gedaan
+""".strip()
+    assert "nooit" not in compile_plats(plats, 1) and "x = 'lokaal'" in compile_plats(plats, 1)
+    for level in (0, 1, 2):
+        for code in (compile(compile_plats(plats, level), "<py>", "exec"), compile_plats_code(plats, "<plats>", level)):
+            lines = []
+            with pytest.raises(UnboundLocalError):
+                exec(code, {"print": lines.append})
+            assert lines == []
+
+
+def test_text_chains_compile_to_join() -> None:
+    import pytest
+
+    from vlaamscodex.compiler import compile_plats_code
+
+    plats = """
+plan doe
+  maak funksie zin met wie en waar doe
+    geeftterug tekst gdag plakt spatie plakt da wie plakt spatie plakt tekst uit plakt spatie plakt da waar amen
+  gedaan
+  maak funksie som met a en b doe
+    geeftterug da a plakt da b plakt da a amen
+  gedaan
+  klap roep zin met tekst jan en tekst brugge amen
+  klap roep som met getal 1 en getal 2 amen
+gedaan
+""".strip()
+    py = compile_plats(plats, 2)
+    assert "return ''.join(('gdag ', wie, ' uit ', waar))" in py
+    # No text literal: may be numbers, so `+` stays.
+    assert "return a + b + a" in py
+    # Level 1 keeps `+`: the join evaluates every operand before a bad one raises.
+    assert "join" not in compile_plats(plats, 1)
+
+    lines: list = []
+    namespace: dict = {"print": lines.append}
+    exec(compile_plats_code(plats, "zin.plats", 2), namespace)
+    assert lines == ["gdag jan uit brugge", 4]
+    with pytest.raises(TypeError):
+        namespace["zin"](1, "brugge")
+
+    # A call after a non-text operand does not run at level 1, as at level 0.
+    plats = """
+plan doe
+  maak funksie f met x doe
+    klap tekst bijwerking amen
+    geeftterug tekst b amen
+  gedaan
+  klap getal 1 plakt tekst a plakt getal 2 plakt roep f met getal 0 amen
+gedaan
+""".strip()
+    for level in (0, 1):
+        lines = []
+        with pytest.raises(TypeError, match="unsupported operand"):
+            exec(compile_plats_code(plats, "<plats>", level), {"print": lines.append})
+        assert lines == []
+
+    # Flat, so far longer than CPython can compile as nested `+`.
+    chain = " plakt ".join(["da x", "spatie"] * 2500)
+    plats = f"plan doe\n  zet x op tekst a amen\n  zet y op {chain} amen\n  klap da y amen\ngedaan\n"
+    lines = []
+    exec(compile_plats_code(plats, "<lang>", 2), {"print": lines.append})
+    assert lines == ["a " * 2500]
+
+
+def test_level_two_runs_program_body_in_main() -> None:
+    import pytest
+
+    from vlaamscodex.compiler import compile_plats_code
+
+    plats = """
+plan doe
+  zet groet op tekst gdag amen
+  maak funksie main met wie doe
+    klap da groet plakt spatie plakt da wie amen
+  gedaan
+  zet naam op tekst weeireld amen
+  roep main met da naam amen
+  roep later amen
+  maak funksie later met doe
+    klap tekst te laat amen
+  gedaan
+gedaan
+""".strip()
+    assert compile_plats(plats, 2).splitlines() == [
+        # Hoisted: defined once and not called before its definition.
+        "def main(wie):",
+        "    print(groet + ' ' + wie)",
+        # `main` is taken.
+        "def _main():",
+        # Read by a function, so it stays a module global; `later` is defined in place.
+        "    global groet, later",
+        "    groet = 'gdag'",
+        "    naam = 'weeireld'",
+        "    main(naam)",
+        "    later()",
+        "    def later():",
+        "        print('te laat')",
+        "_main()",
+    ]
+    for level in (0, 2):
+        lines: list[str] = []
+        with pytest.raises(NameError, match="later"):
+            exec(compile_plats_code(plats, "<plats>", level), {"print": lines.append})
+        assert lines == ["gdag weeireld"]
+
+    # Python rejects `return` outside a function; main() must not hide that.
+    assert compile_plats("plan doe\n  geeftterug getal 1 amen\ngedaan\n", 2) == "return 1\n"
+
+    # Read before it is assigned: the first read must still find the builtin.
+    plats = "plan doe\n  roep print met tekst hallo amen\n  zet print op getal 1 amen\ngedaan\n"
+    py = compile_plats(plats, 2)
+    assert "    global print\n" in py
+    for level in (0, 2):
+        namespace: dict = {}
+        exec(compile_plats_code(plats, "<plats>", level), namespace)
+        assert namespace["print"] == 1
+    assert "global len" in compile_plats("plan doe\n  zet len op getal 1 amen\ngedaan\n", 2)
+
+
+def test_self_tail_calls_become_loops() -> None:
+    import sys
+
+    import pytest
+
+    from vlaamscodex.compiler import compile_plats_code
+
+    plats = """
+plan doe
+  maak funksie som met n en totaal doe
+    geeftterug da n isgelijk getal 0 enook da totaal ofwel roep som met da n deraf getal 1 en da totaal derbij da n amen
+  gedaan
+  maak funksie kapot met n doe
+    geeftterug roep kapot met da n amen
+  gedaan
+  klap roep som met getal 4 en getal 1 amen
+  zet k op da kapot amen
+gedaan
+""".strip()
+    # `roep` is an expression now, at every level.
+    assert "print(som(4, 1))" in compile_plats(plats)
+    assert compile_plats(plats, 2).splitlines()[:5] == [
+        "def som(n, totaal):",
+        "    while True:",
+        "        if _tail := n == 0 and totaal:",
+        "            return _tail",
+        "        n, totaal = n - 1, totaal + n",
+    ]
+
+    deep = sys.getrecursionlimit() * 10
+    for level, ok in ((0, False), (2, True)):
+        namespace: dict = {"print": lambda *args: None}
+        exec(compile_plats_code(plats, "<plats>", level), namespace)
+        assert namespace["som"](4, 1) == 11
+        if ok:
+            assert namespace["som"](deep, 1) == deep * (deep + 1) // 2 + 1
+        else:
+            with pytest.raises(RecursionError):
+                namespace["som"](deep, 1)
+    # No `enook`/`ofwel` before the call: it can only end in RecursionError, so it
+    # is not turned into an endless loop.
+    assert "def kapot(n):\n    return kapot(n)\n" in compile_plats(plats, 2)
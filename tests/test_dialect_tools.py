@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tools"))
+
+import validate_dialect_packs  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        r"(a+)+$",
+        r"(\w+\s?)+$",
+        r"(a|ab)*c",
+        r"(?:aa|a)+$",
+        r"(?:\s*,\s*)+;",
+        r"(a+){2,20}$",
+        r"(?:a|a){2,25}$",
+    ],
+)
+def test_validate_rejects_catastrophic_regex(pattern: str) -> None:
+    with pytest.raises(ValueError, match="nested quantifier|ambiguous alternation"):
+        validate_dialect_packs._check_regex_cost(pattern, [], where="t")
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [r"(\w+)\s+(\w+)", r"\s+$", r"\bda\b", r"(?:a\d+)+", r"(?:jij|gij)\s+(\w+)", r"\b(d)at\b"],
+)
+def test_validate_accepts_ordinary_regex(pattern: str) -> None:
+    # Structural analysis only: no timing, so no flakiness.
+    assert validate_dialect_packs._check_regex_cost(pattern, ["IGNORECASE"], where="t") == []
+
+
+def test_validate_probe_reports_exponential_growth() -> None:
+    problem = validate_dialect_packs._regex_dynamic_issue(r"(a+)+$", 0, {"a"})
+    assert problem is not None and problem.startswith("exponential matching")
+    assert validate_dialect_packs.main(["--probe-regex"]) == 0
+
+
+def test_rule_stats_runs_the_transform_pass_loop() -> None:
+    import dialect_rule_stats
+
+    from vlaamscodex.dialects.transformer import _DEFAULT_REGISTRY, _default_config, transform
+
+    texts = ["Dat is wat jij zegt.", "Wat wil jij?", "Niets te zien"]
+    config = _default_config()
+    pipeline = _DEFAULT_REGISTRY.pipeline("vlaams/basis", config, optimize=False)
+    for text in texts:
+        assert dialect_rule_stats._run(text, pipeline, config) == transform(text, "vlaams/basis")
+
+    stats = dialect_rule_stats.collect_stats(texts, "vlaams/basis")
+    jij = next(s for s in stats if s.type == "replace_word" and s.rule.startswith("jij ->"))
+    assert jij.status == "live" and jij.texts_matched == 2 and jij.bytes_changed > 0
+    assert all(s.status == "disabled" for s in stats if s.type == "append_particle")
@@ -75,3 +75,461 @@ def test_snapshot_antwerps() -> None:
 def test_snapshot_west_vlaams() -> None:
     text = "Dat is goed. Wat wil jij even doen? Dat is snel."
     assert transform(text, "vlaams/west-vlaams") == "Da’s goe. Wa wil ge effen doen? Da’s rap."
+
+
+def test_registry_cache_lru_eviction() -> None:
+    from vlaamscodex.dialects.transformer import _DialectRegistry
+
+    reg = _DialectRegistry(max_entries=2)
+    reg.resolve("vlaams/antwerps")
+    reg.resolve("vlaams/limburgs")
+    reg.resolve("vlaams/antwerps")  # hit: antwerps becomes most recent
+    reg.resolve("vlaams/west-vlaams")
+
+    stats = reg.cache_stats()["resolved"]
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 1
+    assert "vlaams/antwerps" in reg._resolved
+    assert "vlaams/limburgs" not in reg._resolved
+
+    reg.configure_cache(max_bytes=1)
+    assert all(s["entries"] == 0 for s in reg.cache_stats().values())
+    # Oversized entries are not cached, but resolution still works.
+    assert reg.resolve("vlaams/antwerps").id == "vlaams/antwerps"
+
+
+def test_lru_cache_is_thread_safe() -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from vlaamscodex.dialects.transformer import _LRUCache
+
+    cache = _LRUCache(max_entries=8, sizeof=lambda v: 1)
+
+    def hammer(worker: int) -> None:
+        for i in range(5000):
+            key = (worker + i) % 13
+            if cache.get(key) is None:
+                cache.put(key, i)
+
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        list(ex.map(hammer, range(8)))
+    stats = cache.stats()
+    assert stats["entries"] == stats["bytes"] <= 8
+    assert stats["hits"] + stats["misses"] == 8 * 5000
+
+
+def test_transform_deadline_partial_and_raise() -> None:
+    import pytest
+
+    from vlaamscodex.dialects import DialectTimeoutError
+
+    text = "Dat is wat jij zegt. Wat wil jij?"
+    # An already-expired deadline stops after the first rule of the first pass.
+    partial = transform(text, "vlaams/basis", timeout=0)
+    assert partial != transform(text, "vlaams/basis")
+
+    with pytest.raises(DialectTimeoutError) as excinfo:
+        transform(text, "vlaams/basis", timeout=0, on_timeout="raise")
+    assert excinfo.value.rule_index == 0
+    assert excinfo.value.dialect_id == "vlaams/basis"
+    assert excinfo.value.partial == partial
+
+    # A generous budget does not change the output.
+    assert transform(text, "vlaams/basis", timeout=60) == "Da’s wat ge zegt. Wa wil ge?"
+
+
+def test_prune_rules_removes_duplicates_and_shadowed_only() -> None:
+    from vlaamscodex.dialects.transformer import _build_config, _compile_rule, _prune_rules
+
+    rules = (
+        {"type": "replace_word", "from": "jij", "to": "{pronoun_subject}"},
+        {"type": "replace_word", "from": "even", "to": "efkes"},
+        {"type": "replace_word", "from": "jij", "to": "{pronoun_subject}"},  # duplicate
+        {"type": "replace_word", "from": "Even", "to": "effen"},  # shadowed
+        {"type": "replace_word", "from": "goed", "to": "goe"},
+        {"type": "replace_word", "from": "snel", "to": "goed"},  # recreates "goed"
+        {"type": "replace_word", "from": "goed", "to": "goeie"},  # must stay
+        {"type": "append_particle", "particle": "zeg", "probability": 0.5, "positions": ["end_of_sentence"]},
+    )
+    config = _build_config(enable_particles=False)
+    kept, removed = _prune_rules(rules, config)
+    assert [i for i, _ in removed] == [2, 3, 7]
+    assert kept == (0, 1, 4, 5, 6)
+
+    compiled = [_compile_rule(r, config=config, dialect_id="t", rule_index=i) for i, r in enumerate(rules)]
+    text = "Jij moet even snel kijken. Is dat goed, EVEN snel?"
+    full = text
+    for fn in compiled:
+        full = fn(full)
+    pruned = text
+    for i in kept:
+        pruned = compiled[i](pruned)
+    assert pruned == full
+
+
+def test_prune_rules_keeps_question_rule_behind_punctuation_rewrite() -> None:
+    from vlaamscodex.dialects.transformer import (
+        _CompiledPipeline,
+        _build_config,
+        _compile_rule,
+        _prune_rules,
+        _run_pipeline,
+    )
+
+    # "a.b" -> "ab" removes a sentence boundary, so the first "wat" ends up in a question.
+    rules = (
+        {"type": "replace_word", "from": "wat", "to": "X", "only_in_questions": True},
+        {"type": "replace_word", "from": "a.b", "to": "ab"},
+        {"type": "replace_word", "from": "wat", "to": "Y", "only_in_questions": True},
+    )
+    for max_passes in (1, None):
+        config = _build_config(max_passes=max_passes)
+        kept, removed = _prune_rules(rules, config)
+        assert kept == (0, 1, 2) and removed == ()
+        compiled = [_compile_rule(r, config=config, dialect_id="t", rule_index=i) for i, r in enumerate(rules)]
+        pipeline = _CompiledPipeline(
+            "t", None, tuple(rules[i] for i in kept), tuple(compiled[i] for i in kept), kept
+        )
+        assert _run_pipeline("wat a.b wat?", pipeline, config) == "Y ab X?"
+
+
+def test_pruned_pipeline_matches_unpruned_output() -> None:
+    from vlaamscodex.dialects.transformer import _DEFAULT_REGISTRY, _build_config, _mask_with_pattern, _unmask
+
+    text = "Dat is wat jij zegt. Wat wil jij even kijken? Dat is goed en snel! Jouw boek, jou."
+    config = _build_config(enable_particles=True)
+    for pack in available_packs():
+        outs = []
+        for optimize in (False, True):
+            pipe = _DEFAULT_REGISTRY.pipeline(pack.id, config, optimize=optimize)
+            out, mapping = _mask_with_pattern(text, pipe.protected_pattern)
+            for fn in pipe.compiled_rules:
+                out = fn(out)
+            outs.append(_unmask(out, mapping))
+        assert outs[0] == outs[1], pack.id
+
+
+def test_incremental_edits_match_full_transform() -> None:
+    import random
+
+    from vlaamscodex.dialects.incremental import IncrementalTransform
+
+    pieces = ["Dat is wat jij zegt. ", "Wat wil jij even kijken? ", "Dat is goed!", "  ", ".", " jij ", "?", "ok"]
+    rnd = random.Random(0)
+    for trial in range(40):
+        text = "".join(rnd.choice(pieces) for _ in range(rnd.randint(0, 10)))
+        config = {"enable_particles": True, "seed": trial}
+        doc = IncrementalTransform(text, "vlaams/basis", **config)
+        for _ in range(10):
+            old_text, old_out = doc.text, doc.output
+            a = rnd.randint(0, len(old_text))
+            b = rnd.randint(a, min(len(old_text), a + 8))
+            rep = rnd.choice([*pieces, ""])
+            out_start, out_end, out_text = doc.edit(a, b, rep)
+            expected = transform(old_text[:a] + rep + old_text[b:], "vlaams/basis", **config)
+            assert doc.output == expected
+            assert old_out[:out_start] + out_text + old_out[out_end:] == expected
+
+
+def test_incremental_particles_ignore_protected_term_numbering() -> None:
+    from vlaamscodex.dialects.incremental import IncrementalTransform
+
+    # Protected terms become placeholders numbered across the whole document; the
+    # particle draw for a sentence must not depend on how many came before it.
+    text = "Wat moet jij doen met print? " * 20 + "Wat moet jij doen. " * 40
+    for seed in range(5):
+        for particle_hash in ("fast", "sha256"):
+            config = {"enable_particles": True, "seed": seed, "particle_hash": particle_hash}
+            doc = IncrementalTransform(text, "vlaams/basis", **config)
+            assert doc.output == transform(text, "vlaams/basis", **config), (seed, particle_hash)
+
+
+def test_particles_are_appended_when_enabled() -> None:
+    texts = {
+        transform("Dat is goed. Kom hier. Ga weg.", "vlaams/basis", enable_particles=True, seed=s)
+        for s in range(30)
+    }
+    assert any(", zeg." in t or ", allee." in t for t in texts)
+
+
+def test_transform_markup_leaves_markup_untouched() -> None:
+    from vlaamscodex.dialects.markup import transform_markup
+
+    html = '<p title="wat jij">Wat wil <b>jij</b>?</p><code>jij</code> &wat; <!-- jij -->'
+    assert transform_markup(html, "vlaams/basis") == (
+        '<p title="wat jij">Wa wil <b>ge</b>?</p><code>jij</code> &wat; <!-- jij -->'
+    )
+
+    md = "Wat wil `jij` doen? Zie [jij](http://x/jij).\n\n```\njij\n```\nDat is jij.\n"
+    assert transform_markup(md, "vlaams/basis", markup="markdown") == (
+        "Wa wil `jij` doen? Zie [ge](http://x/jij).\n\n```\njij\n```\nDa’s ge.\n"
+    )
+
+    # Block tags end a sentence; inline tags do not. Only the list item ending in "?"
+    # is a question, so only there does "wat" become "wa".
+    html = "<ul><li>Wat wil jij</li><li>Wat wil <i>jij</i>?</li></ul><p>Wat</p><p>zeg jij?</p>Wat<br>jij?"
+    assert transform_markup(html, "vlaams/basis") == (
+        "<ul><li>Wat wil ge</li><li>Wa wil <i>ge</i>?</li></ul><p>Wat</p><p>zeg ge?</p>Wat<br>ge?"
+    )
+    md = "# Wat wil jij\n\nDat is goed?\n"
+    assert transform_markup(md, "vlaams/basis", markup="markdown") == "# Wat wil ge\n\nDa’s goed?\n"
+
+    # `>` inside a quoted attribute value does not end the tag.
+    html = '<a title="a > wat jij" href=\'x>jij\'>Wat wil jij?</a>'
+    assert transform_markup(html, "vlaams/basis") == '<a title="a > wat jij" href=\'x>jij\'>Wa wil ge?</a>'
+
+
+def test_transform_bytes_matches_str_transform() -> None:
+    from vlaamscodex.dialects.utf8 import transform_bytes
+
+    buf = bytearray()
+    for text in [
+        "Dat is wat JIJ zegt. Wat wil jij even kijken?",
+        "’s Avonds: dat is goed — jij mag niet.",
+        "Café jij? Dat is wat.",  # non-ASCII letters force the decode path
+    ]:
+        for dialect_id in ["vlaams/basis", "vlaams/antwerps", "vlaams/west-vlaams"]:
+            expected = transform(text, dialect_id, enable_particles=True).encode("utf-8")
+            data = text.encode("utf-8")
+            assert transform_bytes(data, dialect_id, enable_particles=True) == expected
+            assert transform_bytes(memoryview(data), dialect_id, out=buf, enable_particles=True) is buf
+            assert buf == expected
+
+    # Protected terms ("moet") are masked; particle draws must match the str path.
+    text = "Wat moet jij doen. " * 40
+    for seed in range(5):
+        for particle_hash in ("fast", "sha256"):
+            config = {"enable_particles": True, "seed": seed, "particle_hash": particle_hash}
+            expected = transform(text, "vlaams/basis", **config).encode("utf-8")
+            assert transform_bytes(text.encode("utf-8"), "vlaams/basis", **config) == expected
+
+    # The byte fast path is observed like transform(): same runs, passes and matches.
+    from vlaamscodex.dialects import transformer
+
+    snaps = []
+    for run in (transform, lambda t, d: transform_bytes(t.encode("utf-8"), d)):
+        transformer.enable_metrics()
+        try:
+            run("Dat is goed. Jij moet niet.", "vlaams/basis")
+            snaps.append(transformer.metrics_snapshot()["dialects"]["vlaams/basis"])
+        finally:
+            transformer.disable_metrics()
+    str_snap, bytes_snap = snaps
+    assert bytes_snap["runs"] == 1 and bytes_snap["protected_matches"] > 0
+    for key in ("runs", "passes", "protected_matches"):
+        assert bytes_snap[key] == str_snap[key]
+
+
+def test_transform_bytes_falls_back_for_multibyte_regex_units() -> None:
+    from vlaamscodex.dialects import utf8
+    from vlaamscodex.dialects.transformer import _DEFAULT_REGISTRY, _build_config
+
+    config = _build_config()
+    for pattern, byte_safe in [("[’~]", False), ("’+", False), ("[^a]", False), ("’t", True), ("[a-z]+", True)]:
+        rule = {"type": "replace_regex", "pattern": pattern, "to": "'"}
+        fn = utf8._compile_rule_bytes(rule, config=config, dialect_id="t", rule_index=0)
+        assert (fn is not None) == byte_safe, pattern
+
+    utf8.transform_bytes(b"Dat is goed.", "vlaams/basis")
+    assert len(utf8._BYTES_PIPELINES) > 0
+    _DEFAULT_REGISTRY.clear_cache()
+    assert len(utf8._BYTES_PIPELINES) == 0
+
+
+def test_atransform_stream_matches_transform() -> None:
+    import asyncio
+    import random
+
+    from vlaamscodex.dialects.streaming import atransform_stream
+
+    text = "Dat is wat jij zegt.  Wat wil jij even kijken?! Dat is goed. Jij mag niet. Nog een zin zonder punt"
+    rnd = random.Random(3)
+
+    async def chunks():
+        pos = 0
+        while pos < len(text):
+            step = rnd.randint(1, 7)
+            yield text[pos : pos + step]
+            pos += step
+            await asyncio.sleep(0)
+
+    async def collect() -> list[str]:
+        return [s async for s in atransform_stream(chunks(), "vlaams/antwerps", enable_particles=True)]
+
+    parts = asyncio.run(collect())
+    assert len(parts) == 5
+    assert "".join(parts) == transform(text, "vlaams/antwerps", enable_particles=True)
+
+    # Protected terms ("moet") are masked per sentence; particles must still match.
+    text = "".join(f"Wat moet jij doen{'?' if i % 3 else '.'} " for i in range(60))
+
+    async def collect_seeded(seed: int) -> str:
+        async def fixed_chunks():
+            for pos in range(0, len(text), 11):
+                yield text[pos : pos + 11]
+
+        return "".join([s async for s in atransform_stream(fixed_chunks(), "vlaams/basis", enable_particles=True, seed=seed)])
+
+    for seed in range(5):
+        out = asyncio.run(collect_seeded(seed))
+        assert out == transform(text, "vlaams/basis", enable_particles=True, seed=seed), seed
+
+
+def test_stream_split_resumes_after_scanned_text() -> None:
+    from vlaamscodex.dialects.streaming import _split_complete
+
+    # Only text after the returned offset is searched again when more arrives.
+    assert _split_complete("Dat is wat") == ([], "Dat is wat", 10)
+    assert _split_complete("Dat is wat jij zegt?!  ", 10) == ([], "Dat is wat jij zegt?!  ", 19)
+    assert _split_complete("Dat is wat jij zegt?!  Wat", 19) == (["Dat is wat jij zegt?!  "], "Wat", 3)
+    assert _split_complete("Goed. Ja. Nee", 4) == (["Goed. ", "Ja. "], "Nee", 3)
+
+
+def test_identify_dialect_ranks_source_pack_first() -> None:
+    from vlaamscodex.dialects.identify import identify_dialect
+
+    text = "Dat is goed en snel. Wat wil jij even kijken? Jij moet dat zeggen, hoor."
+    assert identify_dialect(text) == []
+    for pack in available_packs():
+        out = transform(text, pack.id)
+        if out == text:
+            continue
+        ranked = identify_dialect(out, limit=None)
+        best = ranked[0].score
+        assert pack.id in {c.id for c in ranked if c.score == best}, pack.id
+
+
+def test_reverse_transform_round_trips_and_reports_ambiguity() -> None:
+    from vlaamscodex.dialects.reverse import reverse_table, reverse_transform
+
+    text = "Dat is goed en snel. Wat wil jij even kijken met jou en jouw fiets?"
+    for pack in available_packs():
+        assert reverse_transform(transform(text, pack.id), pack.id) == text, pack.id
+
+    table = reverse_table("vlaams/basis", pronoun_object="ge")
+    assert table.ambiguous == {"ge": ("jij", "jou")}
+    assert reverse_transform("Ge ziet ge.", "vlaams/basis", pronoun_object="ge") == "Ge ziet ge."
+
+
+def test_transform_parallel_matches_serial() -> None:
+    from vlaamscodex.dialects.parallel import transform_parallel
+
+    text = " ".join(f"Dat is zin {i}. Wat wil jij even kijken?" for i in range(200))
+    for pack in ("vlaams/basis", "vlaams/antwerps"):
+        expected = transform(text, pack, enable_particles=True)
+        for pool in ("thread", "process"):
+            out = transform_parallel(text, pack, workers=3, pool=pool, min_chunk_chars=1, enable_particles=True)
+            assert out == expected, (pack, pool)
+
+    # Protected terms ("moet") are masked per chunk; particles must still match.
+    text = "".join(f"Wat moet jij doen{'?' if i % 3 else '.'} " for i in range(60))
+    for seed in range(5):
+        expected = transform(text, "vlaams/basis", enable_particles=True, seed=seed)
+        out = transform_parallel(
+            text, "vlaams/basis", workers=4, pool="thread", min_chunk_chars=100, enable_particles=True, seed=seed
+        )
+        assert out == expected, seed
+
+
+def test_transform_file_windows_match_transform(tmp_path) -> None:
+    from vlaamscodex.dialects.files import transform_file
+
+    text = "".join(f"Dat is zin {i} – wat wil jij?  Dat is goed.\n" for i in range(300))
+    src = tmp_path / "in.txt"
+    src.write_text(text, encoding="utf-8")
+    done: list[int] = []
+    stats = transform_file(
+        src, tmp_path / "out.txt", "vlaams/antwerps", window_bytes=37, progress=lambda d, t: done.append(d),
+        enable_particles=True,
+    )
+    assert (tmp_path / "out.txt").read_text(encoding="utf-8") == transform(
+        text, "vlaams/antwerps", enable_particles=True
+    )
+    assert stats.bytes_in == src.stat().st_size == done[-1]
+    assert stats.windows == len(done) > 1
+
+    # Newlines pass through untranslated; protected terms ("moet") keep particles in step.
+    text = "".join(f"Wat moet jij doen{'?' if i % 3 else '.'}\r\n" for i in range(60))
+    src.write_bytes(text.encode("utf-8"))
+    for seed in range(5):
+        transform_file(src, tmp_path / "out.txt", "vlaams/basis", window_bytes=256, enable_particles=True, seed=seed)
+        assert (tmp_path / "out.txt").read_bytes().decode("utf-8") == transform(
+            text, "vlaams/basis", enable_particles=True, seed=seed
+        )
+
+
+def test_metrics_snapshot_and_prometheus() -> None:
+    from vlaamscodex.dialects import transformer
+
+    seen: list[tuple[str, int, int]] = []
+    transformer.enable_metrics(lambda d, s, passes, protected: seen.append((d, passes, protected)))
+    try:
+        transform("Dat is goed. Jij moet niet.", "vlaams/basis")
+        transform("Wat wil jij?", "vlaams/basis")
+        snap = transformer.metrics_snapshot()
+        text = transformer.metrics_prometheus()
+    finally:
+        transformer.disable_metrics()
+
+    basis = snap["dialects"]["vlaams/basis"]
+    assert basis["runs"] == 2 and basis["protected_matches"] == 2
+    assert basis["passes"] == sum(p for _d, p, _m in seen) >= 2
+    assert sum(basis["latency_seconds"]["buckets"].values()) == 2
+    assert 'vlaamscodex_dialect_runs_total{dialect="vlaams/basis"} 2' in text
+    assert 'vlaamscodex_dialect_run_seconds_bucket{dialect="vlaams/basis",le="+Inf"} 2' in text
+    assert transformer.metrics_snapshot() == {}
+
+
+def test_particle_hash_schemes() -> None:
+    import pytest
+
+    from vlaamscodex.dialects.utf8 import transform_bytes
+
+    text = " ".join(f"Dat is zin {i}. Wat wil jij?" for i in range(12))
+    # Golden outputs of the SHA-256 sampler before placeholder numbers were dropped
+    # from its key: unchanged for sentences without protected terms.
+    assert transform(text, "vlaams/basis", enable_particles=True, particle_hash="sha256") == (
+        "Da’s zin 0. Wa wil ge? Da’s zin 1. Wa wil ge? Da’s zin 2. Wa wil ge? Da’s zin 3. Wa wil ge? "
+        "Da’s zin 4. Wa wil ge? Da’s zin 5. Wa wil ge? Da’s zin 6. Wa wil ge? Da’s zin 7, zeg. Wa wil ge? "
+        "Da’s zin 8. Wa wil ge? Da’s zin 9, zeg, allee. Wa wil ge? Da’s zin 10. Wa wil ge? "
+        "Da’s zin 11, zeg. Wa wil ge?"
+    )
+    text = "Dat is goed. Jij bent er. Wat wil jij? Het is laat. Kom eens hier! Dat is wat jij zegt."
+    assert [
+        transform(text, dialect_id, enable_particles=True, seed=seed, particle_hash="sha256")
+        for seed, dialect_id in [(1, "vlaams/basis"), (1, "vlaams/antwerps"), (2, "vlaams/antwerps")]
+    ] == [
+        "Da’s goed. Ge bent er, zeg. Wa wil ge? Het is laat. Kom eens hier! Da’s wat ge zegt.",
+        "Da’s goed. Ge bent er. Wa wil ge, zeg, allee? Het is laat. Kom eens hier! Da’s wat ge zegt.",
+        "Da’s goed. Ge bent er. Wa wil ge? Het is laat, zeg. Kom eens hier! Da’s wat ge zegt.",
+    ]
+    # With protected terms ("moet") the draw no longer depends on how many came before,
+    # so these differ from the earlier sampler (it gave "..., allee, zeg." on the last one).
+    text = "Print dat. Dat moet nu. Dat moet nu. Dat moet nu. "
+    assert transform(text, "vlaams/antwerps", enable_particles=True, seed=0, particle_hash="sha256") == (
+        "Print dat. Dat moet nu, allee. Dat moet nu. Dat moet nu. "
+    )
+
+    long_text = " ".join(f"Dat is zin {i}." for i in range(5000))
+    for deterministic in (True, False):
+        out = transform(long_text, "vlaams/basis", enable_particles=True, deterministic=deterministic)
+        # probabilities 0.06 and 0.04 over 5000 sentences
+        assert 200 < out.count(", zeg") < 400 and 120 < out.count(", allee") < 280
+        assert transform_bytes(
+            long_text.encode("utf-8"), "vlaams/basis", enable_particles=True, deterministic=deterministic
+        ).decode("utf-8") == out
+
+    # Each sentence draws from its index and its own text only, however many protected
+    # terms ("moet") earlier sentences masked.
+    from vlaamscodex.dialects.transformer import _DEFAULT_REGISTRY, _build_config, _run_pipeline
+
+    cfg = _build_config(enable_particles=True)
+    pipeline = _DEFAULT_REGISTRY.pipeline("vlaams/basis", cfg)
+    sentences = [f"Dat moet {'nu ' * (i % 3)}gebeuren. " for i in range(300)]
+    assert "".join(_run_pipeline(s, pipeline, cfg, sentence_offset=i) for i, s in enumerate(sentences)) == (
+        transform("".join(sentences), "vlaams/basis", enable_particles=True)
+    )
+
+    with pytest.raises(ValueError):
+        transform(text, "vlaams/basis", particle_hash="md5")
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import importlib
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from vlaamscodex import importer
+
+
+def test_plats_module_imports_and_caches_bytecode(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys, "dont_write_bytecode", False)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    src = tmp_path / "rekenen.plats"
+    src.write_text(
+        "# coding: vlaamsplats\nplan doe\n  maak funksie dubbel met x doe\n"
+        "    geeftterug da x keer getal 2 amen\n  gedaan\ngedaan\n",
+        encoding="utf-8",
+    )
+
+    importer.install()
+    try:
+        mod = importlib.import_module("rekenen")
+        assert mod.dubbel(21) == 42
+        assert mod.__file__ == str(src)
+        # Named apart from the rekenen.cpython-XY.pyc a rekenen.py would use.
+        (pyc,) = (tmp_path / "__pycache__").glob("rekenen.*.pyc")
+        assert ".plats-" in pyc.name
+
+        # Second import loads the bytecode without compiling.
+        del sys.modules["rekenen"]
+        with monkeypatch.context() as m:
+            m.setattr(importer, "compile_plats_code", lambda *a: pytest.fail("recompiled"))
+            assert importlib.import_module("rekenen").dubbel(2) == 4
+
+        # An edited source is recompiled.
+        del sys.modules["rekenen"]
+        src.write_text(src.read_text(encoding="utf-8").replace("getal 2", "getal 3"), encoding="utf-8")
+        os.utime(src, ns=(pyc.stat().st_mtime_ns + 10**9,) * 2)
+        assert importlib.import_module("rekenen").dubbel(2) == 6
+    finally:
+        importer.uninstall()
+        sys.modules.pop("rekenen", None)
+    assert importer._FINDER not in sys.meta_path
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from vlaamscodex.dialects.transformer import (  # noqa: E402
+    DialectTransformConfig,
+    _CompiledPipeline,
+    _DEFAULT_REGISTRY,
+    _default_config,
+    _run_passes,
+)
+
+
+@dataclass(slots=True)
+class RuleStats:
+    index: int
+    source: str
+    type: str
+    rule: str
+    texts_matched: int = 0
+    texts_overridden: int = 0
+    bytes_changed: int = 0
+    seconds: float = 0.0
+    disabled: bool = False
+
+    @property
+    def status(self) -> str:
+        if self.disabled:
+            return "disabled"
+        if self.texts_matched == 0:
+            return "dead"
+        if self.texts_overridden == self.texts_matched:
+            return "overridden"
+        return "live"
+
+
+def _describe(rule: dict[str, Any]) -> str:
+    rtype = rule.get("type")
+    if rtype == "replace_word":
+        return f"{rule.get('from')} -> {rule.get('to')}"
+    if rtype == "replace_regex":
+        return f"/{rule.get('pattern')}/ -> {rule.get('to')}"
+    if rtype == "append_particle":
+        return f"+{rule.get('particle')} (p={rule.get('probability')})"
+    return repr(rule)
+
+
+def _changed_bytes(old: str, new: str) -> int:
+    """UTF-8 size of the region that differs between old and new (after trimming common ends)."""
+    n = min(len(old), len(new))
+    start = 0
+    while start < n and old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < n - start and old[-1 - end] == new[-1 - end]:
+        end += 1
+    a = old[start : len(old) - end].encode("utf-8")
+    b = new[start : len(new) - end].encode("utf-8")
+    return max(len(a), len(b))
+
+
+def _run(
+    text: str,
+    pipeline: _CompiledPipeline,
+    config: DialectTransformConfig,
+    *,
+    skip: int | None = None,
+    stats: list[RuleStats] | None = None,
+    fired: set[int] | None = None,
+) -> str:
+    """Run transform()'s pass loop, optionally skipping one rule or recording per-rule stats."""
+
+    def run_rule(i: int, fn: Callable[[str], str], cur: str) -> str:
+        if i == skip:
+            return cur
+        if stats is None:
+            return fn(cur)
+        t0 = time.perf_counter()
+        new = fn(cur)
+        stats[i].seconds += time.perf_counter() - t0
+        if new != cur:
+            stats[i].bytes_changed += _changed_bytes(cur, new)
+            if fired is not None:
+                fired.add(i)
+        return new
+
+    return _run_passes(text, pipeline, config, None, "partial", 0, None, run_rule)
+
+
+def collect_stats(texts: list[str], dialect_id: str, *, enable_particles: bool = False) -> list[RuleStats]:
+    config = replace(_default_config(), enable_particles=enable_particles)
+    resolved = _DEFAULT_REGISTRY.resolve(dialect_id)
+    # Unoptimised: pruned rules should still show up as dead/overridden here.
+    pipeline = _DEFAULT_REGISTRY.pipeline(dialect_id, config, optimize=False)
+    stats = [
+        RuleStats(
+            index=i,
+            source=resolved.rule_sources[i] if i < len(resolved.rule_sources) else dialect_id,
+            type=str(rule.get("type")),
+            rule=_describe(rule),
+            disabled=rule.get("type") == "append_particle" and not enable_particles,
+        )
+        for i, rule in enumerate(resolved.rules)
+    ]
+
+    for text in texts:
+        fired: set[int] = set()
+        full = _run(text, pipeline, config, stats=stats, fired=fired)
+        for i in fired:
+            stats[i].texts_matched += 1
+            # Ablation: the rule is overridden on this text if dropping it changes nothing.
+            if _run(text, pipeline, config, skip=i) == full:
+                stats[i].texts_overridden += 1
+    return stats
+
+
+def _iter_corpus_files(paths: Iterable[Path]) -> Iterable[Path]:
+    for path in paths:
+        if path.is_dir():
+            yield from sorted(p for p in path.rglob("*.txt") if p.is_file())
+        else:
+            yield path
+
+
+def load_corpus(paths: Iterable[Path], unit: str) -> list[str]:
+    texts: list[str] = []
+    for path in _iter_corpus_files(paths):
+        content = path.read_text(encoding="utf-8")
+        if unit == "file":
+            texts.append(content)
+        elif unit == "paragraph":
+            texts.extend(p.strip() for p in content.split("\n\n") if p.strip())
+        else:
+            texts.extend(line.strip() for line in content.splitlines() if line.strip())
+    return texts
+
+
+def _print_report(dialect_id: str, stats: list[RuleStats], n_texts: int) -> None:
+    print(f"== {dialect_id} ({len(stats)} rules, {n_texts} texts) ==")
+    print(f"  {'idx':>3}  {'status':<10} {'matched':>7} {'bytes':>8} {'cost_ms':>8}  source / rule")
+    for s in stats:
+        print(
+            f"  {s.index:>3}  {s.status:<10} {s.texts_matched:>7} {s.bytes_changed:>8} "
+            f"{s.seconds * 1000:>8.2f}  {s.source}: [{s.type}] {s.rule}"
+        )
+    dead = [s for s in stats if s.status == "dead"]
+    overridden = [s for s in stats if s.status == "overridden"]
+    if dead:
+        print(f"  never matched: {', '.join(f'#{s.index} ({s.rule})' for s in dead)}")
+    if overridden:
+        print(f"  always overridden: {', '.join(f'#{s.index} ({s.rule})' for s in overridden)}")
+    print()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description="Per-rule hit rates, changed bytes and cost of dialect packs over a text corpus"
+    )
+    ap.add_argument("corpus", nargs="+", type=Path, help="Text files or directories (*.txt, recursive)")
+    ap.add_argument(
+        "--dialect",
+        action="append",
+        dest="dialects",
+        help="Dialect pack id (repeatable; default: all packs)",
+    )
+    ap.add_argument(
+        "--unit",
+        choices=("line", "paragraph", "file"),
+        default="line",
+        help="How to split the corpus into texts (default: line)",
+    )
+    ap.add_argument("--particles", action="store_true", help="Enable append_particle rules")
+    ap.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = ap.parse_args()
+
+    texts = load_corpus(args.corpus, args.unit)
+    if not texts:
+        raise SystemExit("Corpus is empty")
+    dialects = args.dialects or [p.id for p in _DEFAULT_REGISTRY.available()]
+
+    report: dict[str, list[dict[str, Any]]] = {}
+    for dialect_id in dialects:
+        try:
+            stats = collect_stats(texts, dialect_id, enable_particles=args.particles)
+        except KeyError:
+            raise SystemExit(f"Unknown dialect id: {dialect_id}") from None
+        if args.json:
+            report[dialect_id] = [{**asdict(s), "status": s.status} for s in stats]
+        else:
+            _print_report(dialect_id, stats, len(texts))
+
+    if args.json:
+        print(json.dumps({"texts": len(texts), "dialects": report}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import argparse
 import json
 import re
+import string
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+try:  # Python 3.11+
+    from re import _constants as sre_c
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover - Python 3.10
+    import sre_constants as sre_c  # type: ignore[no-redef]
+    import sre_parse  # type: ignore[no-redef]
+
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 DIALECTS_DIR = REPO_ROOT / "dialects"
@@ -17,6 +27,239 @@ SUPPORTED_RULE_TYPES = {"replace_word", "replace_regex", "append_particle"}
 SUPPORTED_REGEX_FLAGS = {"IGNORECASE", "MULTILINE"}
 
 
+# Regex cost analysis. The structural checks decide validity; timed probes are opt-in
+# (--probe-regex) and only warn, since wall-clock timings vary between machines.
+# Probe sizes grow by 4 characters so exponential backtracking is caught before it
+# hangs: it gets ~16x slower per step, while polynomial matching barely changes.
+REGEX_PROBE_SIZES = (8, 12, 16, 20, 24, 28, 32)
+REGEX_MAX_STEP_GROWTH = 8.0
+REGEX_MIN_SIGNIFICANT_S = 0.002
+# A probe stops once one search takes longer than this.
+REGEX_PROBE_CAP_S = 1.0
+
+_REGEX_UNIVERSE = frozenset(string.printable + "àáâäçèéêëìíîïòóôöùúûüÿ’")
+_REPEAT_OPS = {
+    op
+    for op in (
+        sre_c.MAX_REPEAT,
+        sre_c.MIN_REPEAT,
+        getattr(sre_c, "POSSESSIVE_REPEAT", None),
+    )
+    if op is not None
+}
+_CATEGORY_TESTS = {
+    sre_c.CATEGORY_DIGIT: str.isdigit,
+    sre_c.CATEGORY_NOT_DIGIT: lambda c: not c.isdigit(),
+    sre_c.CATEGORY_SPACE: str.isspace,
+    sre_c.CATEGORY_NOT_SPACE: lambda c: not c.isspace(),
+    sre_c.CATEGORY_WORD: lambda c: c.isalnum() or c == "_",
+    sre_c.CATEGORY_NOT_WORD: lambda c: not (c.isalnum() or c == "_"),
+}
+
+
+def _regex_flags(names: list[str]) -> int:
+    flags = 0
+    for name in names:
+        flags |= getattr(re, name)
+    return flags
+
+
+def _charset(items: list[tuple[Any, Any]], ignorecase: bool) -> set[str]:
+    chars: set[str] = set()
+    negate = False
+    for op, av in items:
+        if op is sre_c.NEGATE:
+            negate = True
+        elif op is sre_c.LITERAL:
+            chars.add(chr(av))
+        elif op is sre_c.RANGE:
+            lo, hi = av
+            chars.update(c for c in _REGEX_UNIVERSE if lo <= ord(c) <= hi)
+        elif op is sre_c.CATEGORY and av in _CATEGORY_TESTS:
+            chars.update(c for c in _REGEX_UNIVERSE if _CATEGORY_TESTS[av](c))
+        else:
+            chars.update(_REGEX_UNIVERSE)
+    if ignorecase:
+        chars |= {c.swapcase() for c in chars}
+    return set(_REGEX_UNIVERSE - chars) if negate else chars
+
+
+def _first_set(seq: Any, ignorecase: bool) -> tuple[set[str], bool]:
+    """Approximate the set of characters a (sub)pattern can start with, and whether it can match empty."""
+    first: set[str] = set()
+    for op, av in seq:
+        if op is sre_c.LITERAL:
+            c = chr(av)
+            return first | ({c, c.swapcase()} if ignorecase else {c}), False
+        if op is sre_c.NOT_LITERAL:
+            return first | (_REGEX_UNIVERSE - {chr(av)}), False
+        if op is sre_c.ANY:
+            return first | set(_REGEX_UNIVERSE), False
+        if op is sre_c.IN:
+            return first | _charset(av, ignorecase), False
+        if op is sre_c.AT:
+            continue  # zero-width anchor
+        if op in _REPEAT_OPS:
+            lo, _hi, body = av
+            sub, nullable = _first_set(body, ignorecase)
+            first |= sub
+            if lo > 0 and not nullable:
+                return first, False
+            continue
+        if op is sre_c.SUBPATTERN:
+            sub, nullable = _first_set(av[-1], ignorecase)
+            first |= sub
+            if not nullable:
+                return first, False
+            continue
+        if op is sre_c.BRANCH:
+            any_nullable = False
+            for alt in av[1]:
+                sub, nullable = _first_set(alt, ignorecase)
+                first |= sub
+                any_nullable = any_nullable or nullable
+            if not any_nullable:
+                return first, False
+            continue
+        if op in (sre_c.ASSERT, sre_c.ASSERT_NOT):
+            continue
+        # Back-references, conditionals, atomic groups: assume anything.
+        return first | set(_REGEX_UNIVERSE), False
+    return first, True
+
+
+def _has_repeat(seq: Any, *, unbounded_only: bool) -> bool:
+    for op, av in seq:
+        if op in _REPEAT_OPS:
+            lo, hi, body = av
+            if hi == sre_c.MAXREPEAT or (not unbounded_only and hi > 1):
+                return True
+            if _has_repeat(body, unbounded_only=unbounded_only):
+                return True
+        elif op is sre_c.SUBPATTERN:
+            if _has_repeat(av[-1], unbounded_only=unbounded_only):
+                return True
+        elif op is sre_c.BRANCH:
+            if any(_has_repeat(alt, unbounded_only=unbounded_only) for alt in av[1]):
+                return True
+        elif op in (sre_c.ASSERT, sre_c.ASSERT_NOT):
+            if _has_repeat(av[1], unbounded_only=unbounded_only):
+                return True
+    return False
+
+
+def _inner_repeat_chars(seq: Any, ignorecase: bool) -> set[str]:
+    """Characters that repeats nested anywhere in seq can start an iteration with."""
+    chars: set[str] = set()
+    for op, av in seq:
+        if op in _REPEAT_OPS:
+            lo, hi, body = av
+            if hi > 1:
+                chars |= _first_set(body, ignorecase)[0]
+            chars |= _inner_repeat_chars(body, ignorecase)
+        elif op is sre_c.SUBPATTERN:
+            chars |= _inner_repeat_chars(av[-1], ignorecase)
+        elif op is sre_c.BRANCH:
+            for alt in av[1]:
+                chars |= _inner_repeat_chars(alt, ignorecase)
+        elif op in (sre_c.ASSERT, sre_c.ASSERT_NOT):
+            chars |= _inner_repeat_chars(av[1], ignorecase)
+    return chars
+
+
+def _regex_static_issues(pattern: str, flags: int) -> tuple[list[str], set[str]]:
+    """
+    Flag constructs that can backtrack catastrophically (exponentially).
+
+    - nested quantifier: a repeat (bounded or not) whose body contains another repeat that
+      can also consume the character a new outer iteration starts with, as in
+      `(a+)+` or `(\\w+\\s?)+`; `(?:a\\d+)+` is fine.
+    - ambiguous alternation inside repeat: alternatives that can start with the
+      same character (or match empty), as in `(a|ab)*`.
+
+    Polynomial patterns such as `(\\w+)\\s+(\\w+)` are not flagged.
+
+    Returns (issues, pump_chars) where pump_chars are characters accepted by repeated
+    sub-patterns; the dynamic probe uses them to build worst-case inputs.
+    """
+    ignorecase = bool(flags & re.IGNORECASE)
+    issues: list[str] = []
+    pump: set[str] = set()
+
+    def walk(seq: Any, in_repeat: bool) -> None:
+        for op, av in seq:
+            if op in _REPEAT_OPS:
+                lo, hi, body = av
+                # Bounded repeats count too: `(a+){2,20}` is already exponential.
+                repeats = hi > 1
+                if repeats:
+                    starts = _first_set(body, ignorecase)[0]
+                    pump.update(starts)
+                    if _inner_repeat_chars(body, ignorecase) & starts:
+                        issues.append("nested quantifier")
+                walk(body, in_repeat or repeats)
+            elif op is sre_c.SUBPATTERN:
+                walk(av[-1], in_repeat)
+            elif op is sre_c.BRANCH:
+                alts = av[1]
+                if in_repeat:
+                    firsts = [_first_set(alt, ignorecase) for alt in alts]
+                    seen: set[str] = set()
+                    for chars, nullable in firsts:
+                        if nullable or seen & chars:
+                            issues.append("ambiguous alternation inside repeat")
+                            break
+                        seen |= chars
+                for alt in alts:
+                    walk(alt, in_repeat)
+            elif op in (sre_c.ASSERT, sre_c.ASSERT_NOT):
+                walk(av[1], in_repeat)
+
+    walk(sre_parse.parse(pattern, flags), False)
+    return list(dict.fromkeys(issues)), pump
+
+
+def _time_search(pat: re.Pattern[str], text: str) -> float:
+    t0 = time.perf_counter()
+    pat.search(text)
+    return time.perf_counter() - t0
+
+
+def _regex_dynamic_issue(pattern: str, flags: int, pump_chars: set[str]) -> str | None:
+    """Run the pattern on generated worst-case strings; report exponential growth."""
+    pat = re.compile(pattern, flags)
+    candidates = sorted(pump_chars & set(string.ascii_letters + string.digits + " _-.,'’"))[:6]
+    candidates = candidates or ["a"]
+    for c in candidates:
+        for suffix in ("\x00", "!", ""):
+            prev = 0.0
+            for n in REGEX_PROBE_SIZES:
+                elapsed = min(_time_search(pat, c * n + suffix) for _ in range(3))
+                # Relative to the previous size, so the machine's speed cancels out.
+                if elapsed > REGEX_MIN_SIGNIFICANT_S and elapsed > REGEX_MAX_STEP_GROWTH * prev:
+                    return f"exponential matching: {elapsed / max(prev, 1e-9):.0f}x slower at {n} x {c!r}"
+                if elapsed > REGEX_PROBE_CAP_S:
+                    return f"slow matching: {elapsed:.1f} s on {n} x {c!r}"
+                prev = elapsed
+    return None
+
+
+def _check_regex_cost(pattern: str, flag_names: list[str], *, where: str, probe: bool = False) -> list[str]:
+    """
+    Raise ValueError if the pattern can backtrack catastrophically.
+
+    With `probe`, also time worst-case inputs and return any findings as warnings.
+    """
+    flags = _regex_flags(flag_names)
+    issues, pump = _regex_static_issues(pattern, flags)
+    if issues:
+        raise ValueError(f"{where}: regex {pattern!r}: {', '.join(issues)}")
+    if not probe:
+        return []
+    problem = _regex_dynamic_issue(pattern, flags, pump)
+    return [] if problem is None else [f"{where}: regex {pattern!r}: {problem}"]
+
+
 def _load_json(path: Path) -> Any:
     return json.loads(path.read_text(encoding="utf-8"))
 
@@ -30,7 +273,7 @@ class Pack:
     rules: tuple[dict[str, Any], ...]
 
 
-def _validate_pack_schema(data: Any, *, path: Path) -> Pack:
+def _validate_pack_schema(data: Any, *, path: Path, probe_regex: bool = False) -> Pack:
     if not isinstance(data, dict):
         raise ValueError(f"{path}: pack must be a JSON object")
 
@@ -87,6 +330,12 @@ def _validate_pack_schema(data: Any, *, path: Path) -> Pack:
                 raise ValueError(f"{path}: rules[{i}]: regex pattern too broad (contains .*)")
             if "(?s" in r["pattern"] or "(?S" in r["pattern"]:
                 raise ValueError(f"{path}: rules[{i}]: DOTALL inline flags not allowed")
+            try:
+                re.compile(r["pattern"], _regex_flags(flags))
+            except re.error as exc:
+                raise ValueError(f"{path}: rules[{i}]: invalid regex: {exc}") from None
+            for warning in _check_regex_cost(r["pattern"], flags, where=f"{path}: rules[{i}]", probe=probe_regex):
+                print(f"WARN: {warning}")
 
         elif rtype == "append_particle":
             if not isinstance(r.get("particle"), str) or not r["particle"].strip():
@@ -109,7 +358,15 @@ def _validate_pack_schema(data: Any, *, path: Path) -> Pack:
     )
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate the dialect packs in dialects/.")
+    parser.add_argument(
+        "--probe-regex",
+        action="store_true",
+        help="also time replace_regex patterns on worst-case inputs and warn about slow ones",
+    )
+    args = parser.parse_args(argv)
+
     if not INDEX_PATH.exists():
         raise SystemExit(f"Missing {INDEX_PATH}")
 
@@ -147,7 +404,7 @@ def main() -> int:
         if not pack_path.exists():
             raise SystemExit(f"dialects/index.json: {pid}: pack file not found: {pack_path}")
 
-        pack = _validate_pack_schema(_load_json(pack_path), path=pack_path)
+        pack = _validate_pack_schema(_load_json(pack_path), path=pack_path, probe_regex=args.probe_regex)
         if pack.id != pid:
             raise SystemExit(f"{pack_path}: id mismatch (expected {pid}, got {pack.id})")
         packs[pid] = pack